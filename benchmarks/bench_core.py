@@ -0,0 +1,345 @@
+# benchmarks/bench_core.py
+#
+# Suite de benchmarks de los caminos "calientes" del core contra una BD temporal:
+#   generate_first_round, generate_round_2, save_table_player_scores,
+#   recompute_stats_from_results, get_ranking,
+#   generate_score_sheets_for_round (un PDF por mesa, serial y en paralelo),
+#   generate_round_score_sheet_pdf (un solo PDF por ronda), generate_round_assignment_sheet
+#
+# La salida es JSON para poder comparar versiones:
+#   python -m benchmarks.bench_core --output antes.json
+#   ... (cambios) ...
+#   python -m benchmarks.bench_core --output despues.json --compare antes.json
+#
+# Opciones útiles:
+#   --players 100 1000 10000   --rounds 5   --repeat 3   --score-tables 50   --no-pdf
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from core import paths
+from core import storage
+from core import tournament
+from benchmarks.synthetic import populate_players, populate_round, temp_data_dir
+
+BENCH_VERSION = 1
+
+
+def _timing(samples: list[float]) -> dict:
+    return {
+        "best_s": min(samples),
+        "mean_s": statistics.fmean(samples),
+        "median_s": statistics.median(samples),
+        "runs": len(samples),
+    }
+
+
+def _time_once(fn, *args, **kwargs) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def _time_repeat(fn, repeat: int) -> dict:
+    return _timing([_time_once(fn)[0] for _ in range(repeat)])
+
+
+def _check(ok_msg, name: str):
+    ok, msg = ok_msg
+    if not ok:
+        raise RuntimeError(f"{name}: {msg}")
+
+
+def _random_points(rng: random.Random) -> dict[str, dict]:
+    return {
+        letra: {"base_points": rng.randint(0, 200), "penalty_points": rng.choice((0, 0, 0, 10))}
+        for letra in ("A", "B", "C", "D")
+    }
+
+
+def bench_case(players: int, rounds: int, repeat: int, score_tables: int, pdf: bool) -> dict:
+    rng = random.Random(players)
+    timings: dict[str, dict] = {}
+
+    with temp_data_dir() as folder:
+        storage.init_db()
+        populate_players(players)
+
+        # ---- generación de rondas (una sola vez: cada una modifica la BD) ----
+        elapsed, res = _time_once(tournament.generate_first_round)
+        _check(res, "generate_first_round")
+        timings["generate_first_round"] = _timing([elapsed])
+
+        elapsed, res = _time_once(tournament.generate_round_2)
+        _check(res, "generate_round_2")
+        timings["generate_round_2"] = _timing([elapsed])
+
+        # ---- captura de puntos (por llamada, como en la UI) ----
+        mesas = [m["mesa"] for m in storage.get_round_assignments(1)]
+        samples = []
+        for mesa in mesas[:score_tables]:
+            elapsed, res = _time_once(
+                tournament.save_table_player_scores,
+                1,
+                mesa,
+                _random_points(rng),
+                rng.choice(("AC", "BD")),
+            )
+            _check(res, "save_table_player_scores")
+            samples.append(elapsed)
+        if samples:
+            timings["save_table_player_scores"] = _timing(samples)
+
+        # ---- resto del torneo con resultados sintéticos ----
+        for rnd in range(3, rounds + 1):
+            populate_round(rnd, rng, with_scores=True)
+
+        timings["recompute_stats_from_results"] = _time_repeat(
+            storage.recompute_stats_from_results, repeat
+        )
+        timings["get_ranking"] = _time_repeat(storage.get_ranking, repeat)
+
+        # ---- PDFs (requieren reportlab) ----
+        if pdf:
+            timings.update(_bench_pdfs(os.path.join(folder, "hojas_bench"), repeat))
+
+        db_size = _db_bytes()
+
+    return {
+        "players": players,
+        "rounds": rounds,
+        "tables_per_round": players // 4,
+        "db_bytes": db_size,
+        "timings": timings,
+    }
+
+
+def _bench_pdfs(output_dir: str, repeat: int) -> dict:
+    try:
+        from core import round_assignment_sheet, score_sheet
+    except ImportError as e:
+        skipped = {"skipped": f"reportlab no disponible ({e})"}
+        return {
+            "generate_score_sheets_for_round": skipped,
+            "generate_score_sheets_for_round_parallel": skipped,
+            "generate_score_sheets_for_round_incremental": skipped,
+            "generate_round_score_sheet_pdf": skipped,
+            "generate_round_assignment_sheet": skipped,
+        }
+
+    per_file_dir = os.path.join(output_dir, "por_mesa")
+    single_dir = os.path.join(output_dir, "un_pdf")
+
+    def sheets():
+        score_sheet.generate_score_sheets_for_round(
+            1,
+            output_dir=per_file_dir,
+            tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
+            tournament_type="individual",
+            incremental=False,
+        )
+
+    def sheets_parallel():
+        score_sheet.generate_score_sheets_for_round_parallel(
+            1,
+            output_dir=per_file_dir,
+            tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
+            tournament_type="individual",
+            incremental=False,
+        )
+
+    def single_pdf():
+        score_sheet.generate_round_score_sheet_pdf(
+            1,
+            output_dir=single_dir,
+            tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
+            tournament_type="individual",
+        )
+
+    def assignment():
+        round_assignment_sheet.generate_round_assignment_sheet(1, output_dir=output_dir)
+
+    timings = {
+        "generate_score_sheets_for_round": _time_repeat(sheets, repeat),
+        "generate_score_sheets_for_round_parallel": _time_repeat(sheets_parallel, repeat),
+        "generate_round_score_sheet_pdf": _time_repeat(single_pdf, repeat),
+        "generate_round_assignment_sheet": _time_repeat(assignment, repeat),
+    }
+    # uso de disco: N archivos vs un solo PDF
+    timings["generate_score_sheets_for_round"]["output_bytes"] = _dir_bytes(per_file_dir)
+    timings["generate_round_score_sheet_pdf"]["output_bytes"] = _dir_bytes(single_dir)
+
+    # regeneración incremental: se cambia UN jugador de mesa y solo se re-dibujan
+    # las mesas afectadas (manifiesto de hashes)
+    _swap_first_seats(1)
+    elapsed, (rebuilt, _) = _time_once(
+        score_sheet.generate_score_sheets_for_round,
+        1,
+        output_dir=per_file_dir,
+        tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
+        tournament_type="individual",
+    )
+    timings["generate_score_sheets_for_round_incremental"] = _timing([elapsed])
+    timings["generate_score_sheets_for_round_incremental"]["rebuilt"] = rebuilt
+
+    # consultas a la BD por ronda: deben ser fijas (no crecer con las mesas)
+    for name, fn in (
+        ("generate_score_sheets_for_round", sheets),
+        ("generate_score_sheets_for_round_parallel", sheets_parallel),
+        ("generate_round_score_sheet_pdf", single_pdf),
+        ("generate_round_assignment_sheet", assignment),
+    ):
+        with storage.count_queries() as counter:
+            fn()
+        timings[name]["db_queries"] = counter["count"]
+    return timings
+
+
+def _swap_first_seats(round_number: int):
+    """Intercambia el asiento A de las mesas 1 y 2 (como una corrección manual)."""
+    conn = storage.get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT mesa, jugador_id FROM seats WHERE round = ? AND letra = 'A' AND mesa IN (1, 2);",
+        (round_number,),
+    )
+    ids = dict(cur.fetchall())
+    cur.execute(
+        "DELETE FROM seats WHERE round = ? AND letra = 'A' AND mesa IN (1, 2);",
+        (round_number,),
+    )
+    cur.executemany(
+        "INSERT INTO seats (round, mesa, letra, jugador_id) VALUES (?, ?, 'A', ?);",
+        [(round_number, 1, ids[2]), (round_number, 2, ids[1])],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _db_bytes() -> int:
+    """Tamaño real de la BD: con WAL los datos recientes siguen en el -wal."""
+    conn = storage.get_connection()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchall()
+    conn.close()
+
+    path = str(paths.db_path())
+    return sum(
+        os.path.getsize(p) for p in (path, path + "-wal", path + "-shm") if os.path.exists(p)
+    )
+
+
+def _dir_bytes(folder: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(folder, name))
+        for name in os.listdir(folder)
+        if name.endswith(".pdf")
+    )
+
+
+def environment() -> dict:
+    return {
+        "bench_version": BENCH_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def varying_query_counts(report: dict) -> dict[str, list[int]]:
+    """
+    Benchmarks cuyo número de consultas cambia con la cantidad de jugadores
+    (ej: una consulta por mesa). {nombre: [consultas por caso]}.
+    """
+    counts: dict[str, list[int]] = {}
+    for case in report["results"]:
+        for name, t in case["timings"].items():
+            if "db_queries" in t:
+                counts.setdefault(name, []).append(t["db_queries"])
+    return {name: c for name, c in counts.items() if len(set(c)) > 1}
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    """Filas {players, benchmark, baseline_s, current_s, ratio} (ratio > 1 => más lento)."""
+    base_cases = {c["players"]: c for c in baseline.get("results", [])}
+    rows = []
+    for case in current["results"]:
+        base = base_cases.get(case["players"])
+        if not base:
+            continue
+        for name, t in case["timings"].items():
+            b = base["timings"].get(name)
+            if not b or "best_s" not in t or "best_s" not in b:
+                continue
+            rows.append(
+                {
+                    "players": case["players"],
+                    "benchmark": name,
+                    "baseline_s": b["best_s"],
+                    "current_s": t["best_s"],
+                    "ratio": t["best_s"] / b["best_s"] if b["best_s"] else float("inf"),
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del core (salida JSON)")
+    parser.add_argument("--players", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--score-tables", type=int, default=50,
+                        help="mesas a capturar con save_table_player_scores")
+    parser.add_argument("--no-pdf", action="store_true", help="omitir los benchmarks de PDF")
+    parser.add_argument("--output", help="archivo JSON de salida (por defecto: stdout)")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para comparar")
+    args = parser.parse_args()
+
+    report = {
+        "environment": environment(),
+        "results": [
+            bench_case(players, args.rounds, args.repeat, args.score_tables, not args.no_pdf)
+            for players in args.players
+        ],
+    }
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    varying = varying_query_counts(report)
+    for name, counts in varying.items():
+        print(f"ERROR: {name} hace {counts} consultas (deberían ser fijas por ronda)", file=sys.stderr)
+
+    for row in report.get("comparison", []):
+        print(
+            f"{row['players']:>6} {row['benchmark']:<34} "
+            f"{row['baseline_s'] * 1000:>9.1f} ms -> {row['current_s'] * 1000:>9.1f} ms "
+            f"({row['ratio']:.2f}x)",
+            file=sys.stderr,
+        )
+
+    if varying:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
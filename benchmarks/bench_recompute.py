@@ -0,0 +1,121 @@
+# benchmarks/bench_recompute.py
+#
+# Compara recompute_stats_from_results (set-based) contra la versión anterior
+# fila-por-fila, para 100 / 1,000 / 10,000 jugadores en 5 rondas.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m benchmarks.bench_recompute
+#   python -m benchmarks.bench_recompute --players 100 1000 --rounds 5 --repeat 3
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from core import storage
+from benchmarks.synthetic import build_synthetic_tournament, temp_data_dir
+
+
+def legacy_recompute_stats_from_results():
+    """Implementación anterior (un UPDATE por resultado y otro por jugador)."""
+    conn = storage.get_connection()
+    cur = conn.cursor()
+
+    cur.execute("UPDATE player_stats SET g=0, p=0, e=0, r=0, updated_at=datetime('now');")
+    cur.execute(
+        """
+        SELECT round, mesa, jugador_id, letra, final_points, winner_pair
+        FROM player_round_scores;
+        """
+    )
+    for rnd, mesa, jid, letra, final_points, winner_pair in cur.fetchall():
+        cur.execute("UPDATE player_stats SET p = p + ? WHERE jugador_id = ?;", (final_points, jid))
+        if winner_pair == "AC" and letra in ("A", "C"):
+            cur.execute("UPDATE player_stats SET g = g + 1 WHERE jugador_id = ?;", (jid,))
+        elif winner_pair == "BD" and letra in ("B", "D"):
+            cur.execute("UPDATE player_stats SET g = g + 1 WHERE jugador_id = ?;", (jid,))
+
+    cur.execute(
+        """
+        UPDATE player_stats
+        SET p = p + COALESCE(
+            (SELECT SUM(delta_p) FROM player_adjustments pa WHERE pa.jugador_id = player_stats.jugador_id),
+            0
+        ),
+        updated_at = datetime('now');
+        """
+    )
+    cur.execute("UPDATE player_stats SET e = p, updated_at = datetime('now');")
+
+    cur.execute("SELECT jugador_id FROM player_stats ORDER BY p DESC, g DESC, jugador_id ASC;")
+    ordered_ids = [row[0] for row in cur.fetchall()]
+    for idx, jid in enumerate(ordered_ids, start=1):
+        cur.execute("UPDATE player_stats SET r = ? WHERE jugador_id = ?;", (idx, jid))
+
+    conn.commit()
+    conn.close()
+
+
+def _snapshot() -> list[tuple]:
+    conn = storage.get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT jugador_id, g, p, e, r FROM player_stats ORDER BY jugador_id;")
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(players_list: list[int], rounds: int, repeat: int) -> list[dict]:
+    results = []
+    for players in players_list:
+        with temp_data_dir():
+            build_synthetic_tournament(players, rounds)
+            # algunos ajustes para cubrir player_adjustments
+            for jid in range(1, players + 1, 37):
+                storage.add_player_adjustment(jid, -5, "bench")
+
+            legacy = _best_of(legacy_recompute_stats_from_results, repeat)
+            expected = _snapshot()
+            current = _best_of(storage.recompute_stats_from_results, repeat)
+            if _snapshot() != expected:
+                raise AssertionError(f"Resultados distintos con {players} jugadores.")
+
+        results.append(
+            {
+                "players": players,
+                "rounds": rounds,
+                "legacy_s": legacy,
+                "set_based_s": current,
+                "speedup": legacy / current if current else float("inf"),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de recompute_stats_from_results")
+    parser.add_argument("--players", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'jugadores':>10} {'rondas':>6} {'anterior (ms)':>14} {'set-based (ms)':>15} {'speedup':>8}")
+    for row in run(args.players, args.rounds, args.repeat):
+        print(
+            f"{row['players']:>10} {row['rounds']:>6} "
+            f"{row['legacy_s'] * 1000:>14.1f} {row['set_based_s'] * 1000:>15.1f} "
+            f"{row['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
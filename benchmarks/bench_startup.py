@@ -0,0 +1,69 @@
+# benchmarks/bench_startup.py
+#
+# Tiempo de arranque en frío de la app, medido desde afuera (incluye el
+# bootloader de PyInstaller cuando se mide el .exe) y, por dentro, las marcas
+# de core/startup_timer.py (imports / window / init_db / first_view).
+#
+# Cada corrida abre la app con --startup-report; la app se cierra sola apenas
+# dibuja la primera vista. La 1a corrida crea la BD (esquema completo); las
+# demás encuentran el esquema al día (PRAGMA user_version).
+#
+# Uso (desde la raíz del proyecto; necesita pantalla):
+#   python -m benchmarks.bench_startup
+#   python -m benchmarks.bench_startup --exe dist/Cajablanca/Cajablanca.exe --runs 5
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from core import startup_timer
+
+MARKS = ("imports", "window", "init_db", "first_view")
+
+
+def run(command: list[str], runs: int) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="cajablanca_startup_") as folder:
+        env = dict(os.environ, CAJABLANCA_DATA_DIR=folder)
+        report_path = Path(folder) / startup_timer.REPORT_NAME
+
+        for i in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(command + [startup_timer.REPORT_FLAG], env=env, check=True)
+            wall = time.perf_counter() - t0
+
+            lines = report_path.read_text(encoding="utf-8").splitlines()
+            if len(lines) != i + 1:
+                raise RuntimeError("La app no escribió el reporte de arranque.")
+            report = json.loads(lines[-1])
+            report["wall_s"] = wall
+            results.append(report)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la app")
+    parser.add_argument("--exe", help="ejecutable de PyInstaller (por defecto: python main.py)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    command = [args.exe] if args.exe else [sys.executable, "main.py"]
+
+    print(f"{'corrida':>7} {'total (ms)':>11} " + " ".join(f"{m + ' (ms)':>16}" for m in MARKS) + "  reportlab")
+    for i, row in enumerate(run(command, args.runs), start=1):
+        marks = row["marks"]
+        cols = " ".join(
+            f"{marks[m] * 1000:>16.1f}" if m in marks else f"{'-':>16}" for m in MARKS
+        )
+        print(f"{i:>7} {row['wall_s'] * 1000:>11.1f} {cols}  {'sí' if row['reportlab_loaded'] else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/synthetic.py
+#
+# Crea torneos sintéticos (N jugadores, R rondas con resultados) en una BD temporal.
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from core import storage
+
+
+@contextmanager
+def temp_data_dir():
+    """Apunta la app a una carpeta temporal (BD + hojas) mientras dure el bloque."""
+    previous = os.environ.get("CAJABLANCA_DATA_DIR")
+    folder = tempfile.mkdtemp(prefix="cajablanca_bench_")
+    os.environ["CAJABLANCA_DATA_DIR"] = folder
+    storage.close_all_connections()
+    try:
+        yield folder
+    finally:
+        storage.close_all_connections()
+        if previous is None:
+            os.environ.pop("CAJABLANCA_DATA_DIR", None)
+        else:
+            os.environ["CAJABLANCA_DATA_DIR"] = previous
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def populate_players(count: int):
+    """Reemplaza los jugadores demo por `count` jugadores sintéticos."""
+    conn = storage.get_connection()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM player_stats;")
+    cur.execute("DELETE FROM players;")
+    cur.executemany(
+        """
+        INSERT INTO players (id, nombre, apellido, cedula, telefono, pago)
+        VALUES (?, ?, ?, ?, ?, 5000)
+        """,
+        [
+            (i, f"Jugador {i}", "Bench", f"001-{i:07d}-1", f"809-555-{i % 10000:04d}")
+            for i in range(1, count + 1)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    storage.ensure_player_stats_rows()
+
+
+def populate_round(round_number: int, rng: random.Random, with_scores: bool = True):
+    """Sienta a todos los jugadores al azar y (opcional) guarda puntos por mesa."""
+    ids = [p["id"] for p in storage.get_all_players()]
+    rng.shuffle(ids)
+
+    conn = storage.get_connection()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM seats WHERE round = ?;", (round_number,))
+    cur.execute("DELETE FROM table_status WHERE round = ?;", (round_number,))
+    cur.execute("DELETE FROM player_round_scores WHERE round = ?;", (round_number,))
+
+    seat_rows = []
+    score_rows = []
+    status_rows = []
+    for mesa_idx in range(len(ids) // 4):
+        mesa_num = mesa_idx + 1
+        winner_pair = rng.choice(("AC", "BD"))
+        status_rows.append((round_number, mesa_num, "finished" if with_scores else "playing"))
+        for offset, letra in enumerate(("A", "B", "C", "D")):
+            jid = ids[mesa_idx * 4 + offset]
+            seat_rows.append((round_number, mesa_num, letra, jid))
+            base = rng.randint(0, 200)
+            penalty = rng.choice((0, 0, 0, 10))
+            score_rows.append(
+                (round_number, mesa_num, jid, letra, base, penalty, max(0, base - penalty), winner_pair)
+            )
+
+    cur.executemany(
+        "INSERT INTO seats (round, mesa, letra, jugador_id) VALUES (?, ?, ?, ?);",
+        seat_rows,
+    )
+    cur.executemany(
+        "INSERT INTO table_status (round, mesa, status) VALUES (?, ?, ?);",
+        status_rows,
+    )
+    if with_scores:
+        cur.executemany(
+            """
+            INSERT INTO player_round_scores (
+                round, mesa, jugador_id, letra,
+                base_points, penalty_points, final_points, winner_pair
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            score_rows,
+        )
+    conn.commit()
+    conn.close()
+
+
+def build_synthetic_tournament(players: int, rounds: int, seed: int = 1234, scored_rounds: int | None = None):
+    """BD con `players` jugadores y `rounds` rondas (las primeras `scored_rounds` con puntos)."""
+    storage.init_db()
+    populate_players(players)
+
+    if scored_rounds is None:
+        scored_rounds = rounds
+
+    rng = random.Random(seed)
+    for rnd in range(1, rounds + 1):
+        populate_round(rnd, rng, with_scores=rnd <= scored_rounds)
@@ -0,0 +1,242 @@
+# core/conflicts.py
+#
+# Índice en memoria de "¿X e Y ya fueron pareja / rivales / compañeros de mesa?".
+# Lo comparten el emparejamiento (core.pairing), la validación y los reportes.
+#
+# Cada jugador solo comparte mesa con 3 personas por ronda, así que la matriz
+# jugador x jugador es casi vacía: se guarda como diccionarios con clave entera
+# empaquetada (min_id << 32 | max_id), que dan consulta O(1) sin reservar N².
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+
+from core import storage
+
+SEAT_LETTERS = ("A", "B", "C", "D")
+PARTNER_SEATS = ((0, 2), (1, 3))                    # A+C, B+D
+OPPONENT_SEATS = ((0, 1), (0, 3), (2, 1), (2, 3))   # A-B, A-D, C-B, C-D
+
+
+def pair_key(a: int, b: int) -> int:
+    return (a << 32) | b if a < b else (b << 32) | a
+
+
+class ConflictIndex:
+    """
+    Historial de parejas / rivales / compañeros de mesa por par de jugadores.
+    Las mesas se guardan por ronda para poder reemplazar una ronda completa
+    (re-generación) sin reconstruir todo.
+    """
+
+    def __init__(self):
+        self._rounds: dict[int, dict[int, tuple[int, int, int, int]]] = {}
+        self._partners: dict[int, int] = {}
+        self._opponents: dict[int, int] = {}
+        self._meetings: dict[int, list[tuple[int, int]]] = {}
+
+    # ---------- construcción ----------
+
+    @classmethod
+    def from_seat_rows(cls, rows) -> "ConflictIndex":
+        """rows = [(round, mesa, letra, jugador_id), ...] (tabla seats)."""
+        tables: dict[tuple[int, int], dict[str, int]] = {}
+        for rnd, mesa, letra, jid in rows:
+            tables.setdefault((rnd, mesa), {})[letra] = jid
+
+        index = cls()
+        for (rnd, mesa), seats in sorted(tables.items()):
+            if all(letra in seats for letra in SEAT_LETTERS):
+                index.add_table(rnd, mesa, [seats[letra] for letra in SEAT_LETTERS])
+        return index
+
+    def add_table(self, round_number: int, mesa_number: int, ids):
+        """ids = [A, B, C, D] (ids de jugador). Reemplaza la mesa si ya existía."""
+        ids = tuple(ids)
+        tables = self._rounds.setdefault(round_number, {})
+        if mesa_number in tables:
+            self.remove_table(round_number, mesa_number)
+            tables = self._rounds.setdefault(round_number, {})
+        tables[mesa_number] = ids
+        self._apply_table(round_number, mesa_number, ids, +1)
+
+    def remove_table(self, round_number: int, mesa_number: int):
+        tables = self._rounds.get(round_number)
+        if not tables or mesa_number not in tables:
+            return
+        ids = tables.pop(mesa_number)
+        if not tables:
+            del self._rounds[round_number]
+        self._apply_table(round_number, mesa_number, ids, -1)
+
+    def set_round(self, round_number: int, tables):
+        """Reemplaza la ronda completa. tables = [(mesa, [A, B, C, D]), ...]."""
+        self.remove_round(round_number)
+        for mesa_number, ids in tables:
+            self.add_table(round_number, mesa_number, ids)
+
+    def remove_round(self, round_number: int):
+        for mesa_number, ids in self._rounds.pop(round_number, {}).items():
+            self._apply_table(round_number, mesa_number, ids, -1)
+
+    @contextmanager
+    def excluding(self, round_number: int):
+        """Oculta temporalmente una ronda (ej: al re-generarla)."""
+        saved = list(self._rounds.get(round_number, {}).items())
+        self.remove_round(round_number)
+        try:
+            yield self
+        finally:
+            self.set_round(round_number, saved)
+
+    def _apply_table(self, round_number: int, mesa_number: int, ids, sign: int):
+        for i, j in PARTNER_SEATS:
+            _bump(self._partners, pair_key(ids[i], ids[j]), sign)
+        for i, j in OPPONENT_SEATS:
+            _bump(self._opponents, pair_key(ids[i], ids[j]), sign)
+
+        where = (round_number, mesa_number)
+        for i in range(4):
+            for j in range(i + 1, 4):
+                k = pair_key(ids[i], ids[j])
+                if sign > 0:
+                    self._meetings.setdefault(k, []).append(where)
+                else:
+                    met = self._meetings.get(k)
+                    if met and where in met:
+                        met.remove(where)
+                        if not met:
+                            del self._meetings[k]
+
+    # ---------- consultas O(1) ----------
+
+    def partner_count(self, a: int, b: int) -> int:
+        return self._partners.get(pair_key(a, b), 0)
+
+    def opponent_count(self, a: int, b: int) -> int:
+        return self._opponents.get(pair_key(a, b), 0)
+
+    def tablemate_count(self, a: int, b: int) -> int:
+        return len(self._meetings.get(pair_key(a, b), ()))
+
+    def tablemate_history(self, a: int, b: int) -> list[tuple[int, int]]:
+        """[(ronda, mesa), ...] donde a y b compartieron mesa."""
+        return sorted(self._meetings.get(pair_key(a, b), ()))
+
+    def seat_count(self) -> int:
+        return 4 * sum(len(tables) for tables in self._rounds.values())
+
+    def seat_rows(self) -> list[tuple[int, int, str, int]]:
+        """Las mesas del índice como filas de seats: [(round, mesa, letra, jugador_id)]."""
+        return [
+            (rnd, mesa, letra, pid)
+            for rnd, tables in self._rounds.items()
+            for mesa, ids in tables.items()
+            for letra, pid in zip(SEAT_LETTERS, ids)
+        ]
+
+    def rounds(self) -> list[int]:
+        return sorted(self._rounds)
+
+    def round_tables(self, round_number: int) -> list[tuple[int, tuple[int, int, int, int]]]:
+        return sorted(self._rounds.get(round_number, {}).items())
+
+    # ---------- validación / reportes ----------
+
+    def table_violations(self, ids) -> tuple[int, int]:
+        """
+        (parejas repetidas, rivales repetidos) de una mesa [A, B, C, D]
+        contra lo que ya está en el índice.
+        """
+        rp = 0
+        for i, j in PARTNER_SEATS:
+            rp += self.partner_count(ids[i], ids[j])
+        ro = 0
+        for i, j in OPPONENT_SEATS:
+            ro += self.opponent_count(ids[i], ids[j])
+        return rp, ro
+
+    def round_conflicts(self, round_number: int) -> list[dict]:
+        """
+        Repeticiones de la ronda contra las demás rondas:
+        [{mesa, a, b, kind: 'pareja'|'rival', rounds: [(ronda, mesa), ...]}]
+        """
+        tables = self.round_tables(round_number)
+        conflicts: list[dict] = []
+        with self.excluding(round_number):
+            for mesa_number, ids in tables:
+                for kind, seats, counter in (
+                    ("pareja", PARTNER_SEATS, self.partner_count),
+                    ("rival", OPPONENT_SEATS, self.opponent_count),
+                ):
+                    for i, j in seats:
+                        if counter(ids[i], ids[j]):
+                            conflicts.append(
+                                {
+                                    "mesa": mesa_number,
+                                    "a": ids[i],
+                                    "b": ids[j],
+                                    "kind": kind,
+                                    "rounds": self.tablemate_history(ids[i], ids[j]),
+                                }
+                            )
+        return conflicts
+
+
+def _bump(counter: dict[int, int], key: int, sign: int):
+    value = counter.get(key, 0) + sign
+    if value > 0:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+# ======================================================================
+# Índice compartido (se mantiene al día con save_round_assignments)
+# ======================================================================
+
+_shared_index: ConflictIndex | None = None
+_shared_signature: tuple | None = None
+
+
+def _seats_signature(conn: sqlite3.Connection | None = None) -> tuple:
+    # Detecta cambios hechos por otra PC / fuera de save_round_assignments
+    return storage.get_seats_signature(conn=conn)
+
+
+def get_conflict_index(conn: sqlite3.Connection | None = None) -> ConflictIndex:
+    """
+    Índice compartido. Se construye con UNA consulta a seats y luego se
+    actualiza de forma incremental cada vez que se guarda una ronda.
+    """
+    global _shared_index, _shared_signature
+
+    signature = _seats_signature(conn)
+    if _shared_index is None or signature != _shared_signature:
+        _shared_index = ConflictIndex.from_seat_rows(storage.get_all_seat_rows(conn=conn))
+        _shared_signature = signature
+    return _shared_index
+
+
+def invalidate_conflict_index():
+    global _shared_index, _shared_signature
+    _shared_index = None
+    _shared_signature = None
+
+
+def _on_round_saved(round_number: int, tables, conn):
+    global _shared_signature
+    if _shared_index is None:
+        return
+    _shared_index.set_round(round_number, tables)
+
+    signature = _seats_signature(conn)
+    if signature[0] != _shared_index.seat_count():
+        # la BD tenía cambios que el índice no conocía: reconstruir en el próximo uso
+        invalidate_conflict_index()
+        return
+    _shared_signature = signature
+
+
+storage.add_round_listener(_on_round_saved, invalidate_conflict_index)
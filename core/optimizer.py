@@ -0,0 +1,388 @@
+# core/optimizer.py
+#
+# Optimizador multi-arranque para generar rondas.
+# Lanza muchos intentos independientes (cada uno con su propia semilla) en
+# varios núcleos con ProcessPoolExecutor, puntúa cada ronda candidata y se
+# queda con la mejor dentro del tiempo límite.
+#
+# Puntaje (menor = mejor, 0 = ronda perfecta):
+#   parejas repetidas * 100 + rivales repetidos * 10 + compañeros de mesa repetidos * 1
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from core import pairing
+from core.conflicts import ConflictIndex
+
+REPEAT_PARTNER_WEIGHT = 100
+REPEAT_OPPONENT_WEIGHT = 10
+REPEAT_TABLEMATE_WEIGHT = 1
+
+MAX_WORKERS = 8
+
+# Versión del algoritmo de generación. Una ronda se puede reconstruir exacta a
+# partir de su semilla (core.replay) solo con la MISMA versión: subir este
+# número cada vez que cambie core.pairing o la forma de usar el rng.
+GENERATOR_VERSION = 1
+
+# Presupuesto de búsqueda local por intento. Se mide en iteraciones (no en
+# segundos) para que la misma semilla dé la misma ronda en cualquier PC.
+# Un intento que se corta por el tiempo límite devuelve las iteraciones que
+# alcanzó a hacer; con ellas (y la semilla) se reconstruye igual.
+ATTEMPT_ITERATIONS = 50_000
+
+
+def score_round(index: ConflictIndex, tables: list[list[int]]) -> dict:
+    """Puntúa una ronda candidata contra el historial del índice."""
+    rp = ro = rt = 0
+    for t in tables:
+        a, b = index.table_violations(t)
+        rp += a
+        ro += b
+        for i in range(4):
+            for j in range(i + 1, 4):
+                rt += index.tablemate_count(t[i], t[j])
+
+    return {
+        "repeat_partners": rp,
+        "repeat_opponents": ro,
+        "repeat_tablemates": rt,
+        "score": (
+            rp * REPEAT_PARTNER_WEIGHT
+            + ro * REPEAT_OPPONENT_WEIGHT
+            + rt * REPEAT_TABLEMATE_WEIGHT
+        ),
+    }
+
+
+def build_candidate(job: dict, index: ConflictIndex, rng: random.Random) -> list[list[int]]:
+    """
+    job = {
+      "kind": "first" | "round2" | "general",
+      "player_ids": [...],            # first / general
+      "previous_tables": [[A,B,C,D]], # round2
+      "max_iterations": int,          # general: búsqueda local por intento
+    }
+    Determinista: el mismo job + índice + semilla => las mismas mesas.
+    """
+    return _build_attempt(job, index, rng)[0]
+
+
+def _build_attempt(
+    job: dict,
+    index: ConflictIndex,
+    rng: random.Random,
+    deadline: float | None = None,
+) -> tuple[list[list[int]], int | None]:
+    """
+    Como build_candidate, pero la búsqueda local se corta en `deadline`
+    (time.time(): sirve entre procesos). Devuelve (mesas, iteraciones hechas);
+    iteraciones=None si el tipo de ronda no tiene búsqueda local.
+    """
+    kind = job["kind"]
+    if kind == "first":
+        return pairing.shuffle_tables(job["player_ids"], rng), None
+    if kind == "round2":
+        return pairing.round2_tables(job["previous_tables"], rng), None
+
+    time_limit = float("inf") if deadline is None else max(0.0, deadline - time.time())
+    built = pairing.build_round(
+        job["player_ids"],
+        index,
+        rng,
+        time_limit=time_limit,
+        max_iterations=job.get("max_iterations", ATTEMPT_ITERATIONS),
+    )
+    return built["tables"], built["iterations"]
+
+
+# ----------------------------------------------------------------------
+# Proceso trabajador
+# ----------------------------------------------------------------------
+
+_worker_index: ConflictIndex | None = None
+_worker_job: dict | None = None
+
+
+def _init_worker(seat_rows: list[tuple], job: dict):
+    global _worker_index, _worker_job
+    _worker_index = ConflictIndex.from_seat_rows(seat_rows)
+    _worker_job = job
+
+
+def _run_attempt(seed: int, deadline: float) -> tuple[int, list[list[int]], dict, int | None]:
+    tables, iterations = _build_attempt(_worker_job, _worker_index, random.Random(seed), deadline)
+    return seed, tables, score_round(_worker_index, tables), iterations
+
+
+# ----------------------------------------------------------------------
+# API
+# ----------------------------------------------------------------------
+
+def optimize(
+    job: dict,
+    seat_rows: list[tuple],
+    time_limit: float = 3.0,
+    workers: int | None = None,
+    max_attempts: int | None = None,
+    base_seed: int | None = None,
+) -> dict:
+    """
+    Corre intentos con semillas base_seed, base_seed+1, ... hasta agotar el tiempo
+    (o encontrar una ronda perfecta). seat_rows = sillas de las rondas a respetar.
+    Los intentos en curso también se cortan al vencer el tiempo.
+
+    Devuelve {tables, seed, iterations, attempts, workers, elapsed,
+              repeat_partners, repeat_opponents, repeat_tablemates, score}.
+    iterations = búsqueda local del intento ganador (para core.replay);
+    None si el tipo de ronda no la usa.
+    """
+    if workers is None:
+        workers = min(MAX_WORKERS, os.cpu_count() or 1)
+    if base_seed is None:
+        base_seed = random.SystemRandom().randrange(1 << 31)
+
+    t0 = time.perf_counter()
+    # reloj de pared: el mismo vencimiento se revisa dentro de cada proceso
+    deadline = time.time() + max(0.0, time_limit)
+
+    if workers > 1:
+        try:
+            best, attempts = _optimize_parallel(
+                job, seat_rows, deadline, workers, max_attempts, base_seed
+            )
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # sin procesos disponibles (entorno restringido): seguir en este proceso
+            workers = 1
+
+    if workers <= 1:
+        best, attempts = _optimize_serial(job, seat_rows, deadline, max_attempts, base_seed)
+
+    seed, tables, score, iterations = best
+    result = {
+        "tables": tables,
+        "seed": seed,
+        "iterations": iterations,
+        "attempts": attempts,
+        "workers": workers,
+        "elapsed": time.perf_counter() - t0,
+    }
+    result.update(score)
+    return result
+
+
+def _better(candidate, best) -> bool:
+    return best is None or candidate[2]["score"] < best[2]["score"]
+
+
+def _optimize_serial(job, seat_rows, deadline, max_attempts, base_seed):
+    index = ConflictIndex.from_seat_rows(seat_rows)
+    best = None
+    attempts = 0
+    for seed in itertools.count(base_seed):
+        tables, iterations = _build_attempt(job, index, random.Random(seed), deadline)
+        candidate = (seed, tables, score_round(index, tables), iterations)
+        attempts += 1
+        if _better(candidate, best):
+            best = candidate
+        if best[2]["score"] == 0:
+            break
+        if max_attempts is not None and attempts >= max_attempts:
+            break
+        if time.time() >= deadline:
+            break
+    return best, attempts
+
+
+def _optimize_parallel(job, seat_rows, deadline, workers, max_attempts, base_seed):
+    seeds = itertools.count(base_seed)
+    best = None
+    attempts = 0
+    submitted = 0
+
+    def can_submit() -> bool:
+        return max_attempts is None or submitted < max_attempts
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(seat_rows, job),
+    ) as ex:
+        pending = set()
+        for _ in range(workers * 2):
+            if not can_submit():
+                break
+            pending.add(ex.submit(_run_attempt, next(seeds), deadline))
+            submitted += 1
+
+        while pending:
+            # si todavía no hay ningún resultado, esperar (los intentos en curso
+            # se cortan solos al vencer el tiempo)
+            timeout = None if best is None else max(0.0, deadline - time.time())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                candidate = fut.result()
+                attempts += 1
+                if _better(candidate, best):
+                    best = candidate
+
+            if best is not None and (
+                best[2]["score"] == 0 or time.time() >= deadline
+            ):
+                break
+
+            for _ in range(len(done)):
+                if not can_submit():
+                    break
+                pending.add(ex.submit(_run_attempt, next(seeds), deadline))
+                submitted += 1
+
+        for fut in pending:
+            fut.cancel()
+
+    return best, attempts
+
+
+# ----------------------------------------------------------------------
+# Calendario completo (todas las rondas sin resultados, planificadas juntas)
+# ----------------------------------------------------------------------
+
+def table_penalty(index: ConflictIndex, ids) -> int:
+    """Puntaje de una mesa contra TODO lo que hay en el índice."""
+    rp, ro = index.table_violations(ids)
+    rt = 0
+    for i in range(4):
+        for j in range(i + 1, 4):
+            rt += index.tablemate_count(ids[i], ids[j])
+    return rp * REPEAT_PARTNER_WEIGHT + ro * REPEAT_OPPONENT_WEIGHT + rt * REPEAT_TABLEMATE_WEIGHT
+
+
+def plan_schedule(
+    player_ids: list[int],
+    index: ConflictIndex,
+    rounds: list[int],
+    rng: random.Random | None = None,
+    time_limit: float = 3.0,
+    max_iterations: int | None = None,
+) -> dict:
+    """
+    Planifica varias rondas a la vez. `index` trae las rondas ya jugadas (fijas)
+    y se completa con las planificadas.
+
+    1) Se arma cada ronda en orden (1: mezcla, 2: pareja anterior => enemigo,
+       3+: core.pairing.build_round).
+    2) Las rondas 3+ se mejoran juntas con búsqueda local: cada intercambio se
+       evalúa contra TODAS las demás rondas (anteriores y posteriores), así una
+       ronda temprana también se acomoda a las que vienen.
+
+    Devuelve {"rounds": {ronda: [[A, B, C, D], ...]}, "quality": {ronda: score_round},
+              "score": total, "iterations": int}.
+
+    Con max_iterations (y sin límite de tiempo) es determinista: la misma semilla
+    y las mismas `iterations` devueltas reconstruyen el mismo calendario.
+    """
+    rng = rng or random.Random()
+    plan: dict[int, list[list[int]]] = {}
+    deadline = float("inf") if max_iterations is not None else time.perf_counter() + time_limit
+
+    for rnd in rounds:
+        if rnd == 1:
+            tables = pairing.shuffle_tables(player_ids, rng)
+        elif rnd == 2:
+            previous = [list(ids) for _, ids in index.round_tables(1)]
+            tables = pairing.round2_tables(previous, rng)
+        else:
+            with index.excluding(rnd):
+                tables = pairing.build_round(
+                    player_ids,
+                    index,
+                    rng,
+                    time_limit=float("inf"),
+                    max_iterations=ATTEMPT_ITERATIONS,
+                )["tables"]
+        plan[rnd] = tables
+        index.set_round(rnd, [(m, t) for m, t in enumerate(tables, start=1)])
+
+    # la regla de ronda 2 no se puede tocar; la ronda 1 tampoco si la 2 depende de ella
+    free_rounds = [r for r in rounds if r >= 3 and len(plan[r]) >= 2]
+    iterations = _improve_schedule(index, plan, free_rounds, rng, deadline, max_iterations)
+
+    quality = {}
+    for rnd in rounds:
+        with index.excluding(rnd):
+            quality[rnd] = score_round(index, plan[rnd])
+
+    return {
+        "rounds": plan,
+        "quality": quality,
+        "score": sum(q["score"] for q in quality.values()),
+        "iterations": iterations,
+    }
+
+
+def _improve_schedule(
+    index: ConflictIndex,
+    plan: dict[int, list[list[int]]],
+    free_rounds: list[int],
+    rng: random.Random,
+    deadline: float,
+    max_iterations: int | None = None,
+) -> int:
+    if not free_rounds:
+        return 0
+
+    iterations = 0
+
+    while True:
+        iterations += 1
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        if iterations % 256 == 0:
+            if time.perf_counter() > deadline:
+                break
+            if iterations % 4096 == 0 and _schedule_penalty(index, plan, free_rounds) == 0:
+                break
+
+        rnd = rng.choice(free_rounds)
+        tables = plan[rnd]
+        ti = rng.randrange(len(tables))
+        ui = rng.randrange(len(tables) - 1)
+        if ui >= ti:
+            ui += 1
+        t = tables[ti]
+        u = tables[ui]
+
+        # sacar ambas mesas del índice para medirlas contra el resto
+        index.remove_table(rnd, ti + 1)
+        index.remove_table(rnd, ui + 1)
+        old = table_penalty(index, t) + table_penalty(index, u)
+
+        si = rng.randrange(4)
+        sj = rng.randrange(4)
+        t[si], u[sj] = u[sj], t[si]
+        new = table_penalty(index, t) + table_penalty(index, u)
+
+        if not (new < old or (new == old and rng.random() < 0.3)):
+            t[si], u[sj] = u[sj], t[si]
+
+        index.add_table(rnd, ti + 1, t)
+        index.add_table(rnd, ui + 1, u)
+
+    return iterations
+
+
+def _schedule_penalty(index: ConflictIndex, plan, free_rounds) -> int:
+    total = 0
+    for rnd in free_rounds:
+        for mesa, t in enumerate(plan[rnd], start=1):
+            index.remove_table(rnd, mesa)
+            total += table_penalty(index, t)
+            index.add_table(rnd, mesa, t)
+    return total
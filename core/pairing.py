@@ -0,0 +1,226 @@
+# core/pairing.py
+#
+# Motor de emparejamiento para rondas 3..5.
+# Evita repetir parejas y rivales de TODAS las rondas anteriores:
+#   1) construcción greedy (primer candidato sin conflicto)
+#   2) reparación por búsqueda local (intercambios entre mesas / re-emparejar mesa)
+# Si no existe una ronda perfecta, devuelve la mejor encontrada y cuántas
+# restricciones tuvo que relajar.
+
+from __future__ import annotations
+
+import random
+import time
+
+# Ventana de candidatos que mira el greedy por cada asiento
+GREEDY_WINDOW = 64
+
+
+def table_cost(index, ids: list[int]) -> int:
+    rp, ro = index.table_violations(ids)
+    return rp + ro
+
+
+def build_round(
+    player_ids: list[int],
+    index,
+    rng: random.Random | None = None,
+    time_limit: float = 0.5,
+    max_iterations: int | None = None,
+) -> dict:
+    """
+    Arma una ronda con len(player_ids) // 4 mesas.
+    `index` es un core.conflicts.ConflictIndex con las rondas a respetar.
+    Devuelve:
+      {
+        "tables": [[A, B, C, D], ...],   # ids de jugador
+        "bench": [ids que no juegan],    # sobrantes si no es múltiplo de 4
+        "repeat_partners": int,
+        "repeat_opponents": int,
+        "relaxed": int,                  # repeat_partners + repeat_opponents
+        "iterations": int,               # iteraciones de búsqueda local hechas
+      }
+    Con max_iterations=iterations (sin límite de tiempo) la misma semilla
+    reconstruye exactamente la misma ronda, aunque se haya cortado por tiempo.
+    """
+    rng = rng or random.Random()
+    ids = list(player_ids)
+    rng.shuffle(ids)
+
+    n_tables = len(ids) // 4
+    bench = ids[n_tables * 4:]
+    pool = ids[:n_tables * 4]
+
+    tables = _greedy_tables(pool, index)
+    iterations = _repair(tables, index, rng, time_limit, max_iterations)
+
+    rp = ro = 0
+    for t in tables:
+        a, b = index.table_violations(t)
+        rp += a
+        ro += b
+
+    return {
+        "tables": tables,
+        "bench": bench,
+        "repeat_partners": rp,
+        "repeat_opponents": ro,
+        "relaxed": rp + ro,
+        "iterations": iterations,
+    }
+
+
+# ----------------------------------------------------------------------
+# Rondas 1 y 2 (mismas reglas que tournament, sobre ids)
+# ----------------------------------------------------------------------
+
+def shuffle_tables(player_ids: list[int], rng: random.Random) -> list[list[int]]:
+    """Ronda 1: mezcla y sienta de 4 en 4 (A, B, C, D). Los sobrantes no juegan."""
+    ids = list(player_ids)
+    rng.shuffle(ids)
+    return [ids[i:i + 4] for i in range(0, len(ids) - len(ids) % 4, 4)]
+
+
+def round2_tables(previous_tables: list[list[int]], rng: random.Random) -> list[list[int]]:
+    """
+    Ronda 2: la pareja anterior pasa a ser enemiga.
+    Parejas (p, q) y (r, s) => mesa [A=p, B=q, C=r, D=s] (p vs q, r vs s).
+    """
+    pairs = []
+    for a, b, c, d in previous_tables:
+        pairs.append((a, c))
+        pairs.append((b, d))
+
+    rng.shuffle(pairs)
+
+    tables = []
+    for i in range(0, len(pairs) - 1, 2):
+        p, q = pairs[i]
+        r, s = pairs[i + 1]
+        # aleatorizar quién va "del lado A/C" o "del lado B/D" dentro de cada pareja
+        if rng.random() < 0.5:
+            p, q = q, p
+        if rng.random() < 0.5:
+            r, s = s, r
+        tables.append([p, q, r, s])
+    return tables
+
+
+# ----------------------------------------------------------------------
+# Greedy
+# ----------------------------------------------------------------------
+
+def _pick(remaining: list[int], cost_fn) -> int:
+    """Saca de `remaining` el primer candidato con costo 0 (o el mínimo de la ventana)."""
+    best_idx = 0
+    best_cost = None
+    for idx in range(min(GREEDY_WINDOW, len(remaining))):
+        c = cost_fn(remaining[idx])
+        if c == 0:
+            best_idx = idx
+            break
+        if best_cost is None or c < best_cost:
+            best_cost = c
+            best_idx = idx
+    return remaining.pop(best_idx)
+
+
+def _greedy_tables(pool: list[int], index) -> list[list[int]]:
+    remaining = list(pool)
+    tables: list[list[int]] = []
+    pc = index.partner_count
+    oc = index.opponent_count
+
+    while len(remaining) >= 4:
+        a = remaining.pop(0)
+        c = _pick(remaining, lambda x: pc(a, x))
+        b = _pick(remaining, lambda x: oc(a, x) + oc(c, x))
+        d = _pick(remaining, lambda x: pc(b, x) + oc(a, x) + oc(c, x))
+        tables.append([a, b, c, d])
+
+    return tables
+
+
+# ----------------------------------------------------------------------
+# Búsqueda local
+# ----------------------------------------------------------------------
+
+# Las 3 formas de repartir 4 jugadores en 2 parejas: AC|BD, AB|CD, AD|BC
+_REPAIRINGS = ((0, 1, 2, 3), (0, 2, 1, 3), (0, 1, 3, 2))
+
+
+def _repair(
+    tables: list[list[int]],
+    index,
+    rng: random.Random,
+    time_limit: float,
+    max_iterations: int | None,
+) -> int:
+    """Mejora las mesas en su lugar. Devuelve las iteraciones completadas."""
+    if len(tables) < 1:
+        return 0
+
+    costs = [table_cost(index, t) for t in tables]
+    bad = {i for i, c in enumerate(costs) if c > 0}
+    if not bad:
+        return 0
+
+    deadline = time.perf_counter() + time_limit
+    iterations = 0
+    n = len(tables)
+
+    while bad:
+        iterations += 1
+        if max_iterations is not None and iterations > max_iterations:
+            return iterations - 1
+        if iterations % 256 == 0 and time.perf_counter() > deadline:
+            return iterations - 1
+
+        ti = rng.choice(tuple(bad))
+        t = tables[ti]
+
+        # 1) re-emparejar la misma mesa
+        improved = False
+        for perm in _REPAIRINGS[1:]:
+            cand = [t[perm[0]], t[perm[1]], t[perm[2]], t[perm[3]]]
+            cc = table_cost(index, cand)
+            if cc < costs[ti]:
+                tables[ti] = cand
+                costs[ti] = cc
+                improved = True
+                break
+        if improved:
+            if costs[ti] == 0:
+                bad.discard(ti)
+            continue
+
+        if n < 2:
+            return iterations
+
+        # 2) intercambiar un jugador con otra mesa
+        ui = rng.randrange(n - 1)
+        if ui >= ti:
+            ui += 1
+        u = tables[ui]
+        si = rng.randrange(4)
+        sj = rng.randrange(4)
+
+        t[si], u[sj] = u[sj], t[si]
+        ct = table_cost(index, t)
+        cu = table_cost(index, u)
+        old = costs[ti] + costs[ui]
+        new = ct + cu
+
+        # acepta mejoras y, a veces, movimientos laterales (salir de mesetas)
+        if new < old or (new == old and rng.random() < 0.3):
+            costs[ti] = ct
+            costs[ui] = cu
+            for idx, c in ((ti, ct), (ui, cu)):
+                if c > 0:
+                    bad.add(idx)
+                else:
+                    bad.discard(idx)
+        else:
+            t[si], u[sj] = u[sj], t[si]
+
+    return iterations
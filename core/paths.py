@@ -37,8 +37,13 @@ def user_data_dir() -> Path:
     """
     Carpeta de datos del usuario (persistente).
     Recomendado para BD, PDFs, etc.
+    CAJABLANCA_DATA_DIR permite usar otra carpeta (benchmarks, pruebas).
     """
-    base = Path.home() / "Documents" / APP_NAME
+    override = os.environ.get("CAJABLANCA_DATA_DIR")
+    if override:
+        base = Path(override)
+    else:
+        base = Path.home() / "Documents" / APP_NAME
     base.mkdir(parents=True, exist_ok=True)
     return base
 
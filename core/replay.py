@@ -0,0 +1,142 @@
+# core/replay.py
+#
+# Reconstrucción exacta de rondas a partir de su semilla.
+# Cada ronda generada guarda en round_generation: semilla, versión del
+# generador, tipo de generación y una huella (hash) de sus entradas
+# (jugadores + rondas que se respetaron). Con eso se puede:
+#   - re-armar la ronda sin guardar de nuevo la lista de asientos
+#   - auditar que lo guardado en seats coincide con lo generado
+#   - comparar dos rondas (diff por mesa) de forma barata
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import sqlite3
+
+from core import optimizer
+from core import storage
+from core.conflicts import SEAT_LETTERS, ConflictIndex
+
+
+def inputs_fingerprint(kind: str, player_ids, history_rows) -> str:
+    """Huella de las entradas de una generación (jugadores + sillas respetadas)."""
+    payload = json.dumps(
+        [kind, sorted(player_ids), sorted(tuple(r) for r in history_rows)],
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def generation_record(kind: str, players: list[dict], history_rows, **params) -> dict:
+    """
+    Arma los parámetros a guardar con storage.save_round_generation.
+    Los jugadores se identifican por (cantidad, id máximo): en la BD solo se
+    agregan jugadores, así que con eso se recupera la misma lista.
+    """
+    player_ids = [p["id"] for p in players]
+    history_rounds = sorted({r[0] for r in history_rows})
+    return {
+        "kind": kind,
+        "params": {
+            "player_count": len(player_ids),
+            "max_player_id": max(player_ids, default=0),
+            "history_rounds": history_rounds,
+            **params,
+        },
+        "inputs_hash": inputs_fingerprint(kind, player_ids, history_rows),
+    }
+
+
+def replay_round(round_number: int, conn: sqlite3.Connection | None = None):
+    """
+    Re-genera la ronda con su semilla guardada.
+    Devuelve (mensaje_error | None, [[A, B, C, D], ...]).
+    """
+    gen = storage.get_round_generation(round_number, conn=conn)
+    if gen is None:
+        return f"La ronda {round_number} no tiene semilla registrada.", None
+    if gen["generator_version"] != optimizer.GENERATOR_VERSION:
+        return (
+            f"La ronda {round_number} se generó con la versión "
+            f"{gen['generator_version']} del generador (actual: {optimizer.GENERATOR_VERSION}).",
+            None,
+        )
+
+    params = gen["params"]
+    player_ids = [
+        p["id"] for p in storage.get_all_players(conn=conn)
+        if p["id"] <= params["max_player_id"]
+    ]
+    history = set(params["history_rounds"])
+    history_rows = [row for row in storage.get_all_seat_rows(conn=conn) if row[0] in history]
+
+    if (
+        len(player_ids) != params["player_count"]
+        or inputs_fingerprint(gen["kind"], player_ids, history_rows) != gen["inputs_hash"]
+    ):
+        return (
+            f"Las entradas de la ronda {round_number} cambiaron "
+            "(jugadores o rondas anteriores); no se puede reconstruir.",
+            None,
+        )
+
+    index = ConflictIndex.from_seat_rows(history_rows)
+    rng = random.Random(gen["seed"])
+
+    if gen["kind"] == "schedule":
+        plan = optimizer.plan_schedule(
+            player_ids,
+            index,
+            params["schedule_rounds"],
+            rng=rng,
+            max_iterations=params["iterations"],
+        )
+        return None, plan["rounds"][round_number]
+
+    if gen["kind"] == "round2":
+        job = {
+            "kind": "round2",
+            "previous_tables": [list(ids) for _, ids in index.round_tables(round_number - 1)],
+        }
+    else:
+        job = {
+            "kind": gen["kind"],
+            "player_ids": player_ids,
+            "max_iterations": params.get("max_iterations", optimizer.ATTEMPT_ITERATIONS),
+        }
+    return None, optimizer.build_candidate(job, index, rng)
+
+
+def diff_tables(before: list, after: list) -> list[dict]:
+    """
+    Diferencias mesa por mesa entre dos rondas ([[A, B, C, D], ...]).
+    [{mesa, before: (A, B, C, D) | None, after: (A, B, C, D) | None}]
+    """
+    diffs = []
+    for idx in range(max(len(before), len(after))):
+        a = tuple(before[idx]) if idx < len(before) else None
+        b = tuple(after[idx]) if idx < len(after) else None
+        if a != b:
+            diffs.append({"mesa": idx + 1, "before": a, "after": b})
+    return diffs
+
+
+def stored_tables(round_number: int, conn: sqlite3.Connection | None = None) -> list[list[int]]:
+    """Mesas guardadas en seats como [[A, B, C, D], ...] (ordenadas por mesa)."""
+    tables: dict[int, dict[str, int]] = {}
+    for seat in storage.get_round_seat_list(round_number, conn=conn):
+        tables.setdefault(seat["mesa"], {})[seat["letra"]] = seat["jugador_id"]
+    return [[seats.get(letra) for letra in SEAT_LETTERS] for _, seats in sorted(tables.items())]
+
+
+def verify_round(round_number: int, conn: sqlite3.Connection | None = None):
+    """
+    Compara lo guardado en seats con la reconstrucción por semilla.
+    Devuelve (mensaje_error | None, diffs); diffs vacío => coinciden.
+    """
+    error, tables = replay_round(round_number, conn=conn)
+    if error:
+        return error, []
+    return None, diff_tables(stored_tables(round_number, conn=conn), tables)
@@ -2,8 +2,9 @@
 #
 # Genera PDF de asignación "ID / Mesa" por ronda (para pegar en el club).
 
+import io
 import os
-from typing import Tuple
+from typing import BinaryIO, Tuple
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
@@ -23,28 +24,46 @@ def generate_round_assignment_sheet(
     Genera PDF con listado ID | Mesa en columnas repetidas.
     Devuelve (ruta_absoluta_pdf, carpeta_salida).
     """
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, f"ronda{round_number}_asignacion.pdf")
+
+    # ReportLab abre el archivo recién al guardar: si la ronda no tiene mesas
+    # no queda un PDF vacío
+    write_round_assignment_sheet(filename, round_number, tournament_title)
+
+    return os.path.abspath(filename), os.path.abspath(output_dir)
+
+
+def write_round_assignment_sheet(
+    stream: str | BinaryIO,
+    round_number: int,
+    tournament_title: str | None = None,
+):
+    """
+    Igual que generate_round_assignment_sheet pero escribe en cualquier flujo
+    binario (BytesIO, respuesta HTTP...). El flujo NO se cierra.
+    """
     seats = storage.get_round_seat_list(round_number)
     if not seats:
         raise ValueError("No hay mesas asignadas para esa ronda.")
 
-    if tournament_title is None:
-        tournament_title = DEFAULT_TOURNAMENT_TITLE
-
-    os.makedirs(output_dir, exist_ok=True)
-    filename = os.path.join(output_dir, f"ronda{round_number}_asignacion.pdf")
-
     _draw_round_assignment_pdf(
-        filename=filename,
+        filename=stream,
         round_number=round_number,
-        tournament_title=tournament_title,
+        tournament_title=tournament_title or DEFAULT_TOURNAMENT_TITLE,
         seats=seats,
     )
 
-    return os.path.abspath(filename), os.path.abspath(output_dir)
+
+def round_assignment_sheet_bytes(round_number: int, tournament_title: str | None = None) -> bytes:
+    """La asignación ID / Mesa de la ronda como bytes de PDF."""
+    buffer = io.BytesIO()
+    write_round_assignment_sheet(buffer, round_number, tournament_title)
+    return buffer.getvalue()
 
 
 def _draw_round_assignment_pdf(
-    filename: str,
+    filename: str | BinaryIO,
     round_number: int,
     tournament_title: str,
     seats: list[dict],
@@ -5,19 +5,28 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
 import os
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Optional, Tuple
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
+from core import paths
 from core import storage
 
 DEFAULT_TOURNAMENT_TITLE = "Torneo de Dominó"
 VALID_TOURNAMENT_TYPES = {"individual", "equipo", "seleccion_12"}
 
+# Procesos para generar hojas en paralelo (ReportLab es CPU puro)
+MAX_WORKERS = 8
+
 
 def generate_score_sheet_for_table(
     round_number: int,
@@ -34,10 +43,83 @@ def generate_score_sheet_for_table(
     Genera una hoja (1 página por mesa) con el layout de torneo.
     output_path incluye el nombre del archivo final.
     """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    write_score_sheet_for_table(
+        output_path,
+        round_number=round_number,
+        mesa_number=mesa_number,
+        tournament_title=tournament_title,
+        tournament_type=tournament_type,
+        logo_path=logo_path,
+        footer_text=footer_text,
+        players=players,
+        player_stats=player_stats,
+    )
+
+    return os.path.abspath(output_path)
+
+
+def update_score_sheet_for_table(
+    round_number: int,
+    mesa_number: int,
+    output_dir: str,
+    tournament_title: str,
+    tournament_type: str,
+    logo_path: str | None = None,
+    footer_text: str | None = None,
+) -> tuple[str, bool]:
+    """
+    Hoja de UNA mesa dentro de output_dir, con el mismo nombre y el mismo
+    manifiesto que los generadores por ronda: si sus entradas no cambiaron
+    (y el PDF existe) no se vuelve a dibujar.
+    Devuelve (ruta_absoluta_pdf, re_generada).
+    """
     if tournament_type not in VALID_TOURNAMENT_TYPES:
         tournament_type = "individual"
 
-    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    mesa = _get_mesa(round_number, mesa_number)
+    try:
+        player_stats = storage.get_player_stats_map()
+    except Exception:
+        player_stats = {}
+    snapshot = {
+        "round_number": round_number,
+        "mesas": [{"mesa": mesa_number, **{letra: mesa[letra] for letra in ("A", "B", "C", "D")}}],
+        "player_stats": player_stats,
+        "logo_path": _resolve_logo(logo_path),
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    (job,) = _round_sheet_jobs(snapshot, output_dir, tournament_title, tournament_type, footer_text)
+    manifest = _load_manifest(output_dir)
+
+    rebuilt = bool(_changed_jobs([job], manifest))
+    if rebuilt:
+        _draw_score_sheet_pdf(**job)
+        manifest[os.path.basename(job["filename"])] = _sheet_inputs_hash(job)
+        _save_manifest(output_dir, manifest)
+    return os.path.abspath(job["filename"]), rebuilt
+
+
+def write_score_sheet_for_table(
+    stream: str | BinaryIO,
+    round_number: int,
+    mesa_number: int,
+    tournament_title: str,
+    tournament_type: str,
+    logo_path: str | None = None,
+    footer_text: str | None = None,
+    players: list[dict] | None = None,
+    player_stats: dict[int, dict] | None = None,
+):
+    """
+    Igual que generate_score_sheet_for_table pero escribe en cualquier flujo
+    binario (BytesIO, socket, respuesta HTTP...) sin archivos temporales ni
+    carpetas. El flujo NO se cierra.
+    """
+    if tournament_type not in VALID_TOURNAMENT_TYPES:
+        tournament_type = "individual"
 
     if players is None:
         mesa = _get_mesa(round_number, mesa_number)
@@ -51,7 +133,7 @@ def generate_score_sheet_for_table(
             player_stats = {}
 
     _draw_score_sheet_pdf(
-        filename=output_path,
+        filename=stream,
         tournament_title=tournament_title or DEFAULT_TOURNAMENT_TITLE,
         tournament_type=tournament_type,
         logo_path=logo_path,
@@ -62,7 +144,71 @@ def generate_score_sheet_for_table(
         footer_text=footer_text,
     )
 
-    return os.path.abspath(output_path)
+
+def score_sheet_for_table_bytes(
+    round_number: int,
+    mesa_number: int,
+    tournament_title: str,
+    tournament_type: str,
+    **kwargs,
+) -> bytes:
+    """La hoja de la mesa como bytes de PDF (vista previa / impresión directa)."""
+    buffer = io.BytesIO()
+    write_score_sheet_for_table(
+        buffer, round_number, mesa_number, tournament_title, tournament_type, **kwargs
+    )
+    return buffer.getvalue()
+
+
+def build_round_snapshot(round_number: int, logo_path: str | None = None) -> dict:
+    """
+    Foto de SOLO LECTURA de la ronda para los generadores por ronda: se lee una
+    vez y se comparte con todas las mesas (antes cada mesa releía player_stats).
+    {
+      "round_number": int,
+      "mesas": [ {mesa, A, B, C, D}, ... ],   # storage.get_round_assignments
+      "player_stats": {jugador_id: {G, P, E, R}},
+      "logo_path": str | None,                 # ya resuelto (existe en disco)
+    }
+    """
+    conn = storage.get_connection()
+    try:
+        mesas = storage.get_round_assignments(round_number, conn=conn)
+        if not mesas:
+            raise ValueError("No hay mesas asignadas para esa ronda.")
+
+        try:
+            player_stats = storage.get_player_stats_map(conn=conn)
+        except Exception:
+            player_stats = {}
+    finally:
+        conn.close()
+
+    return {
+        "round_number": round_number,
+        "mesas": mesas,
+        "player_stats": player_stats,
+        "logo_path": _resolve_logo(logo_path),
+    }
+
+
+def _resolve_logo(logo_path: str | None) -> str | None:
+    """Ruta real del logo (o None). Se recuerda por proceso: 1 stat en vez de varios."""
+    if not logo_path:
+        return None
+
+    resolved = _logo_paths.get(logo_path)
+    if resolved is not None and os.path.exists(resolved):
+        return resolved
+
+    resolved = paths.resolve_logo_path(logo_path)
+    if resolved is None and os.path.exists(logo_path):
+        resolved = logo_path
+    if resolved is None:
+        _logo_paths.pop(logo_path, None)
+    else:
+        _logo_paths[logo_path] = resolved
+    return resolved
 
 
 def generate_score_sheets_for_round(
@@ -72,31 +218,285 @@ def generate_score_sheets_for_round(
     tournament_type: str,
     logo_path: str | None = None,
     footer_text: str | None = None,
+    snapshot: dict | None = None,
+    incremental: bool = True,
+    progress: Callable[[int, int], None] | None = None,
 ) -> Tuple[int, str]:
-    mesas = storage.get_round_assignments(round_number)
-    if not mesas:
-        raise ValueError("No hay mesas asignadas para esa ronda.")
+    """
+    Un PDF por mesa. Con incremental=True solo se re-dibujan las mesas cuyas
+    entradas cambiaron (ver manifiesto). Devuelve (hojas_generadas, carpeta).
+    progress(hechas, total) se llama después de cada hoja; si lanza una
+    excepción (ej: cancelar), se detiene ahí.
+    """
+    if tournament_type not in VALID_TOURNAMENT_TYPES:
+        tournament_type = "individual"
+
+    if snapshot is None:
+        snapshot = build_round_snapshot(round_number, logo_path)
 
     os.makedirs(output_dir, exist_ok=True)
 
+    jobs = _round_sheet_jobs(snapshot, output_dir, tournament_title, tournament_type, footer_text)
+    manifest = _load_manifest(output_dir)
+    pending = _changed_jobs(jobs, manifest) if incremental else jobs
+
     count = 0
-    for mesa in mesas:
-        mesa_num = mesa["mesa"]
-        filename = os.path.join(output_dir, f"ronda{round_number}_mesa{mesa_num:02d}.pdf")
-        generate_score_sheet_for_table(
-            round_number=round_number,
-            mesa_number=mesa_num,
-            output_path=filename,
-            tournament_title=tournament_title,
+    try:
+        for job in pending:
+            _draw_score_sheet_pdf(**job)
+            manifest[os.path.basename(job["filename"])] = _sheet_inputs_hash(job)
+            count += 1
+            if progress is not None:
+                progress(count, len(pending))
+    finally:
+        _save_manifest(output_dir, manifest)
+    return count, os.path.abspath(output_dir)
+
+
+def generate_score_sheets_for_round_parallel(
+    round_number: int,
+    output_dir: str,
+    tournament_title: str,
+    tournament_type: str,
+    logo_path: str | None = None,
+    footer_text: str | None = None,
+    workers: int | None = None,
+    snapshot: dict | None = None,
+    incremental: bool = True,
+    progress: Callable[[int, int], None] | None = None,
+) -> list[dict]:
+    """
+    Igual que generate_score_sheets_for_round (un PDF por mesa), pero reparte
+    el dibujo entre varios procesos. Los datos (build_round_snapshot) se leen
+    UNA vez aquí; los procesos solo dibujan, no tocan la BD.
+
+    Devuelve, en orden de mesa: [{"mesa", "path" | None, "error" | None, "rebuilt"}].
+    Un error en una mesa no detiene las demás; rebuilt=False => sin cambios,
+    se dejó el PDF anterior.
+    """
+    if tournament_type not in VALID_TOURNAMENT_TYPES:
+        tournament_type = "individual"
+
+    if snapshot is None:
+        snapshot = build_round_snapshot(round_number, logo_path)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = _round_sheet_jobs(snapshot, output_dir, tournament_title, tournament_type, footer_text)
+    manifest = _load_manifest(output_dir)
+    pending = _changed_jobs(jobs, manifest) if incremental else jobs
+
+    rendered: dict[int, dict] = {}
+    render = _render_sheet_jobs(pending, workers)
+    try:
+        for result in render:
+            rendered[result["mesa"]] = result
+            if progress is not None:
+                progress(len(rendered), len(pending))
+    finally:
+        render.close()
+        for job in pending:
+            result = rendered.get(job["mesa_number"])
+            if result is not None and not result["error"]:
+                manifest[os.path.basename(job["filename"])] = _sheet_inputs_hash(job)
+        _save_manifest(output_dir, manifest)
+
+    results = []
+    for job in jobs:
+        result = rendered.get(job["mesa_number"])
+        if result is None:
+            result = {
+                "mesa": job["mesa_number"],
+                "path": os.path.abspath(job["filename"]),
+                "error": None,
+                "rebuilt": False,
+            }
+        results.append(result)
+    return results
+
+
+def _round_sheet_jobs(
+    snapshot: dict,
+    output_dir: str,
+    tournament_title: str,
+    tournament_type: str,
+    footer_text: str | None,
+) -> list[dict]:
+    """Un dict por mesa con TODO lo que necesita _draw_score_sheet_pdf."""
+    round_number = snapshot["round_number"]
+    player_stats = snapshot["player_stats"]
+
+    jobs = []
+    for mesa in snapshot["mesas"]:
+        players = _mesa_to_players(mesa)
+        jobs.append(
+            {
+                "filename": os.path.join(
+                    output_dir, f"ronda{round_number}_mesa{mesa['mesa']:02d}.pdf"
+                ),
+                "tournament_title": tournament_title or DEFAULT_TOURNAMENT_TITLE,
+                "tournament_type": tournament_type,
+                "logo_path": snapshot["logo_path"],
+                "round_number": round_number,
+                "mesa_number": mesa["mesa"],
+                "players": players,
+                # solo las stats de los 4 jugadores (menos datos a cada proceso)
+                "player_stats": {
+                    p["player_id"]: player_stats[p["player_id"]]
+                    for p in players
+                    if p["player_id"] in player_stats
+                },
+                "footer_text": footer_text,
+            }
+        )
+    return jobs
+
+
+def _render_sheet_jobs(jobs: list[dict], workers: int | None):
+    """Genera los resultados a medida que terminan (en cualquier orden)."""
+    if workers is None:
+        workers = min(MAX_WORKERS, os.cpu_count() or 1, len(jobs))
+
+    if workers > 1:
+        try:
+            ex = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            ex = None
+
+        if ex is not None:
+            done: set[int] = set()
+            finished = False
+            try:
+                futures = [ex.submit(_render_sheet_job, job) for job in jobs]
+                for fut in as_completed(futures):
+                    result = fut.result()
+                    done.add(result["mesa"])
+                    yield result
+                finished = True
+                return
+            except BrokenProcessPool:
+                # sin procesos disponibles (entorno restringido): seguir en este proceso
+                jobs = [job for job in jobs if job["mesa_number"] not in done]
+            finally:
+                # si el que consume se detiene (cancelar) o hubo error, no esperar
+                # las hojas en curso: se descartan las pendientes y se sigue
+                ex.shutdown(wait=finished, cancel_futures=True)
+
+    for job in jobs:
+        yield _render_sheet_job(job)
+
+
+def _render_sheet_job(job: dict) -> dict:
+    """Proceso trabajador: dibuja una hoja y reporta el error en vez de lanzarlo."""
+    try:
+        _draw_score_sheet_pdf(**job)
+        return {
+            "mesa": job["mesa_number"],
+            "path": os.path.abspath(job["filename"]),
+            "error": None,
+            "rebuilt": True,
+        }
+    except Exception as e:
+        return {"mesa": job["mesa_number"], "path": None, "error": str(e), "rebuilt": False}
+
+
+# ----------------------------------------------------------------------
+# Manifiesto: {archivo.pdf: hash de sus entradas} por carpeta de salida
+# ----------------------------------------------------------------------
+
+MANIFEST_NAME = ".hojas_manifest.json"
+
+# Subir si cambia el dibujo de la hoja (invalida todos los PDFs ya generados)
+SHEET_LAYOUT_VERSION = 1
+
+
+def _sheet_inputs_hash(job: dict) -> str:
+    """Hash de jugadores, stats, título, tipo, logo (ruta + mtime) y pie de la hoja."""
+    inputs = {k: v for k, v in job.items() if k != "filename"}
+    if job["round_number"] == 1:
+        # la hoja de la ronda 1 no muestra stats (_draw_player_row): guardar
+        # puntos no debe invalidarla
+        inputs["player_stats"] = None
+    else:
+        inputs["player_stats"] = sorted(job["player_stats"].items())
+    inputs["layout_version"] = SHEET_LAYOUT_VERSION
+    logo = job["logo_path"]
+    inputs["logo_mtime"] = os.path.getmtime(logo) if logo and os.path.exists(logo) else None
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _changed_jobs(jobs: list[dict], manifest: dict) -> list[dict]:
+    return [
+        job for job in jobs
+        if manifest.get(os.path.basename(job["filename"])) != _sheet_inputs_hash(job)
+        or not os.path.exists(job["filename"])
+    ]
+
+
+def _load_manifest(output_dir: str) -> dict:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir: str, manifest: dict):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def generate_round_score_sheet_pdf(
+    round_number: int,
+    output_dir: str,
+    tournament_title: str,
+    tournament_type: str,
+    logo_path: str | None = None,
+    footer_text: str | None = None,
+    snapshot: dict | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> Tuple[int, str]:
+    """
+    Modo "un solo archivo": TODAS las mesas de la ronda en un PDF de varias
+    páginas, dibujadas con un único canvas. Fuentes y logo quedan incrustados
+    una sola vez y compartidos por todas las páginas => un archivo y un solo
+    trabajo de impresión.
+    Devuelve (cantidad_de_hojas, ruta_absoluta_pdf).
+    """
+    if tournament_type not in VALID_TOURNAMENT_TYPES:
+        tournament_type = "individual"
+
+    if snapshot is None:
+        snapshot = build_round_snapshot(round_number, logo_path)
+    mesas = snapshot["mesas"]
+
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, f"ronda{round_number}_hojas.pdf")
+
+    c = canvas.Canvas(filename, pagesize=letter)
+    for done, mesa in enumerate(mesas, start=1):
+        _draw_score_sheet_page(
+            c,
+            tournament_title=tournament_title or DEFAULT_TOURNAMENT_TITLE,
             tournament_type=tournament_type,
-            logo_path=logo_path,
-            footer_text=footer_text,
+            logo_path=snapshot["logo_path"],
+            round_number=round_number,
+            mesa_number=mesa["mesa"],
             players=_mesa_to_players(mesa),
-            player_stats=None,
+            player_stats=snapshot["player_stats"],
+            footer_text=footer_text,
         )
-        count += 1
+        c.showPage()
+        if progress is not None:
+            progress(done, len(mesas))
+    c.save()
 
-    return count, os.path.abspath(output_dir)
+    return len(mesas), os.path.abspath(filename)
 
 
 def generate_sample_score_sheet(output_path: str = "hojas/sample_hoja_mesa.pdf") -> str:
@@ -123,11 +523,11 @@ def generate_sample_score_sheet(output_path: str = "hojas/sample_hoja_mesa.pdf")
 
 
 def _get_mesa(round_number: int, mesa_number: int) -> dict:
-    mesas = storage.get_round_assignments(round_number)
-    if not mesas:
-        raise ValueError("No hay mesas asignadas para esa ronda.")
-    mesa = next((m for m in mesas if m["mesa"] == mesa_number), None)
+    # solo la mesa pedida (una consulta), no la ronda completa
+    mesa = storage.get_table_detail(round_number, mesa_number)
     if mesa is None:
+        if not storage.round_exists(round_number):
+            raise ValueError("No hay mesas asignadas para esa ronda.")
         raise ValueError(f"No se encontró la mesa {mesa_number} en la ronda {round_number}.")
     return mesa
 
@@ -157,7 +557,7 @@ def _mesa_to_players(mesa: dict) -> list[dict]:
 # ======================================================================
 
 def _draw_score_sheet_pdf(
-    filename: str,
+    filename: str | BinaryIO,
     tournament_title: str,
     tournament_type: str,
     logo_path: str | None,
@@ -168,47 +568,63 @@ def _draw_score_sheet_pdf(
     footer_text: str | None,
 ):
     c = canvas.Canvas(filename, pagesize=letter)
-    page_w, page_h = letter
-
-    margin_x = 36
-    margin_y = 36
-    usable_w = page_w - 2 * margin_x
-
-    # -------------------------
-    # Title + logo
-    # -------------------------
-    title_y = page_h - 36
-    c.setFont("Times-Italic", 16)
-    c.drawCentredString(page_w / 2, title_y, tournament_title)
+    _draw_score_sheet_page(
+        c,
+        tournament_title=tournament_title,
+        tournament_type=tournament_type,
+        logo_path=logo_path,
+        round_number=round_number,
+        mesa_number=mesa_number,
+        players=players,
+        player_stats=player_stats,
+        footer_text=footer_text,
+        use_template=False,
+    )
+    c.showPage()
+    c.save()
 
-    _draw_logo(c, logo_path, page_w - margin_x - 110, title_y - 30, 110, 40)
 
-    # -------------------------
-    # Header blocks (A/C left, B/D right)
-    # -------------------------
-    header_top = title_y - 22
-    block_gap = 16
-    block_w = (usable_w - block_gap) / 2.0
-    left_x = margin_x
-    right_x = margin_x + block_w + block_gap
+def _draw_score_sheet_page(
+    c: canvas.Canvas,
+    tournament_title: str,
+    tournament_type: str,
+    logo_path: str | None,
+    round_number: int,
+    mesa_number: int,
+    players: list[dict],
+    player_stats: dict[int, dict],
+    footer_text: str | None,
+    use_template: bool = True,
+):
+    """
+    Dibuja UNA hoja en la página actual del canvas (sin showPage/save).
+    El layout fijo se estampa desde la plantilla (form XObject) y encima se
+    escribe solo lo que cambia por mesa. En un PDF de una sola página la
+    plantilla no ahorra nada: la form se dibuja igual una vez y además agrega
+    un objeto (~10% más lento y ~500 bytes más por hoja), así que se dibuja
+    directo.
+    """
+    layout = _page_layout()
+    if use_template:
+        c.doForm(_ensure_template(c, tournament_title, logo_path, footer_text))
+    else:
+        _draw_template(c, layout, tournament_title, logo_path, footer_text)
 
     players_by_seat = {p["seat_letter"]: p for p in players}
-    _draw_player_block(
+    _draw_player_block_data(
         c,
-        x=left_x,
-        y_top=header_top,
-        width=block_w,
+        x=layout["left_x"],
+        y_top=layout["header_top"],
         tournament_type=tournament_type,
         player_top=players_by_seat.get("A"),
         player_bottom=players_by_seat.get("C"),
         player_stats=player_stats,
         round_number=round_number,
     )
-    _draw_player_block(
+    _draw_player_block_data(
         c,
-        x=right_x,
-        y_top=header_top,
-        width=block_w,
+        x=layout["right_x"],
+        y_top=layout["header_top"],
         tournament_type=tournament_type,
         player_top=players_by_seat.get("B"),
         player_bottom=players_by_seat.get("D"),
@@ -216,47 +632,126 @@ def _draw_score_sheet_pdf(
         round_number=round_number,
     )
 
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(layout["margin_x"], layout["info_y"], f"Ronda: {round_number}")
+    c.drawRightString(layout["page_w"] - layout["margin_x"], layout["info_y"], f"Mesa: {mesa_number}")
+
+
+def _page_layout() -> dict:
+    """Geometría de la hoja (compartida por la plantilla y los datos)."""
+    page_w, page_h = letter
+
+    margin_x = 36
+    margin_y = 36
+    usable_w = page_w - 2 * margin_x
+
+    title_y = page_h - 36
+
+    # Header blocks (A/C left, B/D right)
+    header_top = title_y - 22
+    block_gap = 16
+    block_w = (usable_w - block_gap) / 2.0
+
     header_bottom = header_top - 86
     info_y = header_bottom - 14
-    c.setFont("Helvetica-Bold", 10)
-    c.drawString(margin_x, info_y, f"Ronda: {round_number}")
-    c.drawRightString(page_w - margin_x, info_y, f"Mesa: {mesa_number}")
 
-    # -------------------------
     # Scoring area
-    # -------------------------
-    scoring_top = info_y - 14
-    scoring_height = 430
-
     center_w = 54
     half_w = (usable_w - center_w - 10) / 2
     left_half_x = margin_x
     center_x = left_half_x + half_w + 5
-    right_half_x = center_x + center_w + 5
 
-    _draw_scoring_half(c, left_half_x, scoring_top, half_w, "Puntos Pareja A-C")
-    _draw_center_grid(c, center_x, scoring_top, center_w)
-    _draw_scoring_half(c, right_half_x, scoring_top, half_w, "Puntos Pareja B-D")
+    return {
+        "page_w": page_w,
+        "margin_x": margin_x,
+        "margin_y": margin_y,
+        "title_y": title_y,
+        "header_top": header_top,
+        "block_w": block_w,
+        "left_x": margin_x,
+        "right_x": margin_x + block_w + block_gap,
+        "info_y": info_y,
+        "scoring_top": info_y - 14,
+        "center_w": center_w,
+        "half_w": half_w,
+        "left_half_x": left_half_x,
+        "center_x": center_x,
+        "right_half_x": center_x + center_w + 5,
+    }
+
+
+def _ensure_template(
+    c: canvas.Canvas,
+    tournament_title: str,
+    logo_path: str | None,
+    footer_text: str | None,
+) -> str:
+    """
+    Devuelve el nombre del form XObject con el layout fijo para
+    (título, logo, pie). Se dibuja una sola vez por documento; las
+    demás páginas del mismo canvas solo lo referencian.
+    """
+    key = repr((tournament_title, logo_path, footer_text))
+    name = "hoja_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    if c.hasForm(name):
+        return name
+
+    layout = _page_layout()
+    c.saveState()
+    c.beginForm(name)
+    _draw_template(c, layout, tournament_title, logo_path, footer_text)
+    c.endForm()
+    c.restoreState()
+    return name
+
+
+def _draw_template(
+    c: canvas.Canvas,
+    layout: dict,
+    tournament_title: str,
+    logo_path: str | None,
+    footer_text: str | None,
+):
+    margin_x = layout["margin_x"]
+
+    # -------------------------
+    # Title + logo
+    # -------------------------
+    title_y = layout["title_y"]
+    c.setFont("Times-Italic", 16)
+    c.drawCentredString(layout["page_w"] / 2, title_y, tournament_title)
+
+    _draw_logo(c, logo_path, layout["page_w"] - margin_x - 110, title_y - 30, 110, 40)
+
+    # -------------------------
+    # Header blocks (A/C left, B/D right)
+    # -------------------------
+    _draw_player_block_frame(c, layout["left_x"], layout["header_top"], layout["block_w"])
+    _draw_player_block_frame(c, layout["right_x"], layout["header_top"], layout["block_w"])
+
+    # -------------------------
+    # Scoring area
+    # -------------------------
+    scoring_top = layout["scoring_top"]
+    half_w = layout["half_w"]
+    _draw_scoring_half(c, layout["left_half_x"], scoring_top, half_w, "Puntos Pareja A-C")
+    _draw_center_grid(c, layout["center_x"], scoring_top, layout["center_w"])
+    _draw_scoring_half(c, layout["right_half_x"], scoring_top, half_w, "Puntos Pareja B-D")
 
     # -------------------------
     # Footer
     # -------------------------
     if footer_text:
         c.setFont("Helvetica", 9)
-        c.drawString(margin_x, margin_y - 6, footer_text)
-
-    c.showPage()
-    c.save()
+        c.drawString(margin_x, layout["margin_y"] - 6, footer_text)
 
 
 def _draw_logo(c: canvas.Canvas, logo_path: Optional[str], x: float, y: float, w: float, h: float):
-    if not logo_path:
-        return
-    if not os.path.exists(logo_path):
+    logo = _load_logo(_resolve_logo(logo_path), w, h)
+    if logo is None:
         return
+    image, iw, ih = logo
     try:
-        image = ImageReader(logo_path)
-        iw, ih = image.getSize()
         scale = min(w / iw, h / ih)
         draw_w = iw * scale
         draw_h = ih * scale
@@ -266,40 +761,71 @@ def _draw_logo(c: canvas.Canvas, logo_path: Optional[str], x: float, y: float, w
         return
 
 
-def _draw_player_block(
-    c: canvas.Canvas,
-    x: float,
-    y_top: float,
-    width: float,
-    tournament_type: str,
-    player_top: dict | None,
-    player_bottom: dict | None,
-    player_stats: dict[int, dict],
-    round_number: int,
-):
-    # Group label
-    group_label = "Individual"
-    if tournament_type == "equipo":
-        group_label = "Equipo"
-    elif tournament_type == "seleccion_12":
-        group_label = "Selección"
+# ----------------------------------------------------------------------
+# Caché de logos (por proceso, válida entre páginas y rondas)
+# ----------------------------------------------------------------------
 
-    def group_value(p: dict | None) -> str:
-        if not p:
-            return ""
-        if tournament_type == "equipo":
-            return p.get("team_name", "")
-        if tournament_type == "seleccion_12":
-            return p.get("seleccion_name", "")
-        return "Individual"
+# Resolución máxima con que se guarda el logo ya reducido (suficiente para imprimir)
+LOGO_MAX_DPI = 300
 
-    # Group line
-    c.setFont("Helvetica", 8.5)
-    c.drawString(x, y_top - 10, f"{group_label}: {group_value(player_top)}")
+_logo_paths: dict[str, str] = {}
+# {(ruta, mtime, w, h): (ImageReader, ancho_original, alto_original) | None}
+_logo_images: dict[tuple, tuple | None] = {}
+
+
+def _load_logo(logo_path: str | None, w: float, h: float) -> tuple | None:
+    """
+    Logo decodificado y reducido al tamaño del recuadro. Se decodifica una vez
+    por (ruta, mtime): si el archivo cambia en disco, se vuelve a leer.
+    """
+    if not logo_path:
+        return None
+    try:
+        mtime = os.path.getmtime(logo_path)
+    except OSError:
+        return None
+
+    key = (logo_path, mtime, w, h)
+    if key not in _logo_images:
+        # descartar versiones viejas del mismo archivo
+        for old in [k for k in _logo_images if k[0] == logo_path]:
+            del _logo_images[old]
+        _logo_images[key] = _decode_logo(logo_path, w, h)
+    return _logo_images[key]
+
+
+def _decode_logo(logo_path: str, w: float, h: float) -> tuple | None:
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
 
-    # Table geometry
-    header_h = 14
-    row_h = 16
+    try:
+        if Image is None:
+            image = ImageReader(logo_path)
+            iw, ih = image.getSize()
+            return image, iw, ih
+
+        with Image.open(logo_path) as im:
+            im.load()
+            iw, ih = im.size
+            scaled = im.copy()
+        max_px = (max(1, int(w * LOGO_MAX_DPI / 72)), max(1, int(h * LOGO_MAX_DPI / 72)))
+        scaled.thumbnail(max_px, Image.LANCZOS)
+        return ImageReader(scaled), iw, ih
+    except Exception:
+        return None
+
+
+# Geometría de la tabla de jugadores de cada bloque
+_BLOCK_HEADER_H = 14
+_BLOCK_ROW_H = 16
+
+
+def _draw_player_block_frame(c: canvas.Canvas, x: float, y_top: float, width: float):
+    """Parte fija del bloque: marco, encabezados y líneas de la tabla."""
+    header_h = _BLOCK_HEADER_H
+    row_h = _BLOCK_ROW_H
     table_top = y_top - 14
     table_h = header_h + 2 * row_h
     table_bottom = table_top - table_h
@@ -345,9 +871,46 @@ def _draw_player_block(
     c.line(x, table_top - header_h, x_end, table_top - header_h)
     c.line(x, table_top - header_h - row_h, x_end, table_top - header_h - row_h)
 
+
+def _draw_player_block_data(
+    c: canvas.Canvas,
+    x: float,
+    y_top: float,
+    tournament_type: str,
+    player_top: dict | None,
+    player_bottom: dict | None,
+    player_stats: dict[int, dict],
+    round_number: int,
+):
+    """Parte variable del bloque: grupo, jugadores y stats."""
+    # Group label
+    group_label = "Individual"
+    if tournament_type == "equipo":
+        group_label = "Equipo"
+    elif tournament_type == "seleccion_12":
+        group_label = "Selección"
+
+    def group_value(p: dict | None) -> str:
+        if not p:
+            return ""
+        if tournament_type == "equipo":
+            return p.get("team_name", "")
+        if tournament_type == "seleccion_12":
+            return p.get("seleccion_name", "")
+        return "Individual"
+
+    # Group line
+    c.setFont("Helvetica", 8.5)
+    c.drawString(x, y_top - 10, f"{group_label}: {group_value(player_top)}")
+
+    header_h = _BLOCK_HEADER_H
+    row_h = _BLOCK_ROW_H
+    table_top = y_top - 14
+    table_bottom = table_top - (header_h + 2 * row_h)
+
     # Rows
-    _draw_player_row(c, x_id, table_top - header_h, row_h, player_top, player_stats, round_number)
-    _draw_player_row(c, x_id, table_top - header_h - row_h, row_h, player_bottom, player_stats, round_number)
+    _draw_player_row(c, x, table_top - header_h, row_h, player_top, player_stats, round_number)
+    _draw_player_row(c, x, table_top - header_h - row_h, row_h, player_bottom, player_stats, round_number)
 
     # second group line for bottom player (like reference vibe)
     c.setFont("Helvetica", 8.5)
@@ -0,0 +1,53 @@
+# core/startup_timer.py
+#
+# Tiempos de arranque de la app (para comparar antes/después, también en el
+# .exe de PyInstaller). Se importa PRIMERO en main.py, así _T0 queda lo más
+# cerca posible del inicio de Python (el tiempo del bootloader de PyInstaller
+# no entra aquí: lo mide benchmarks/bench_startup.py desde afuera).
+#
+#   Cajablanca.exe --startup-report
+#     => agrega una línea JSON a <datos>/startup_times.jsonl y cierra la app
+#        apenas se dibuja la primera vista.
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from datetime import datetime
+
+_T0 = time.perf_counter()
+_marks: list[tuple[str, float]] = []
+
+REPORT_FLAG = "--startup-report"
+REPORT_NAME = "startup_times.jsonl"
+
+
+def requested() -> bool:
+    return REPORT_FLAG in sys.argv
+
+
+def mark(name: str):
+    """Segundos desde el inicio hasta este punto."""
+    _marks.append((name, time.perf_counter() - _T0))
+
+
+def report() -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "frozen": bool(getattr(sys, "frozen", False)),
+        "python": sys.version.split()[0],
+        # con los imports diferidos, ReportLab no debería cargarse al arrancar
+        "reportlab_loaded": "reportlab" in sys.modules,
+        "marks": {name: round(t, 4) for name, t in _marks},
+    }
+
+
+def write_report() -> str:
+    """Agrega el reporte (una línea JSON) a startup_times.jsonl. Devuelve la ruta."""
+    from core import paths
+
+    path = paths.user_data_dir() / REPORT_NAME
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report()) + "\n")
+    return str(path)
@@ -1,9 +1,12 @@
 # core/storage.py
 
+import json
+import os
 import sqlite3
-from core.paths import db_path
-
+import threading
+from contextlib import contextmanager
 
+from core.paths import db_path
 
 
 def _apply_pragmas(conn: sqlite3.Connection):
@@ -22,14 +25,349 @@ def _apply_pragmas(conn: sqlite3.Connection):
     cur.close()
 
 
+# ---------------- POOL DE CONEXIONES ----------------
+
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+class _PooledConnection(sqlite3.Connection):
+    """
+    Conexión de larga vida administrada por el pool.
+    close() NO cierra la conexión: la devuelve al pool (ver ConnectionPool.release).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_path = ""
+        self.borrowed = 0
+        self.uow_depth = 0
+
+    def commit(self):
+        # dentro de transaction() solo confirma el bloque más externo
+        if self.uow_depth:
+            return
+        wrote = self.in_transaction
+        super().commit()
+        if wrote:
+            _note_local_write()
+
+    def close(self):
+        _pool.release(self)
+
+    def close_physical(self):
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Pool pequeño de conexiones SQLite: UNA conexión persistente por hilo.
+    - Los PRAGMAs se aplican una sola vez al abrir la conexión.
+    - cached_statements controla el caché de sentencias preparadas de sqlite3.
+    - hits/misses permiten medir cuántas aperturas nos ahorramos.
+    """
+
+    def __init__(self, cached_statements: int = DEFAULT_CACHED_STATEMENTS):
+        self.cached_statements = cached_statements
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[int, _PooledConnection] = {}
+        # (CAJABLANCA_DATA_DIR, ruta): db_path() hace mkdir; solo se recalcula
+        # si cambia la carpeta de datos
+        self._path: tuple[str | None, str] | None = None
+
+    def acquire(self) -> _PooledConnection:
+        path = self._db_path()
+        conn = getattr(self._local, "conn", None)
+
+        if conn is not None and conn.pool_path == path:
+            with self._lock:
+                self.hits += 1
+        else:
+            if conn is not None:
+                # la ruta de la BD cambió (ej: otra carpeta de usuario)
+                self._discard(conn)
+            conn = self._open(path)
+            with self._lock:
+                self.misses += 1
+
+        conn.borrowed += 1
+        return conn
+
+    def release(self, conn: _PooledConnection):
+        conn.borrowed = max(0, conn.borrowed - 1)
+        # igual que un close() real: lo que no se confirmó se descarta
+        if conn.borrowed == 0 and conn.in_transaction:
+            conn.rollback()
+
+    def close_all(self):
+        """Cierra todas las conexiones físicas (al salir de la app o cambiar de BD)."""
+        with self._lock:
+            conns = list(self._connections.values())
+            self._connections.clear()
+        for conn in conns:
+            try:
+                conn.close_physical()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+        self._path = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "open_connections": len(self._connections),
+                "cached_statements": self.cached_statements,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _db_path(self) -> str:
+        override = os.environ.get("CAJABLANCA_DATA_DIR")
+        cached = self._path
+        if cached is None or cached[0] != override:
+            cached = (override, str(db_path()))
+            self._path = cached
+        return cached[1]
+
+    def _open(self, path: str) -> _PooledConnection:
+        conn = sqlite3.connect(
+            path,
+            factory=_PooledConnection,
+            cached_statements=self.cached_statements,
+            # cada hilo usa la suya; esto solo permite cerrarlas desde close_all()
+            check_same_thread=False,
+        )
+        conn.pool_path = path
+        _apply_pragmas(conn)
+
+        ident = threading.get_ident()
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[ident] = conn
+        self._local.conn = conn
+        return conn
+
+    def _discard(self, conn: _PooledConnection):
+        with self._lock:
+            for ident, c in list(self._connections.items()):
+                if c is conn:
+                    del self._connections[ident]
+        try:
+            conn.close_physical()
+        except sqlite3.Error:
+            pass
+
+    def _prune_dead_threads(self):
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._connections if i not in alive]:
+            try:
+                self._connections.pop(ident).close_physical()
+            except sqlite3.Error:
+                pass
+
+
+_pool = ConnectionPool()
+
+
+def configure_pool(cached_statements: int = DEFAULT_CACHED_STATEMENTS):
+    """Cambia el tamaño del caché de sentencias. Reabre las conexiones del pool."""
+    _pool.close_all()
+    _pool.cached_statements = int(cached_statements)
+
+
+def get_pool_stats() -> dict:
+    """Devuelve {hits, misses, open_connections, cached_statements} del pool."""
+    return _pool.stats()
+
+
+def reset_pool_stats():
+    _pool.reset_stats()
+
+
+def close_all_connections():
+    _pool.close_all()
+
+
 def get_connection():
-    # ✅ timeout para que espere en bloqueos (además del busy_timeout)
-    conn = sqlite3.connect(str(db_path()))
-    _apply_pragmas(conn)
-    return conn
+    """
+    Devuelve la conexión persistente del hilo actual (PRAGMAs ya aplicados).
+    conn.close() la devuelve al pool; no la cierra.
+    """
+    return _pool.acquire()
+
+
+# ---------------- VERSIÓN DE LOS DATOS ----------------
+
+_local_writes = 0
+_local_writes_lock = threading.Lock()
+
+
+def _note_local_write():
+    global _local_writes
+    with _local_writes_lock:
+        _local_writes += 1
+
+
+def data_version(conn: sqlite3.Connection | None = None) -> tuple[int, int]:
+    """
+    Marca barata de "los datos cambiaron": (escrituras confirmadas por este
+    proceso, PRAGMA data_version). data_version cambia cuando OTRA conexión
+    confirma (otro hilo u otra PC); las escrituras de la propia conexión las
+    cubre el contador local. Solo sirve para comparar por igualdad.
+    """
+    with _connection(conn) as c:
+        version = c.execute("PRAGMA data_version;").fetchone()[0]
+    return _local_writes, version
+
+
+@contextmanager
+def count_queries():
+    """
+    Cuenta las sentencias SQL que corre la conexión de este hilo mientras dure
+    el bloque (benchmarks: verificar que un camino hace N consultas fijas).
+
+        with storage.count_queries() as counter:
+            ...
+        counter["count"]
+    """
+    conn = get_connection()
+    counter = {"count": 0}
+
+    def _trace(_statement):
+        counter["count"] += 1
+
+    conn.set_trace_callback(_trace)
+    try:
+        yield counter
+    finally:
+        conn.set_trace_callback(None)
+        conn.close()
+
+
+# ---------------- AVISOS DE CAMBIO DE RONDA ----------------
+
+_round_listeners: list[tuple] = []
+
+
+def add_round_listener(on_saved, on_rollback=None):
+    """
+    Registra callbacks para cachés en memoria (ej: core.conflicts):
+      on_saved(round_number, [(mesa, [A, B, C, D]), ...], conn) tras guardar/borrar una ronda
+      on_rollback() si una transacción se deshace
+    """
+    _round_listeners.append((on_saved, on_rollback))
+
+
+def _emit_round_saved(round_number: int, tables, conn):
+    for on_saved, _ in _round_listeners:
+        on_saved(round_number, tables, conn)
+
+
+def _emit_rollback():
+    for _, on_rollback in _round_listeners:
+        if on_rollback is not None:
+            on_rollback()
+
+
+@contextmanager
+def transaction():
+    """
+    Unidad de trabajo: todo lo que se haga con la conexión devuelta va en un solo
+    BEGIN IMMEDIATE ... COMMIT (un solo fsync; si algo falla, ROLLBACK de todo).
+
+        with storage.transaction() as conn:
+            storage.save_table_player_scores(..., conn=conn)
+            storage.set_table_status(..., conn=conn)
+
+    Si ya hay una transacción abierta en este hilo, se une a ella.
+    Si la conexión tiene cambios sin confirmar hechos FUERA de transaction(),
+    lanza RuntimeError: no se confirma (ni se descarta) trabajo ajeno a medias.
+    """
+    conn = get_connection()
+    if conn.uow_depth:
+        conn.uow_depth += 1
+        try:
+            yield conn
+        finally:
+            conn.uow_depth -= 1
+            conn.close()
+        return
+
+    if conn.in_transaction:
+        conn.close()
+        raise RuntimeError(
+            "transaction(): la conexión tiene cambios sin confirmar de otra operación; "
+            "confírmalos o descártalos antes de abrir una transacción."
+        )
+    conn.execute("BEGIN IMMEDIATE;")
+    conn.uow_depth = 1
+    try:
+        yield conn
+    except BaseException:
+        conn.uow_depth = 0
+        conn.rollback()
+        _emit_rollback()
+        raise
+    else:
+        conn.uow_depth = 0
+        conn.commit()
+    finally:
+        conn.uow_depth = 0
+        conn.close()
+
+
+@contextmanager
+def _connection(conn: sqlite3.Connection | None = None, commit: bool = False):
+    """
+    Conexión para una función de storage.
+    - conn dado: se usa tal cual; el que la pasó decide cuándo confirmar.
+    - conn None: se toma del pool y (si commit=True) se confirma al salir.
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    own = get_connection()
+    try:
+        yield own
+        if commit:
+            own.commit()
+    finally:
+        own.close()
+
+
+# Versión del esquema guardada en PRAGMA user_version. Subirla cada vez que
+# _create_schema() cambie (tabla, índice o migración nueva): así las BD viejas
+# vuelven a pasar por _create_schema() una vez.
+SCHEMA_VERSION = 1
 
 
 def init_db():
+    """
+    Prepara la BD. Si user_version dice que el esquema está al día, no hace
+    nada más (arranque rápido: una sola consulta); si no, crea/migra todo.
+    """
+    conn = get_connection()
+    (version,) = conn.execute("PRAGMA user_version;").fetchone()
+    conn.close()
+    if version >= SCHEMA_VERSION:
+        return
+
+    _create_schema()
+
+    conn = get_connection()
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+    conn.close()
+
+
+def _create_schema():
     """Crea las tablas de jugadores, asientos y estado de mesas."""
     conn = get_connection()
     cur = conn.cursor()
@@ -163,6 +501,35 @@ def init_db():
         """
     )
 
+    # Semilla + versión del generador con que se armó cada ronda (ver core.replay)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS round_generation (
+            round             INTEGER PRIMARY KEY,
+            seed              INTEGER NOT NULL,
+            generator_version INTEGER NOT NULL,
+            kind              TEXT NOT NULL, -- first | round2 | general | schedule
+            params            TEXT NOT NULL DEFAULT '{}', -- JSON
+            inputs_hash       TEXT NOT NULL,
+            created_at        TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+        """
+    )
+
+    # Contadores de cambios para que la otra PC sepa qué recargar (ver _note_changes)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_counters (
+            scope TEXT NOT NULL,     -- seats | status | scores | players | ranking
+            round INTEGER NOT NULL,  -- 0 si no aplica
+            mesa  INTEGER NOT NULL,  -- 0 si no aplica
+            seq   INTEGER NOT NULL,
+            PRIMARY KEY (scope, round, mesa)
+        ) WITHOUT ROWID;
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_change_counters_seq ON change_counters (seq);")
+
     conn.commit()
 
     # Semilla inicial de 100 jugadores demo (si la tabla está vacía)
@@ -253,6 +620,65 @@ def _ensure_player_round_scores_schema():
     conn.close()
 
 
+# ---------------- CONTADORES DE CAMBIOS (2 PCs) ----------------
+#
+# Cada función que escribe sube el contador de lo que tocó en change_counters
+# (en la misma transacción) con un número de secuencia global. Así una PC puede
+# preguntar "¿qué cambió desde la secuencia N?" y recibir solo las rondas /
+# mesas afectadas, sin importar qué PC escribió. Es una fila por
+# (alcance, ronda, mesa): la tabla no crece con el tiempo.
+#
+# Alcances: seats (ronda, 0) | status (ronda, mesa) | scores (ronda, mesa)
+#           players (0, 0)   | ranking (0, 0)
+# (Se hace explícito y no con triggers: un trigger por fila duplicaba el
+# tiempo de guardar una ronda de 10.000 jugadores.)
+
+def _note_changes(cur: sqlite3.Cursor, scope: str, keys=((0, 0),)):
+    cur.executemany(
+        """
+        INSERT INTO change_counters (scope, round, mesa, seq)
+        VALUES (?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM change_counters))
+        ON CONFLICT (scope, round, mesa) DO UPDATE SET seq = excluded.seq;
+        """,
+        [(scope, rnd, mesa) for rnd, mesa in keys],
+    )
+
+
+def get_change_seq(conn: sqlite3.Connection | None = None) -> int:
+    """Última secuencia de cambios (punto de partida para get_changes_since)."""
+    with _connection(conn) as c:
+        return c.execute("SELECT COALESCE(MAX(seq), 0) FROM change_counters;").fetchone()[0]
+
+
+def get_changes_since(seq: int, conn: sqlite3.Connection | None = None) -> tuple[int, dict]:
+    """
+    Qué cambió después de la secuencia `seq` (en esta u otra PC).
+    Devuelve (nueva_seq, {
+        "seats":   {rondas},           # asignación de mesas (ronda completa)
+        "status":  {ronda: {mesas}},   # Jugando / Terminado
+        "scores":  {ronda: {mesas}},   # puntos capturados
+        "players": bool,               # altas / cambios de jugadores
+        "ranking": bool,               # stats / ajustes
+    }).
+    """
+    changes = {"seats": set(), "status": {}, "scores": {}, "players": False, "ranking": False}
+    with _connection(conn) as c:
+        rows = c.execute(
+            "SELECT scope, round, mesa, seq FROM change_counters WHERE seq > ?;",
+            (seq,),
+        ).fetchall()
+
+    for scope, rnd, mesa, row_seq in rows:
+        seq = max(seq, row_seq)
+        if scope in ("players", "ranking"):
+            changes[scope] = True
+        elif scope == "seats":
+            changes["seats"].add(rnd)
+        else:
+            changes[scope].setdefault(rnd, set()).add(mesa)
+    return seq, changes
+
+
 def seed_demo_players(conn: sqlite3.Connection):
     """Inserta 100 jugadores de ejemplo para pruebas."""
     cur = conn.cursor()
@@ -273,46 +699,52 @@ def seed_demo_players(conn: sqlite3.Connection):
         """,
         jugadores,
     )
+    _note_changes(cur, "players")
     conn.commit()
 
 
 # ---------------- NUEVO: asegurar stats ----------------
 
-def ensure_player_stats_rows():
+def ensure_player_stats_rows(conn: sqlite3.Connection | None = None):
     """Crea fila en player_stats para todo jugador que no tenga una."""
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO player_stats (jugador_id, g, p, e, r)
-        SELECT p.id, 0, 0, 0, 0
-        FROM players p
-        LEFT JOIN player_stats ps ON ps.jugador_id = p.id
-        WHERE ps.jugador_id IS NULL;
-        """
-    )
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
 
-    conn.commit()
-    conn.close()
+        cur.execute(
+            """
+            INSERT INTO player_stats (jugador_id, g, p, e, r)
+            SELECT p.id, 0, 0, 0, 0
+            FROM players p
+            LEFT JOIN player_stats ps ON ps.jugador_id = p.id
+            WHERE ps.jugador_id IS NULL;
+            """
+        )
+        if cur.rowcount:
+            _note_changes(cur, "ranking")
 
 
 # ---------- JUGADORES ----------
 
-def get_players_count():
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT COUNT(*) FROM players;")
-    (count,) = cur.fetchone()
-    conn.close()
+def get_players_count(conn: sqlite3.Connection | None = None):
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM players;")
+        (count,) = cur.fetchone()
     return count
 
 
-def add_player(nombre: str, apellido: str, cedula: str, telefono: str, pago: int = 5000):
+def add_player(
+    nombre: str,
+    apellido: str,
+    cedula: str,
+    telefono: str,
+    pago: int = 5000,
+    conn: sqlite3.Connection | None = None,
+):
     """Agrega un jugador nuevo (máx. 100). Devuelve (ok, mensaje)."""
     import sqlite3 as _sqlite3
 
-    current = get_players_count()
+    current = get_players_count(conn=conn)
     if current >= 100:
         return False, "Ya hay 100 jugadores registrados. No se pueden agregar más."
 
@@ -321,45 +753,43 @@ def add_player(nombre: str, apellido: str, cedula: str, telefono: str, pago: int
     if not cedula.strip():
         return False, "La cédula es obligatoria."
 
-    conn = get_connection()
-    cur = conn.cursor()
     try:
-        cur.execute(
-            """
-            INSERT INTO players (nombre, apellido, cedula, telefono, pago)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (nombre.strip(), apellido.strip(), cedula.strip(), telefono.strip(), pago),
-        )
-        new_id = cur.lastrowid
+        with _connection(conn, commit=True) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO players (nombre, apellido, cedula, telefono, pago)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (nombre.strip(), apellido.strip(), cedula.strip(), telefono.strip(), pago),
+            )
+            new_id = cur.lastrowid
 
-        # crea stats para el nuevo jugador
-        cur.execute(
-            "INSERT OR IGNORE INTO player_stats (jugador_id, g, p, e, r) VALUES (?,0,0,0,0);",
-            (new_id,),
-        )
+            # crea stats para el nuevo jugador
+            cur.execute(
+                "INSERT OR IGNORE INTO player_stats (jugador_id, g, p, e, r) VALUES (?,0,0,0,0);",
+                (new_id,),
+            )
+            _note_changes(cur, "players")
+            _note_changes(cur, "ranking")
 
-        conn.commit()
         return True, "Jugador registrado correctamente."
     except _sqlite3.Error as e:
         return False, f"Error de base de datos: {e}"
-    finally:
-        conn.close()
 
 
-def get_all_players():
+def get_all_players(conn: sqlite3.Connection | None = None):
     """Devuelve lista de dicts con todos los jugadores."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, nombre, apellido, cedula, telefono, pago
-        FROM players
-        ORDER BY id ASC;
-        """
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT id, nombre, apellido, cedula, telefono, pago
+            FROM players
+            ORDER BY id ASC;
+            """
+        )
+        rows = cur.fetchall()
 
     players = []
     for row in rows:
@@ -378,18 +808,23 @@ def get_all_players():
 
 # ---------- ASIGNACIONES DE MESAS / RONDAS ----------
 
-def clear_round(round_number: int):
-    conn = get_connection()
-    cur = conn.cursor()
+def clear_round(round_number: int, conn: sqlite3.Connection | None = None):
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
 
-    cur.execute("DELETE FROM seats WHERE round = ?;", (round_number,))
-    cur.execute("DELETE FROM table_status WHERE round = ?;", (round_number,))
+        cur.execute("DELETE FROM seats WHERE round = ?;", (round_number,))
+        cur.execute("DELETE FROM table_status WHERE round = ?;", (round_number,))
+        cur.execute("DELETE FROM round_generation WHERE round = ?;", (round_number,))
+        _note_changes(cur, "seats", [(round_number, 0)])
 
-    conn.commit()
-    conn.close()
+        _emit_round_saved(round_number, [], conn)
 
 
-def save_round_assignments(round_number: int, mesas: list[dict]):
+def save_round_assignments(
+    round_number: int,
+    mesas: list[dict],
+    conn: sqlite3.Connection | None = None,
+):
     """
     Guarda en BD la asignación de mesas.
     mesas = [
@@ -397,13 +832,6 @@ def save_round_assignments(round_number: int, mesas: list[dict]):
       ...
     ]
     """
-    conn = get_connection()
-    cur = conn.cursor()
-
-    # Borramos todo lo de esa ronda (asientos y estado)
-    cur.execute("DELETE FROM seats WHERE round = ?;", (round_number,))
-    cur.execute("DELETE FROM table_status WHERE round = ?;", (round_number,))
-
     seat_rows = []
     status_rows = []
 
@@ -416,44 +844,107 @@ def save_round_assignments(round_number: int, mesas: list[dict]):
         # estado inicial: jugando
         status_rows.append((round_number, mesa_num, "playing"))
 
-    # ✅ Validación extra (mensaje claro si intentan duplicar)
+    # ✅ Validación extra (mensaje claro si intentan duplicar), antes de tocar la BD
     seen_players = set()
     seen_seats = set()
     for rnd, mesa_num, letra, jid in seat_rows:
         key_player = (rnd, jid)
         key_seat = (rnd, mesa_num, letra)
         if key_player in seen_players:
-            conn.rollback()
-            conn.close()
             raise ValueError(f"Jugador #{jid} está repetido en la ronda {rnd}.")
         if key_seat in seen_seats:
-            conn.rollback()
-            conn.close()
             raise ValueError(f"Asiento duplicado: ronda {rnd}, mesa {mesa_num}, letra {letra}.")
         seen_players.add(key_player)
         seen_seats.add(key_seat)
 
-    cur.executemany(
-        """
-        INSERT INTO seats (round, mesa, letra, jugador_id)
-        VALUES (?, ?, ?, ?)
-        """,
-        seat_rows,
-    )
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
 
-    cur.executemany(
-        """
-        INSERT INTO table_status (round, mesa, status)
-        VALUES (?, ?, ?)
-        """,
-        status_rows,
-    )
+        # Borramos todo lo de esa ronda (asientos, estado y semilla anterior)
+        cur.execute("DELETE FROM seats WHERE round = ?;", (round_number,))
+        cur.execute("DELETE FROM table_status WHERE round = ?;", (round_number,))
+        cur.execute("DELETE FROM round_generation WHERE round = ?;", (round_number,))
 
-    conn.commit()
-    conn.close()
+        cur.executemany(
+            """
+            INSERT INTO seats (round, mesa, letra, jugador_id)
+            VALUES (?, ?, ?, ?)
+            """,
+            seat_rows,
+        )
+
+        cur.executemany(
+            """
+            INSERT INTO table_status (round, mesa, status)
+            VALUES (?, ?, ?)
+            """,
+            status_rows,
+        )
+        _note_changes(cur, "seats", [(round_number, 0)])
+
+        _emit_round_saved(
+            round_number,
+            [(m["mesa"], [m[letra]["id"] for letra in ("A", "B", "C", "D")]) for m in mesas],
+            conn,
+        )
 
 
-def get_round_assignments(round_number: int) -> list[dict]:
+def save_round_generation(
+    round_number: int,
+    seed: int,
+    generator_version: int,
+    kind: str,
+    params: dict,
+    inputs_hash: str,
+    conn: sqlite3.Connection | None = None,
+):
+    """Registra con qué semilla/versión se generó la ronda (después de save_round_assignments)."""
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO round_generation (round, seed, generator_version, kind, params, inputs_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(round) DO UPDATE SET
+                seed = excluded.seed,
+                generator_version = excluded.generator_version,
+                kind = excluded.kind,
+                params = excluded.params,
+                inputs_hash = excluded.inputs_hash,
+                created_at = datetime('now');
+            """,
+            (round_number, seed, generator_version, kind, json.dumps(params), inputs_hash),
+        )
+
+
+def get_round_generation(round_number: int, conn: sqlite3.Connection | None = None) -> dict | None:
+    """{round, seed, generator_version, kind, params, inputs_hash, created_at} o None."""
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT round, seed, generator_version, kind, params, inputs_hash, created_at
+            FROM round_generation
+            WHERE round = ?;
+            """,
+            (round_number,),
+        )
+        row = cur.fetchone()
+
+    if not row:
+        return None
+    return {
+        "round": row[0],
+        "seed": row[1],
+        "generator_version": row[2],
+        "kind": row[3],
+        "params": json.loads(row[4]),
+        "inputs_hash": row[5],
+        "created_at": row[6],
+    }
+
+
+def get_round_assignments(round_number: int, conn: sqlite3.Connection | None = None) -> list[dict]:
     """
     Devuelve lista de mesas con jugadores:
     [
@@ -467,36 +958,35 @@ def get_round_assignments(round_number: int) -> list[dict]:
       ...
     ]
     """
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT
-            s.mesa,
-            s.letra,
-            p.id,
-            p.nombre,
-            p.apellido,
-            p.cedula,
-            p.telefono,
-            p.pago
-        FROM seats s
-        JOIN players p ON p.id = s.jugador_id
-        WHERE s.round = ?
-        ORDER BY
-            s.mesa ASC,
-            CASE s.letra
-                WHEN 'A' THEN 1
-                WHEN 'B' THEN 2
-                WHEN 'C' THEN 3
-                WHEN 'D' THEN 4
-            END;
-        """,
-        (round_number,),
-    )
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT
+                s.mesa,
+                s.letra,
+                p.id,
+                p.nombre,
+                p.apellido,
+                p.cedula,
+                p.telefono,
+                p.pago
+            FROM seats s
+            JOIN players p ON p.id = s.jugador_id
+            WHERE s.round = ?
+            ORDER BY
+                s.mesa ASC,
+                CASE s.letra
+                    WHEN 'A' THEN 1
+                    WHEN 'B' THEN 2
+                    WHEN 'C' THEN 3
+                    WHEN 'D' THEN 4
+                END;
+            """,
+            (round_number,),
+        )
 
-    rows = cur.fetchall()
-    conn.close()
+        rows = cur.fetchall()
 
     mesas_dict: dict[int, dict] = {}
     for mesa_num, letra, pid, nombre, apellido, cedula, telefono, pago in rows:
@@ -514,79 +1004,202 @@ def get_round_assignments(round_number: int) -> list[dict]:
     return [mesas_dict[m] for m in sorted(mesas_dict.keys())]
 
 
-def get_round_seat_list(round_number: int) -> list[dict]:
+def get_table_detail(
+    round_number: int,
+    mesa_number: int,
+    conn: sqlite3.Connection | None = None,
+) -> dict | None:
+    """
+    UNA mesa completa en una sola consulta (índices únicos por ronda+mesa+letra):
+    {
+      "mesa": 3,
+      "A": {id, nombre, apellido, ...}, "B": {...}, "C": {...}, "D": {...},
+      "status": "playing" | "finished",
+      "scores": {letra: {jugador_id, letra, base_points, penalty_points,
+                         final_points, winner_pair}},   # solo si ya se capturó
+    }
+    None si la mesa no existe en esa ronda.
+    """
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT
+                s.letra,
+                p.id,
+                p.nombre,
+                p.apellido,
+                p.cedula,
+                p.telefono,
+                p.pago,
+                ts.status,
+                prs.jugador_id,
+                prs.base_points,
+                prs.penalty_points,
+                prs.final_points,
+                prs.winner_pair
+            FROM seats s
+            JOIN players p ON p.id = s.jugador_id
+            LEFT JOIN table_status ts
+                   ON ts.round = s.round AND ts.mesa = s.mesa
+            LEFT JOIN player_round_scores prs
+                   ON prs.round = s.round AND prs.mesa = s.mesa AND prs.letra = s.letra
+            WHERE s.round = ? AND s.mesa = ?;
+            """,
+            (round_number, mesa_number),
+        )
+        rows = cur.fetchall()
+
+    if not rows:
+        return None
+
+    mesa = {"mesa": mesa_number, "status": "playing", "scores": {}}
+    for (
+        letra, pid, nombre, apellido, cedula, telefono, pago,
+        status, score_jid, base_points, penalty_points, final_points, winner_pair,
+    ) in rows:
+        mesa[letra] = {
+            "id": pid,
+            "nombre": nombre,
+            "apellido": apellido,
+            "cedula": cedula,
+            "telefono": telefono,
+            "pago": pago,
+        }
+        if status:
+            mesa["status"] = status
+        if score_jid is not None:
+            mesa["scores"][letra] = {
+                "jugador_id": score_jid,
+                "letra": letra,
+                "base_points": base_points,
+                "penalty_points": penalty_points,
+                "final_points": final_points,
+                "winner_pair": winner_pair,
+            }
+    return mesa
+
+
+def round_exists(round_number: int, conn: sqlite3.Connection | None = None) -> bool:
+    """True si la ronda tiene mesas asignadas."""
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM seats WHERE round = ? LIMIT 1;", (round_number,))
+        return cur.fetchone() is not None
+
+
+def get_round_seat_list(round_number: int, conn: sqlite3.Connection | None = None) -> list[dict]:
     """Devuelve lista de asientos simples: [{jugador_id, mesa, letra}]."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT jugador_id, mesa, letra
-        FROM seats
-        WHERE round = ?
-        ORDER BY jugador_id ASC;
-        """,
-        (round_number,),
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT jugador_id, mesa, letra
+            FROM seats
+            WHERE round = ?
+            ORDER BY jugador_id ASC;
+            """,
+            (round_number,),
+        )
+        rows = cur.fetchall()
     return [{"jugador_id": jid, "mesa": mesa, "letra": letra} for jid, mesa, letra in rows]
 
 
-def round_has_scores(round_number: int) -> bool:
+def get_all_seat_rows(conn: sqlite3.Connection | None = None) -> list[tuple]:
+    """Todas las sillas de todas las rondas: [(round, mesa, letra, jugador_id)]."""
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT round, mesa, letra, jugador_id FROM seats;")
+        return cur.fetchall()
+
+
+def get_seats_signature(conn: sqlite3.Connection | None = None) -> tuple[int, int]:
+    """(cantidad de sillas, id máximo): cambia si alguien modifica seats."""
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM seats;")
+        return tuple(cur.fetchone())
+
+
+def round_has_scores(round_number: int, conn: sqlite3.Connection | None = None) -> bool:
     """Indica si la ronda tiene resultados guardados por jugador."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT 1 FROM player_round_scores WHERE round = ? LIMIT 1;",
-        (round_number,),
-    )
-    exists = cur.fetchone() is not None
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT 1 FROM player_round_scores WHERE round = ? LIMIT 1;",
+            (round_number,),
+        )
+        exists = cur.fetchone() is not None
     return exists
 
 
 # ---------- ESTADO DE MESAS ----------
 
-def get_tables_status(round_number: int) -> dict[int, str]:
+def get_tables_status(round_number: int, conn: sqlite3.Connection | None = None) -> dict[int, str]:
     """Devuelve {mesa: status} para la ronda (status: 'playing' o 'finished')."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT mesa, status FROM table_status WHERE round = ?;", (round_number,))
-    rows = cur.fetchall()
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT mesa, status FROM table_status WHERE round = ?;", (round_number,))
+        rows = cur.fetchall()
     return {mesa: status for mesa, status in rows}
 
 
-def get_table_status(round_number: int, mesa_number: int) -> str:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT status FROM table_status WHERE round = ? AND mesa = ?;",
-        (round_number, mesa_number),
-    )
-    row = cur.fetchone()
-    conn.close()
+def get_table_status(
+    round_number: int,
+    mesa_number: int,
+    conn: sqlite3.Connection | None = None,
+) -> str:
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT status FROM table_status WHERE round = ? AND mesa = ?;",
+            (round_number, mesa_number),
+        )
+        row = cur.fetchone()
     return row[0] if row else "playing"
 
 
-def set_table_status(round_number: int, mesa_number: int, status: str):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO table_status (round, mesa, status)
-        VALUES (?, ?, ?)
-        ON CONFLICT(round, mesa) DO UPDATE SET status = excluded.status;
-        """,
-        (round_number, mesa_number, status),
-    )
-    conn.commit()
-    conn.close()
+def set_table_status(
+    round_number: int,
+    mesa_number: int,
+    status: str,
+    conn: sqlite3.Connection | None = None,
+):
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO table_status (round, mesa, status)
+            VALUES (?, ?, ?)
+            ON CONFLICT(round, mesa) DO UPDATE SET status = excluded.status;
+            """,
+            (round_number, mesa_number, status),
+        )
+        _note_changes(cur, "status", [(round_number, mesa_number)])
+
+
+def toggle_table_status(
+    round_number: int,
+    mesa_number: int,
+    conn: sqlite3.Connection | None = None,
+) -> str:
+    """Jugando <-> Terminado en una sola transacción. Devuelve el estado nuevo."""
+    with transaction() if conn is None else _connection(conn) as conn:
+        current = get_table_status(round_number, mesa_number, conn=conn)
+        new_status = "finished" if current == "playing" else "playing"
+        set_table_status(round_number, mesa_number, new_status, conn=conn)
+    return new_status
 
 
 # ---------------- resultados y ranking ----------------
 
-def save_table_result(round_number: int, mesa_number: int, points_a: int, points_b: int):
+def save_table_result(
+    round_number: int,
+    mesa_number: int,
+    points_a: int,
+    points_b: int,
+    conn: sqlite3.Connection | None = None,
+):
     """Guarda o actualiza el resultado de una mesa (por ronda/mesa)."""
     winner = "draw"
     if points_a > points_b:
@@ -594,22 +1207,21 @@ def save_table_result(round_number: int, mesa_number: int, points_a: int, points
     elif points_b > points_a:
         winner = "B"
 
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO table_results (round, mesa, points_a, points_b, winner)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(round, mesa) DO UPDATE SET
-            points_a = excluded.points_a,
-            points_b = excluded.points_b,
-            winner   = excluded.winner,
-            created_at = datetime('now');
-        """,
-        (round_number, mesa_number, points_a, points_b, winner),
-    )
-    conn.commit()
-    conn.close()
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO table_results (round, mesa, points_a, points_b, winner)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(round, mesa) DO UPDATE SET
+                points_a = excluded.points_a,
+                points_b = excluded.points_b,
+                winner   = excluded.winner,
+                created_at = datetime('now');
+            """,
+            (round_number, mesa_number, points_a, points_b, winner),
+        )
+        _note_changes(cur, "scores", [(round_number, mesa_number)])
 
 
 def save_table_player_scores(
@@ -617,6 +1229,7 @@ def save_table_player_scores(
     mesa_number: int,
     player_scores: list[dict],
     winner_pair: str,
+    conn: sqlite3.Connection | None = None,
 ):
     """
     Guarda puntos por jugador (A,B,C,D) para una mesa.
@@ -625,68 +1238,89 @@ def save_table_player_scores(
         ...
     ]
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
 
-    insert_rows = []
-    for row in player_scores:
-        base_points = int(row.get("base_points", 0))
-        penalty_points = int(row.get("penalty_points", 0))
-        final_points = max(0, base_points - max(0, penalty_points))
-
-        insert_rows.append(
-            (
-                round_number,
-                mesa_number,
-                row["jugador_id"],
-                row["letra"],
-                base_points,
-                max(0, penalty_points),
-                final_points,
-                winner_pair,
-            )
+        # contribución previa (G, P) de las filas que vamos a sobrescribir
+        cur.execute(
+            """
+            SELECT jugador_id, letra, final_points, winner_pair
+            FROM player_round_scores
+            WHERE round = ? AND mesa = ?;
+            """,
+            (round_number, mesa_number),
         )
+        old_rows = {jid: (letra, fp, wp) for jid, letra, fp, wp in cur.fetchall()}
+
+        deltas: dict[int, tuple[int, int]] = {}
+        insert_rows = []
+        for row in player_scores:
+            base_points = int(row.get("base_points", 0))
+            penalty_points = int(row.get("penalty_points", 0))
+            final_points = max(0, base_points - max(0, penalty_points))
+
+            insert_rows.append(
+                (
+                    round_number,
+                    mesa_number,
+                    row["jugador_id"],
+                    row["letra"],
+                    base_points,
+                    max(0, penalty_points),
+                    final_points,
+                    winner_pair,
+                )
+            )
 
-    cur.executemany(
-        """
-        INSERT INTO player_round_scores (
-            round, mesa, jugador_id, letra,
-            base_points, penalty_points, final_points, winner_pair
+            jid = row["jugador_id"]
+            new_g, new_p = _score_contribution(row["letra"], final_points, winner_pair)
+            old_g, old_p = _score_contribution(*old_rows[jid]) if jid in old_rows else (0, 0)
+            deltas[jid] = (new_g - old_g, new_p - old_p)
+
+        cur.executemany(
+            """
+            INSERT INTO player_round_scores (
+                round, mesa, jugador_id, letra,
+                base_points, penalty_points, final_points, winner_pair
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(round, mesa, jugador_id) DO UPDATE SET
+                base_points = excluded.base_points,
+                penalty_points = excluded.penalty_points,
+                final_points = excluded.final_points,
+                winner_pair = excluded.winner_pair,
+                created_at = datetime('now');
+            """,
+            insert_rows,
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(round, mesa, jugador_id) DO UPDATE SET
-            base_points = excluded.base_points,
-            penalty_points = excluded.penalty_points,
-            final_points = excluded.final_points,
-            winner_pair = excluded.winner_pair,
-            created_at = datetime('now');
-        """,
-        insert_rows,
-    )
+        _note_changes(cur, "scores", [(round_number, mesa_number)])
 
-    conn.commit()
-    conn.close()
+        # ✅ stats incrementales: solo los 4 jugadores de la mesa
+        _apply_stats_deltas(cur, deltas)
 
 
-def get_table_player_scores(round_number: int, mesa_number: int) -> list[dict]:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT jugador_id, letra, base_points, penalty_points, final_points, winner_pair
-        FROM player_round_scores
-        WHERE round = ? AND mesa = ?
-        ORDER BY CASE letra
-            WHEN 'A' THEN 1
-            WHEN 'B' THEN 2
-            WHEN 'C' THEN 3
-            WHEN 'D' THEN 4
-        END;
-        """,
-        (round_number, mesa_number),
-    )
-    rows = cur.fetchall()
-    conn.close()
+def get_table_player_scores(
+    round_number: int,
+    mesa_number: int,
+    conn: sqlite3.Connection | None = None,
+) -> list[dict]:
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT jugador_id, letra, base_points, penalty_points, final_points, winner_pair
+            FROM player_round_scores
+            WHERE round = ? AND mesa = ?
+            ORDER BY CASE letra
+                WHEN 'A' THEN 1
+                WHEN 'B' THEN 2
+                WHEN 'C' THEN 3
+                WHEN 'D' THEN 4
+            END;
+            """,
+            (round_number, mesa_number),
+        )
+        rows = cur.fetchall()
     return [
         {
             "jugador_id": jid,
@@ -700,32 +1334,123 @@ def get_table_player_scores(round_number: int, mesa_number: int) -> list[dict]:
     ]
 
 
-def get_table_result(round_number: int, mesa_number: int):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
+def get_table_result(round_number: int, mesa_number: int, conn: sqlite3.Connection | None = None):
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT points_a, points_b, winner
+            FROM table_results
+            WHERE round = ? AND mesa = ?;
+            """,
+            (round_number, mesa_number),
+        )
+        row = cur.fetchone()
+    return None if not row else {"points_a": row[0], "points_b": row[1], "winner": row[2]}
+
+
+def reset_player_stats(conn: sqlite3.Connection | None = None):
+    """Resetea stats acumuladas (G,P,E,R) de todos los jugadores."""
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE player_stats SET g=0, p=0, e=0, r=0, updated_at=datetime('now');")
+        _note_changes(cur, "ranking")
+
+
+# G, P (+ ajustes) esperados por jugador, calculados desde cero.
+_EXPECTED_STATS_SQL = """
+    SELECT
+        ps.jugador_id,
+        COALESCE(sc.g, 0) AS g,
+        COALESCE(sc.p, 0) + COALESCE(adj.delta_p, 0) AS p
+    FROM player_stats ps
+    LEFT JOIN (
+        SELECT
+            jugador_id,
+            SUM(final_points) AS p,
+            SUM(
+                CASE
+                    WHEN winner_pair = 'AC' AND letra IN ('A', 'C') THEN 1
+                    WHEN winner_pair = 'BD' AND letra IN ('B', 'D') THEN 1
+                    ELSE 0
+                END
+            ) AS g
+        FROM player_round_scores
+        GROUP BY jugador_id
+    ) sc ON sc.jugador_id = ps.jugador_id
+    LEFT JOIN (
+        SELECT jugador_id, SUM(delta_p) AS delta_p
+        FROM player_adjustments
+        GROUP BY jugador_id
+    ) adj ON adj.jugador_id = ps.jugador_id
+"""
+
+
+def _score_contribution(letra: str, final_points: int, winner_pair: str) -> tuple[int, int]:
+    """(G, P) que aporta una fila de player_round_scores."""
+    won = (
+        (winner_pair == "AC" and letra in ("A", "C"))
+        or (winner_pair == "BD" and letra in ("B", "D"))
+    )
+    return (1 if won else 0), int(final_points)
+
+
+def _apply_stats_deltas(cur: sqlite3.Cursor, deltas: dict[int, tuple[int, int]]):
+    """Suma {jugador_id: (dG, dP)} a player_stats (E = P)."""
+    rows = [(dg, dp, dp, jid) for jid, (dg, dp) in deltas.items() if dg or dp]
+    if not rows:
+        return
+    cur.executemany(
         """
-        SELECT points_a, points_b, winner
-        FROM table_results
-        WHERE round = ? AND mesa = ?;
+        UPDATE player_stats
+        SET g = g + ?,
+            p = p + ?,
+            e = p + ?,
+            updated_at = datetime('now')
+        WHERE jugador_id = ?;
         """,
-        (round_number, mesa_number),
+        rows,
     )
-    row = cur.fetchone()
-    conn.close()
-    return None if not row else {"points_a": row[0], "points_b": row[1], "winner": row[2]}
+    _note_changes(cur, "ranking")
 
 
-def reset_player_stats():
-    """Resetea stats acumuladas (G,P,E,R) de todos los jugadores."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("UPDATE player_stats SET g=0, p=0, e=0, r=0, updated_at=datetime('now');")
-    conn.commit()
-    conn.close()
+def _rerank(cur: sqlite3.Cursor) -> int:
+    """
+    Asigna R (P desc, G desc, ID asc) escribiendo solo las filas cuyo R cambió.
+    Devuelve cuántas filas cambiaron.
+    """
+    cur.execute(
+        """
+        UPDATE player_stats
+        SET r = ranked.pos
+        FROM (
+            SELECT
+                jugador_id,
+                ROW_NUMBER() OVER (ORDER BY p DESC, g DESC, jugador_id ASC) AS pos
+            FROM player_stats
+        ) AS ranked
+        WHERE ranked.jugador_id = player_stats.jugador_id
+          AND player_stats.r <> ranked.pos;
+        """
+    )
+    moved = cur.rowcount
+    if moved:
+        _note_changes(cur, "ranking")
+    return moved
+
+
+def rerank_player_stats(conn: sqlite3.Connection | None = None) -> int:
+    """
+    Re-rankea tras un cambio incremental (los G/P ya están al día).
+    Devuelve cuántas posiciones cambiaron.
+    """
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
+        moved = _rerank(cur)
+    return moved
 
 
-def recompute_stats_from_results(win_weight: int = 100):
+def recompute_stats_from_results(win_weight: int = 100, conn: sqlite3.Connection | None = None):
     """
     Recalcula G y P por jugador usando:
     - player_round_scores: puntos individuales por ronda/mesa
@@ -739,92 +1464,93 @@ def recompute_stats_from_results(win_weight: int = 100):
       E = P (opción simple)
     Ranking:
       ORDER BY P desc, G desc, ID asc
-    """
-    conn = get_connection()
-    cur = conn.cursor()
 
-    # 1) reset
-    cur.execute("UPDATE player_stats SET g=0, p=0, e=0, r=0, updated_at=datetime('now');")
+    Todo se calcula en 2 sentencias (agregados GROUP BY + ventana ROW_NUMBER),
+    sin importar cuántos jugadores o rondas haya. Requiere SQLite >= 3.33 (UPDATE ... FROM).
 
-    # 2) sumar puntos y ganadas por cada jugador
-    cur.execute(
-        """
-        SELECT round, mesa, jugador_id, letra, final_points, winner_pair
-        FROM player_round_scores;
-        """
-    )
-    results = cur.fetchall()
+    Las capturas normales actualizan player_stats de forma incremental; esta función
+    queda como reconstrucción completa (reparación).
+    """
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
 
-    for rnd, mesa, jid, letra, final_points, winner_pair in results:
+        # 1) G, P (+ ajustes) y E en un solo UPDATE
+        #    E = P (opción simple). TODO: actualizar fórmula de efectividad.
         cur.execute(
-            "UPDATE player_stats SET p = p + ? WHERE jugador_id = ?;",
-            (final_points, jid),
+            f"""
+            UPDATE player_stats
+            SET g = totals.g,
+                p = totals.p,
+                e = totals.p,
+                updated_at = datetime('now')
+            FROM ({_EXPECTED_STATS_SQL}) AS totals
+            WHERE totals.jugador_id = player_stats.jugador_id;
+            """
         )
+        _note_changes(cur, "ranking")
 
-        if winner_pair == "AC" and letra in ("A", "C"):
-            cur.execute("UPDATE player_stats SET g = g + 1 WHERE jugador_id = ?;", (jid,))
-        elif winner_pair == "BD" and letra in ("B", "D"):
-            cur.execute("UPDATE player_stats SET g = g + 1 WHERE jugador_id = ?;", (jid,))
-
-    # 2.5) aplicar ajustes/penalizaciones a P
-    cur.execute(
-        """
-        UPDATE player_stats
-        SET p = p + COALESCE(
-            (SELECT SUM(delta_p) FROM player_adjustments pa WHERE pa.jugador_id = player_stats.jugador_id),
-            0
-        ),
-        updated_at = datetime('now');
-        """
-    )
-
-    # 3) calcular E (opción simple: E = P). TODO: actualizar fórmula de efectividad.
-    cur.execute(
-        """
-        UPDATE player_stats
-        SET e = p,
-            updated_at = datetime('now');
-        """,
-    )
-
-    # 4) ranking
-    cur.execute(
-        """
-        SELECT jugador_id
-        FROM player_stats
-        ORDER BY p DESC, g DESC, jugador_id ASC;
-        """
-    )
-    ordered_ids = [row[0] for row in cur.fetchall()]
+        # 2) ranking
+        _rerank(cur)
 
-    for idx, jid in enumerate(ordered_ids, start=1):
-        cur.execute("UPDATE player_stats SET r = ? WHERE jugador_id = ?;", (idx, jid))
 
-    conn.commit()
-    conn.close()
+def verify_player_stats(conn: sqlite3.Connection | None = None) -> list[dict]:
+    """
+    Compara player_stats (incremental) contra una reconstrucción desde cero.
+    Devuelve las diferencias: [{jugador_id, stored: {G,P,E,R}, expected: {G,P,E,R}}].
+    Lista vacía = todo cuadra.
+    """
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT
+                ps.jugador_id,
+                ps.g, ps.p, ps.e, ps.r,
+                ex.g, ex.p, ex.pos
+            FROM player_stats ps
+            JOIN (
+                SELECT
+                    totals.*,
+                    ROW_NUMBER() OVER (
+                        ORDER BY totals.p DESC, totals.g DESC, totals.jugador_id ASC
+                    ) AS pos
+                FROM ({_EXPECTED_STATS_SQL}) AS totals
+            ) ex ON ex.jugador_id = ps.jugador_id
+            WHERE ps.g <> ex.g OR ps.p <> ex.p OR ps.e <> ex.p OR ps.r <> ex.pos
+            ORDER BY ps.jugador_id ASC;
+            """
+        )
+        rows = cur.fetchall()
+    return [
+        {
+            "jugador_id": jid,
+            "stored": {"G": g, "P": p, "E": e, "R": r},
+            "expected": {"G": eg, "P": ep, "E": ep, "R": er},
+        }
+        for jid, g, p, e, r, eg, ep, er in rows
+    ]
 
 
-def get_ranking():
+def get_ranking(conn: sqlite3.Connection | None = None):
     """Devuelve ranking listo para UI: R, jugador, G, P, E."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT
-            ps.r,
-            p.id,
-            p.nombre,
-            p.apellido,
-            ps.g,
-            ps.p,
-            ps.e
-        FROM player_stats ps
-        JOIN players p ON p.id = ps.jugador_id
-        ORDER BY ps.r ASC;
-        """
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT
+                ps.r,
+                p.id,
+                p.nombre,
+                p.apellido,
+                ps.g,
+                ps.p,
+                ps.e
+            FROM player_stats ps
+            JOIN players p ON p.id = ps.jugador_id
+            ORDER BY ps.r ASC;
+            """
+        )
+        rows = cur.fetchall()
 
     return [
         {
@@ -840,47 +1566,50 @@ def get_ranking():
     ]
 
 
-def get_player_stats_map() -> dict[int, dict]:
+def get_player_stats_map(conn: sqlite3.Connection | None = None) -> dict[int, dict]:
     """Devuelve {jugador_id: {G, P, E, R}}."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT jugador_id, g, p, e, r
-        FROM player_stats;
-        """
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT jugador_id, g, p, e, r
+            FROM player_stats;
+            """
+        )
+        rows = cur.fetchall()
     return {jid: {"G": g, "P": p, "E": e, "R": r} for jid, g, p, e, r in rows}
 
 
-def add_player_adjustment(jugador_id: int, delta_p: int, reason: str = ""):
+def add_player_adjustment(
+    jugador_id: int,
+    delta_p: int,
+    reason: str = "",
+    conn: sqlite3.Connection | None = None,
+):
     """Crea un ajuste de puntos para un jugador (negativo = resta)."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO player_adjustments (jugador_id, delta_p, reason)
-        VALUES (?, ?, ?);
-        """,
-        (jugador_id, int(delta_p), reason.strip()),
-    )
-    conn.commit()
-    conn.close()
+    with _connection(conn, commit=True) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO player_adjustments (jugador_id, delta_p, reason)
+            VALUES (?, ?, ?);
+            """,
+            (jugador_id, int(delta_p), reason.strip()),
+        )
+        # ✅ stats incrementales: el ajuste solo mueve P (y E) de ese jugador
+        _apply_stats_deltas(cur, {jugador_id: (0, int(delta_p))})
 
 
-def get_adjustments_sum_by_player() -> dict[int, int]:
+def get_adjustments_sum_by_player(conn: sqlite3.Connection | None = None) -> dict[int, int]:
     """Devuelve {jugador_id: suma_ajustes}."""
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT jugador_id, COALESCE(SUM(delta_p), 0)
-        FROM player_adjustments
-        GROUP BY jugador_id;
-        """
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with _connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT jugador_id, COALESCE(SUM(delta_p), 0)
+            FROM player_adjustments
+            GROUP BY jugador_id;
+            """
+        )
+        rows = cur.fetchall()
     return {jid: total for jid, total in rows}
@@ -1,10 +1,17 @@
 # core/tournament.py
 import random
-from typing import Tuple, List, Dict, Optional
+from typing import Tuple
 
+from core import conflicts
+from core import optimizer
+from core import replay
 from core import storage
 
 
+SEAT_LETTERS = ("A", "B", "C", "D")
+MAX_ROUNDS = 5
+
+
 # ============================================================
 # RONDA 1
 # ============================================================
@@ -20,49 +27,7 @@ def generate_first_round() -> Tuple[bool, str]:
     Guarda la ronda 1 en la BD.
     Garantiza que ningún jugador se repita en la ronda.
     """
-    players = storage.get_all_players()
-    total = len(players)
-
-    if total < 4:
-        return False, "Se necesitan al menos 4 jugadores para generar la ronda."
-
-    if storage.round_has_scores(1):
-        return False, "No se puede re-generar la ronda 1 porque ya tiene resultados guardados."
-
-    players = players[:]  # copia
-    random.shuffle(players)
-
-    mesas = []
-    mesa_num = 1
-    usados = set()
-
-    for i in range(0, total, 4):
-        grupo = players[i:i + 4]
-        if len(grupo) < 4:
-            break  # sobran jugadores
-
-        ids_grupo = [p["id"] for p in grupo]
-        if any(pid in usados for pid in ids_grupo):
-            return False, "Error interno: un jugador aparece repetido en la ronda."
-
-        usados.update(ids_grupo)
-
-        mesas.append({
-            "mesa": mesa_num,
-            "A": grupo[0],
-            "B": grupo[1],
-            "C": grupo[2],
-            "D": grupo[3],
-        })
-        mesa_num += 1
-
-    storage.save_round_assignments(1, mesas)
-
-    # Asegura stats y recalcula (por si hay tablas/resultados previos)
-    storage.ensure_player_stats_rows()
-    storage.recompute_stats_from_results(win_weight=100)
-
-    return True, f"Ronda 1 generada con {len(mesas)} mesas."
+    return _generate(1)
 
 
 # ============================================================
@@ -78,7 +43,7 @@ def generate_round_2() -> Tuple[bool, str]:
       - R1: (B + D) son pareja
 
     En R2, cada pareja anterior debe quedar en equipos opuestos.
-    Construcción:
+    Construcción (core.pairing.round2_tables):
       - Tomamos TODAS las parejas de R1: 50 parejas (si hay 100 jugadores en R1)
       - Mezclamos parejas y agrupamos de 2 en 2 para formar mesas de 4.
       - Si pareja1 = (p,q) y pareja2 = (r,s)
@@ -87,73 +52,273 @@ def generate_round_2() -> Tuple[bool, str]:
           Equipo2 (B+D) = (q, s)
         Así p vs q (enemigos) y r vs s (enemigos).
     """
-    r1 = storage.get_round_assignments(1)
-    if not r1:
-        return False, "No existe la Ronda 1. Genera la Ronda 1 primero."
+    return _generate(2)
 
-    if storage.round_has_scores(2):
-        return False, "No se puede re-generar la ronda 2 porque ya tiene resultados guardados."
 
-    # Extraer parejas de R1: (A,C) y (B,D)
-    pairs: List[Tuple[Dict, Dict]] = []
-    for mesa in r1:
-        # pareja 1
-        pairs.append((mesa["A"], mesa["C"]))
-        # pareja 2
-        pairs.append((mesa["B"], mesa["D"]))
+# ============================================================
+# RONDAS 1..5 (generador general)
+# ============================================================
+
+def generate_round(round_number: int, time_limit: float | None = None) -> Tuple[bool, str]:
+    """
+    Generador general usado por la UI (rondas 1..5).
+      - Ronda 1: mezcla aleatoria
+      - Ronda 2: pareja anterior => enemigo
+      - Rondas 3..5: motor de core.pairing, que evita repetir parejas y
+        rivales de TODAS las demás rondas guardadas (índice de
+        core.conflicts). Si no existe una ronda perfecta, informa cuántas
+        restricciones tuvo que relajar.
+
+    time_limit (segundos): modo optimizador. Corre muchos intentos en paralelo
+    (core.optimizer) y guarda el de mejor puntaje de calidad.
+    """
+    try:
+        round_number = int(round_number)
+    except Exception:
+        return False, "Ronda inválida."
 
-    if len(pairs) < 2:
-        return False, "No hay suficientes parejas para generar la Ronda 2."
+    if round_number < 1 or round_number > MAX_ROUNDS:
+        return False, f"La ronda debe estar entre 1 y {MAX_ROUNDS}."
 
-    random.shuffle(pairs)
+    return _generate(round_number, time_limit=time_limit)
 
-    mesas_r2 = []
-    mesa_num = 1
 
-    # agrupar parejas de 2 en 2 => mesa de 4
-    for i in range(0, len(pairs), 2):
-        if i + 1 >= len(pairs):
-            break
+def _round_job(round_number: int, conn=None):
+    """
+    Valida que la ronda se pueda generar y arma el trabajo para core.optimizer.
+    Devuelve (mensaje_error | None, job, players).
+    """
+    if storage.round_has_scores(round_number, conn=conn):
+        return (
+            f"No se puede re-generar la ronda {round_number} porque ya tiene resultados guardados.",
+            None,
+            None,
+        )
 
-        (p, q) = pairs[i]
-        (r, s) = pairs[i + 1]
+    players = storage.get_all_players(conn=conn)
 
-        # aleatorizar quién va "del lado A/C" o "del lado B/D" dentro de cada pareja
-        if random.random() < 0.5:
-            p, q = q, p
-        if random.random() < 0.5:
-            r, s = s, r
+    if round_number == 1:
+        if len(players) < 4:
+            return "Se necesitan al menos 4 jugadores para generar la ronda.", None, None
+        return None, {"kind": "first", "player_ids": [p["id"] for p in players]}, players
 
-        # Construcción garantizando que pareja anterior quede enemiga:
-        # Equipo 1 = (A+C) = (p, r)
-        # Equipo 2 = (B+D) = (q, s)
-        mesa = {
-            "mesa": mesa_num,
-            "A": p,
-            "B": q,
-            "C": r,
-            "D": s,
-        }
+    previous = storage.get_round_assignments(round_number - 1, conn=conn)
+    if not previous:
+        return (
+            f"No existe la Ronda {round_number - 1}. Genera la Ronda {round_number - 1} primero.",
+            None,
+            None,
+        )
 
-        mesas_r2.append(mesa)
-        mesa_num += 1
+    if round_number == 2:
+        # `previous` no está vacía: al menos una mesa => dos parejas
+        previous_tables = [[m[letra]["id"] for letra in SEAT_LETTERS] for m in previous]
+        return None, {"kind": "round2", "previous_tables": previous_tables}, players
+
+    if len(players) < 4:
+        return "Se necesitan al menos 4 jugadores para generar la ronda.", None, None
+    job = {
+        "kind": "general",
+        "player_ids": [p["id"] for p in players],
+        "max_iterations": optimizer.ATTEMPT_ITERATIONS,
+    }
+    return None, job, players
+
+
+def _generate(round_number: int, time_limit: float | None = None) -> Tuple[bool, str]:
+    error, job, players = _round_job(round_number)
+    if error:
+        return False, error
+
+    # La búsqueda (que puede tardar segundos) se hace FUERA del lock de escritura,
+    # para no bloquear a la otra PC; luego se guarda todo en una sola transacción.
+    # Cada ronda queda registrada con su semilla (core.replay la puede reconstruir)
+    index = conflicts.get_conflict_index()
+    with index.excluding(round_number):
+        if round_number == 1:
+            history_rows = []
+        elif round_number == 2:
+            history_rows = [row for row in index.seat_rows() if row[0] == 1]
+        else:
+            history_rows = index.seat_rows()
+
+        if time_limit is None:
+            seed = random.SystemRandom().randrange(1 << 31)
+            tables = optimizer.build_candidate(job, index, random.Random(seed))
+            result = None
+        else:
+            result = optimizer.optimize(job, index.seat_rows(), time_limit=time_limit)
+            seed = result["seed"]
+            tables = result["tables"]
+        quality = optimizer.score_round(index, tables)
+
+    extra = {"max_iterations": job["max_iterations"]} if "max_iterations" in job else {}
+    if result is not None and result["iterations"] is not None:
+        # el intento ganador pudo cortarse por tiempo: se guarda lo que alcanzó a hacer
+        extra["max_iterations"] = result["iterations"]
+    record = replay.generation_record(job["kind"], players, history_rows, **extra)
+
+    if not tables:
+        return False, f"No se pudo generar la Ronda {round_number} (sin mesas)."
+
+    by_id = {p["id"]: p for p in players}
+    mesas = [
+        {"mesa": idx, **{letra: by_id[pid] for letra, pid in zip(SEAT_LETTERS, t)}}
+        for idx, t in enumerate(tables, start=1)
+    ]
+
+    with storage.transaction() as conn:
+        # re-chequeo con el lock tomado (la otra PC pudo guardar resultados)
+        if storage.round_has_scores(round_number, conn=conn):
+            return False, (
+                f"No se puede re-generar la ronda {round_number} "
+                "porque ya tiene resultados guardados."
+            )
+
+        storage.save_round_assignments(round_number, mesas, conn=conn)
+        storage.save_round_generation(
+            round_number, seed, optimizer.GENERATOR_VERSION, conn=conn, **record
+        )
 
-    if not mesas_r2:
-        return False, "No se pudo generar la Ronda 2 (sin mesas)."
+        # Asegura stats y recalcula (por si hay tablas/resultados previos)
+        storage.ensure_player_stats_rows(conn=conn)
+        storage.recompute_stats_from_results(win_weight=100, conn=conn)
+
+    return True, _round_message(round_number, len(mesas), quality, result)
+
+
+def _round_message(round_number: int, mesas_count: int, quality: dict, result: dict | None) -> str:
+    msg = f"Ronda {round_number} generada con {mesas_count} mesas."
+    if round_number == 2:
+        msg = msg[:-1] + " (pareja anterior = enemigo)."
+    elif round_number >= 3:
+        relaxed = quality["repeat_partners"] + quality["repeat_opponents"]
+        if relaxed:
+            msg += (
+                f"\nNo hubo combinación perfecta: se relajaron {relaxed} restricciones "
+                f"({quality['repeat_partners']} parejas repetidas, "
+                f"{quality['repeat_opponents']} rivales repetidos)."
+            )
+        else:
+            msg += " Sin parejas ni rivales repetidos."
+
+    if result is not None:
+        msg += (
+            f"\nCalidad: {quality['score']} (0 = perfecta; "
+            f"{quality['repeat_tablemates']} compañeros de mesa repetidos). "
+            f"Mejor de {result['attempts']} intentos en {result['workers']} procesos "
+            f"({result['elapsed']:.1f} s)."
+        )
+    return msg
 
-    storage.save_round_assignments(2, mesas_r2)
 
-    # stats (no cambia nada si no hay resultados, pero lo mantenemos consistente)
-    storage.ensure_player_stats_rows()
-    storage.recompute_stats_from_results(win_weight=100)
+# ============================================================
+# CALENDARIO COMPLETO (todas las rondas sin resultados)
+# ============================================================
 
-    return True, f"Ronda 2 generada con {len(mesas_r2)} mesas (pareja anterior = enemigo)."
+def _unplayed_tail_start(total_rounds: int = MAX_ROUNDS, conn=None) -> int:
+    """Primera ronda después de la última con resultados."""
+    played = [r for r in range(1, total_rounds + 1) if storage.round_has_scores(r, conn=conn)]
+    return max(played, default=0) + 1
+
+
+def generate_schedule(time_limit: float = 3.0, total_rounds: int = MAX_ROUNDS) -> Tuple[bool, str]:
+    """
+    Precalcula de una vez todas las rondas que todavía NO tienen resultados
+    (la "cola" sin jugar), planificándolas juntas con core.optimizer.plan_schedule.
+    Las rondas ya jugadas quedan intactas y se respetan como historial.
+
+    Sirve también para re-generar solo la cola cuando llegan inscripciones tarde.
+    """
+    start = _unplayed_tail_start(total_rounds)
+    if start > total_rounds:
+        return False, "Todas las rondas ya tienen resultados; no hay rondas por planificar."
+
+    players = storage.get_all_players()
+    if len(players) < 4:
+        return False, "Se necesitan al menos 4 jugadores para generar la ronda."
+
+    tail = list(range(start, total_rounds + 1))
+    played_rows = [row for row in storage.get_all_seat_rows() if row[0] < start]
+    index = conflicts.ConflictIndex.from_seat_rows(played_rows)
+    if start == 2 and not index.round_tables(1):
+        return False, "No existe la Ronda 1. Genera la Ronda 1 primero."
+
+    seed = random.SystemRandom().randrange(1 << 31)
+    plan = optimizer.plan_schedule(
+        [p["id"] for p in players],
+        index,
+        tail,
+        rng=random.Random(seed),
+        time_limit=time_limit,
+    )
+    record = replay.generation_record(
+        "schedule", players, played_rows, schedule_rounds=tail, iterations=plan["iterations"]
+    )
+
+    by_id = {p["id"]: p for p in players}
+    with storage.transaction() as conn:
+        # re-chequeo con el lock tomado (la otra PC pudo guardar resultados)
+        for rnd in tail:
+            if storage.round_has_scores(rnd, conn=conn):
+                return False, (
+                    f"No se puede re-generar la ronda {rnd} "
+                    "porque ya tiene resultados guardados."
+                )
+
+        for rnd in tail:
+            mesas = [
+                {"mesa": idx, **{letra: by_id[pid] for letra, pid in zip(SEAT_LETTERS, t)}}
+                for idx, t in enumerate(plan["rounds"][rnd], start=1)
+            ]
+            storage.save_round_assignments(rnd, mesas, conn=conn)
+            storage.save_round_generation(
+                rnd, seed, optimizer.GENERATOR_VERSION, conn=conn, **record
+            )
+
+        storage.ensure_player_stats_rows(conn=conn)
+        storage.recompute_stats_from_results(win_weight=100, conn=conn)
+
+    if len(tail) > 1:
+        lines = [f"Rondas {tail[0]}–{tail[-1]} planificadas juntas."]
+    else:
+        lines = [f"Ronda {tail[0]} planificada."]
+    for rnd in tail:
+        q = plan["quality"][rnd]
+        lines.append(
+            f"Ronda {rnd}: {len(plan['rounds'][rnd])} mesas, calidad {q['score']} "
+            f"({q['repeat_partners']} parejas, {q['repeat_opponents']} rivales, "
+            f"{q['repeat_tablemates']} compañeros de mesa repetidos)"
+        )
+    return True, "\n".join(lines)
+
+
+def stale_schedule_rounds(total_rounds: int = MAX_ROUNDS) -> list[int]:
+    """
+    Rondas precalculadas (sin resultados) que ya no sientan a todos los jugadores
+    posibles, por ejemplo tras una inscripción tardía.
+    """
+    players_count = storage.get_players_count()
+    expected_seats = (players_count // 4) * 4
+
+    stale = []
+    for rnd in range(_unplayed_tail_start(total_rounds), total_rounds + 1):
+        seats = storage.get_round_seat_list(rnd)
+        if seats and len(seats) != expected_seats:
+            stale.append(rnd)
+    return stale
 
 
 # ============================================================
 # CAPTURA DE PUNTOS (por ronda/mesa)
 # ============================================================
 
+def _missing_table_message(round_number: int, mesa_number: int, conn) -> str:
+    if not storage.round_exists(round_number, conn=conn):
+        return f"No hay mesas generadas para la ronda {round_number}."
+    return f"La mesa {mesa_number} no existe en la ronda {round_number}."
+
+
 def save_table_points(
     round_number: int,
     mesa_number: int,
@@ -161,8 +326,8 @@ def save_table_points(
     points_team2_bd: int
 ) -> Tuple[bool, str]:
     """
-    Guarda/actualiza puntos de una mesa (ronda/mesa),
-    marca mesa como finished y recalcula ranking.
+    Guarda/actualiza puntos de una mesa (ronda/mesa)
+    y marca mesa como finished.
 
     Equipos:
       Team1 = (A + C)
@@ -178,24 +343,23 @@ def save_table_points(
     if points_team1_ac < 0 or points_team2_bd < 0:
         return False, "Los puntos no pueden ser negativos."
 
-    mesas = storage.get_round_assignments(round_number)
-    if not mesas:
-        return False, f"No hay mesas generadas para la ronda {round_number}."
-
-    if not any(m["mesa"] == mesa_number for m in mesas):
-        return False, f"La mesa {mesa_number} no existe en la ronda {round_number}."
+    with storage.transaction() as conn:
+        if storage.get_table_detail(round_number, mesa_number, conn=conn) is None:
+            return False, _missing_table_message(round_number, mesa_number, conn)
 
-    # Guardar resultado (points_a = Team1 (A+C), points_b = Team2 (B+D))
-    storage.save_table_result(round_number, mesa_number, points_team1_ac, points_team2_bd)
+        # Guardar resultado (points_a = Team1 (A+C), points_b = Team2 (B+D))
+        storage.save_table_result(
+            round_number, mesa_number, points_team1_ac, points_team2_bd, conn=conn
+        )
 
-    # Marcar terminado
-    storage.set_table_status(round_number, mesa_number, "finished")
+        # Marcar terminado
+        storage.set_table_status(round_number, mesa_number, "finished", conn=conn)
 
-    # Recalcular stats/ranking
-    storage.ensure_player_stats_rows()
-    storage.recompute_stats_from_results(win_weight=100)
+        # table_results no alimenta player_stats (G/P salen de player_round_scores),
+        # así que el ranking no cambia: no hace falta recalcular.
+        storage.ensure_player_stats_rows(conn=conn)
 
-    return True, "Resultado guardado correctamente."
+        return True, "Resultado guardado correctamente."
 
 
 def save_table_player_scores(
@@ -214,52 +378,53 @@ def save_table_player_scores(
         "D": {"base_points": int, "penalty_points": int},
     }
     """
-    mesas = storage.get_round_assignments(round_number)
-    if not mesas:
-        return False, f"No hay mesas generadas para la ronda {round_number}."
-
-    mesa_data = next((m for m in mesas if m["mesa"] == mesa_number), None)
-    if not mesa_data:
-        return False, f"La mesa {mesa_number} no existe en la ronda {round_number}."
-
-    winner_pair = (winner_pair or "").upper().strip()
-    if winner_pair not in ("AC", "BD"):
-        return False, "Debes seleccionar la pareja ganadora (AC o BD)."
-
-    scores_rows = []
-    for letra in ("A", "B", "C", "D"):
-        data = player_points.get(letra, {})
-        try:
-            base_points = int(data.get("base_points", 0))
-            penalty_points = int(data.get("penalty_points", 0))
-        except Exception:
-            return False, "Puntos o penalidad inválidos (deben ser enteros)."
-
-        if base_points < 0 or penalty_points < 0:
-            return False, "Los puntos y penalidades no pueden ser negativos."
-
-        player = mesa_data[letra]
-        scores_rows.append(
-            {
-                "jugador_id": player["id"],
-                "letra": letra,
-                "base_points": base_points,
-                "penalty_points": penalty_points,
-            }
+    with storage.transaction() as conn:
+        # ✅ solo la mesa (una consulta), no la ronda completa
+        mesa_data = storage.get_table_detail(round_number, mesa_number, conn=conn)
+        if mesa_data is None:
+            return False, _missing_table_message(round_number, mesa_number, conn)
+
+        winner_pair = (winner_pair or "").upper().strip()
+        if winner_pair not in ("AC", "BD"):
+            return False, "Debes seleccionar la pareja ganadora (AC o BD)."
+
+        scores_rows = []
+        for letra in ("A", "B", "C", "D"):
+            data = player_points.get(letra, {})
+            try:
+                base_points = int(data.get("base_points", 0))
+                penalty_points = int(data.get("penalty_points", 0))
+            except Exception:
+                return False, "Puntos o penalidad inválidos (deben ser enteros)."
+
+            if base_points < 0 or penalty_points < 0:
+                return False, "Los puntos y penalidades no pueden ser negativos."
+
+            player = mesa_data[letra]
+            scores_rows.append(
+                {
+                    "jugador_id": player["id"],
+                    "letra": letra,
+                    "base_points": base_points,
+                    "penalty_points": penalty_points,
+                }
+            )
+
+        storage.save_table_player_scores(
+            round_number,
+            mesa_number,
+            scores_rows,
+            winner_pair,
+            conn=conn,
         )
 
-    storage.save_table_player_scores(
-        round_number,
-        mesa_number,
-        scores_rows,
-        winner_pair,
-    )
+        storage.set_table_status(round_number, mesa_number, "finished", conn=conn)
+        storage.ensure_player_stats_rows(conn=conn)
 
-    storage.set_table_status(round_number, mesa_number, "finished")
-    storage.ensure_player_stats_rows()
-    storage.recompute_stats_from_results(win_weight=100)
+        # G/P ya se actualizaron de forma incremental; solo re-rankear lo que se movió
+        storage.rerank_player_stats(conn=conn)
 
-    return True, "Resultados individuales guardados correctamente."
+        return True, "Resultados individuales guardados correctamente."
 
 
 # ============================================================
@@ -284,13 +449,14 @@ def subtract_points_from_player(
     if points <= 0:
         return False, "Los puntos a restar deben ser > 0."
 
-    storage.ensure_player_stats_rows()
-    storage.add_player_adjustment(jugador_id, -points, reason)
+    with storage.transaction() as conn:
+        storage.ensure_player_stats_rows(conn=conn)
+        storage.add_player_adjustment(jugador_id, -points, reason, conn=conn)
 
-    # Recalcular ranking (incluye ajustes)
-    storage.recompute_stats_from_results(win_weight=100)
+        # El ajuste ya movió P/E del jugador; solo re-rankear
+        storage.rerank_player_stats(conn=conn)
 
-    return True, f"Se restaron {points} puntos al jugador #{jugador_id}."
+        return True, f"Se restaron {points} puntos al jugador #{jugador_id}."
 
 
 # ============================================================
@@ -302,8 +468,30 @@ def get_ranking():
 
 
 def recompute_ranking(win_weight: int = 100):
-    storage.ensure_player_stats_rows()
-    storage.recompute_stats_from_results(win_weight=win_weight)
+    """Reconstrucción completa (reparación) de stats y ranking."""
+    with storage.transaction() as conn:
+        storage.ensure_player_stats_rows(conn=conn)
+        storage.recompute_stats_from_results(win_weight=win_weight, conn=conn)
+
+
+def verify_ranking(repair: bool = False) -> Tuple[bool, str]:
+    """
+    Verifica las stats incrementales contra una reconstrucción desde cero.
+    Con repair=True, si hay diferencias hace el recálculo completo.
+    """
+    with storage.transaction() as conn:
+        storage.ensure_player_stats_rows(conn=conn)
+        diffs = storage.verify_player_stats(conn=conn)
+        if not diffs:
+            return True, "Las estadísticas coinciden con los resultados guardados."
+
+        if repair:
+            storage.recompute_stats_from_results(win_weight=100, conn=conn)
+            return True, f"Se repararon las estadísticas de {len(diffs)} jugadores."
+
+        ids = ", ".join(f"#{d['jugador_id']}" for d in diffs[:10])
+        more = "..." if len(diffs) > 10 else ""
+        return False, f"{len(diffs)} jugadores con estadísticas desfasadas: {ids}{more}"
 
 
 def get_table_result(round_number: int, mesa_number: int):
@@ -325,6 +513,12 @@ class Tournament:
     def generate_round2(self):
         return generate_round_2()
 
+    def generate_round(self, round_number: int, time_limit: float | None = None):
+        return generate_round(round_number, time_limit=time_limit)
+
+    def generate_schedule(self, time_limit: float = 3.0):
+        return generate_schedule(time_limit=time_limit)
+
     def save_table_points(self, round_number: int, mesa_number: int, pa: int, pb: int):
         return save_table_points(round_number, mesa_number, pa, pb)
 
@@ -1,4 +1,8 @@
 # main.py
+from core import startup_timer  # primero: marca el inicio del arranque
+
+import multiprocessing
+
 import customtkinter as ctk
 
 from core import storage
@@ -6,16 +10,22 @@ from ui.main_window import MainWindow
 
 
 def main():
-    # Inicializar BD
-    storage.init_db()
+    startup_timer.mark("imports")
 
     # Estilos
     ctk.set_appearance_mode("dark")      # "light" / "dark"
     ctk.set_default_color_theme("blue")  # puedes cambiar el tema
 
-    app = MainWindow()
+    # ✅ la ventana aparece primero; la BD (init_db) y la vista inicial se
+    # cargan apenas está dibujada (ver MainWindow._start)
+    app = MainWindow(startup_report=startup_timer.requested())
     app.mainloop()
 
+    # Cierra las conexiones persistentes del pool
+    storage.close_all_connections()
+
 
 if __name__ == "__main__":
+    # Necesario para el optimizador de rondas (ProcessPoolExecutor) en el .exe
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,16 @@
+# tests/conftest.py
+
+import pytest
+
+from benchmarks.synthetic import temp_data_dir
+from core import conflicts
+
+
+@pytest.fixture
+def data_dir():
+    """BD temporal (CAJABLANCA_DATA_DIR) que se borra al terminar la prueba."""
+    # el índice de conflictos se guarda en memoria: que no pase de una BD a otra
+    conflicts.invalidate_conflict_index()
+    with temp_data_dir() as folder:
+        yield folder
+    conflicts.invalidate_conflict_index()
@@ -0,0 +1,96 @@
+# tests/test_conflicts.py
+#
+# ConflictIndex guarda los pares de jugadores con clave entera empaquetada
+# (min_id << 32 | max_id): la clave no depende del orden y sobrevive ids
+# grandes; armar el índice desde seats y volver a seats no pierde nada.
+
+import random
+
+from core import conflicts
+from core.conflicts import ConflictIndex, pair_key
+
+
+def _seat_rows(players: int, rounds: int, rng: random.Random) -> list[tuple]:
+    rows = []
+    ids = list(range(1, players + 1))
+    for rnd in range(1, rounds + 1):
+        rng.shuffle(ids)
+        for m in range(players // 4):
+            for k, letra in enumerate(conflicts.SEAT_LETTERS):
+                rows.append((rnd, m + 1, letra, ids[m * 4 + k]))
+    return rows
+
+
+def test_pair_key_is_symmetric_and_unique():
+    big = 2**31 + 5
+    pairs = [(1, 2), (2, 3), (1, 3), (7, big), (big, big + 1), (0, 1)]
+    keys = [pair_key(a, b) for a, b in pairs]
+
+    assert len(set(keys)) == len(pairs)
+    for (a, b), k in zip(pairs, keys):
+        assert pair_key(b, a) == k
+        assert (k >> 32, k & 0xFFFFFFFF) == (min(a, b), max(a, b))
+
+
+def test_seat_rows_round_trip():
+    rows = _seat_rows(40, 4, random.Random(3))
+    index = ConflictIndex.from_seat_rows(rows)
+
+    assert sorted(index.seat_rows()) == sorted(rows)
+    assert index.seat_count() == len(rows)
+    assert index.rounds() == [1, 2, 3, 4]
+
+    again = ConflictIndex.from_seat_rows(index.seat_rows())
+    assert again._partners == index._partners
+    assert again._opponents == index._opponents
+
+
+def test_counts_match_seat_history():
+    rows = _seat_rows(24, 3, random.Random(11))
+    index = ConflictIndex.from_seat_rows(rows)
+
+    tables: dict[tuple, dict] = {}
+    for rnd, mesa, letra, pid in rows:
+        tables.setdefault((rnd, mesa), {})[letra] = pid
+
+    partners: dict[tuple, int] = {}
+    met: dict[tuple, int] = {}
+    for seats in tables.values():
+        a, b, c, d = (seats[letra] for letra in conflicts.SEAT_LETTERS)
+        for x, y in ((a, c), (b, d)):
+            key = (min(x, y), max(x, y))
+            partners[key] = partners.get(key, 0) + 1
+        ids = (a, b, c, d)
+        for i in range(4):
+            for j in range(i + 1, 4):
+                key = (min(ids[i], ids[j]), max(ids[i], ids[j]))
+                met[key] = met.get(key, 0) + 1
+
+    for x in range(1, 25):
+        for y in range(x + 1, 25):
+            assert index.partner_count(y, x) == partners.get((x, y), 0)
+            assert index.tablemate_count(x, y) == met.get((x, y), 0)
+
+
+def test_remove_and_excluding_restore_counts():
+    rows = _seat_rows(16, 3, random.Random(5))
+    index = ConflictIndex.from_seat_rows(rows)
+    before = (dict(index._partners), dict(index._opponents), index.seat_rows())
+    round3 = index.round_tables(3)
+
+    with index.excluding(3):
+        assert 3 not in index.rounds()
+        # la ronda 3 contra las demás: lo mismo que table_violations desde afuera
+        excluded = [index.table_violations(ids) for _, ids in round3]
+
+    assert (index._partners, index._opponents) == before[:2]
+    assert sorted(index.seat_rows()) == sorted(before[2])
+
+    partial = ConflictIndex.from_seat_rows([r for r in rows if r[0] != 3])
+    assert excluded == [partial.table_violations(ids) for _, ids in round3]
+
+    for mesa, _ in round3:
+        index.remove_table(3, mesa)
+    assert index.seat_rows() == partial.seat_rows()
+    assert index._partners == partial._partners
+    assert index._opponents == partial._opponents
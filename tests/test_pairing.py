@@ -0,0 +1,87 @@
+# tests/test_pairing.py
+#
+# Greedy + reparación: si existe una ronda sin parejas ni rivales repetidos,
+# build_round la encuentra; y con las iteraciones guardadas la misma semilla
+# reconstruye la misma ronda.
+
+import random
+
+import pytest
+
+from core import pairing
+from core.conflicts import ConflictIndex
+
+
+def _history(players: int, rounds: int, rng: random.Random) -> ConflictIndex:
+    """Rondas 1 (al azar) y 2 (la pareja pasa a ser rival), como el torneo real."""
+    index = ConflictIndex()
+    ids = list(range(1, players + 1))
+    tables = pairing.shuffle_tables(ids, rng)
+    index.set_round(1, list(enumerate(tables, start=1)))
+    if rounds >= 2:
+        tables = pairing.round2_tables(tables, rng)
+        index.set_round(2, list(enumerate(tables, start=1)))
+    return index
+
+
+def _check_round(result: dict, players: int):
+    seated = [pid for t in result["tables"] for pid in t]
+    assert sorted(seated + result["bench"]) == list(range(1, players + 1))
+    assert all(len(t) == 4 for t in result["tables"])
+    assert result["relaxed"] == result["repeat_partners"] + result["repeat_opponents"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_no_repeated_partners_when_possible(seed):
+    players = 32
+    index = _history(players, 2, random.Random(seed))
+
+    result = pairing.build_round(
+        list(range(1, players + 1)),
+        index,
+        rng=random.Random(100 + seed),
+        time_limit=float("inf"),
+        max_iterations=50_000,
+    )
+
+    _check_round(result, players)
+    assert result["repeat_partners"] == 0
+    # con 32 jugadores y 2 rondas hay margen de sobra: tampoco repite rivales
+    assert result["repeat_opponents"] == 0
+    assert all(index.table_violations(t) == (0, 0) for t in result["tables"])
+
+
+def test_repair_fixes_a_bad_greedy_start(monkeypatch):
+    players = 16
+    index = _history(players, 2, random.Random(2))
+    # arranque adversario: repetir las mesas de la ronda 1 tal cual
+    round1 = [list(ids) for _, ids in index.round_tables(1)]
+    monkeypatch.setattr(pairing, "_greedy_tables", lambda pool, index: [list(t) for t in round1])
+    assert sum(pairing.table_cost(index, t) for t in round1) > 0
+
+    result = pairing.build_round(
+        list(range(1, players + 1)),
+        index,
+        rng=random.Random(9),
+        time_limit=float("inf"),
+        max_iterations=50_000,
+    )
+
+    _check_round(result, players)
+    assert result["repeat_partners"] == 0
+    assert result["iterations"] > 0
+
+
+def test_same_seed_and_iterations_rebuild_round():
+    players = 41  # uno queda en la banca
+    index = _history(players, 2, random.Random(4))
+    ids = list(range(1, players + 1))
+
+    first = pairing.build_round(ids, index, rng=random.Random(77), time_limit=0.05)
+    again = pairing.build_round(
+        ids, index, rng=random.Random(77), time_limit=float("inf"), max_iterations=first["iterations"]
+    )
+
+    _check_round(first, players)
+    assert len(first["bench"]) == 1
+    assert again == first
@@ -0,0 +1,78 @@
+# tests/test_player_stats.py
+#
+# player_stats se actualiza por diferencias (storage._apply_stats_deltas) al
+# guardar cada mesa. Después de muchas capturas / correcciones al azar debe
+# coincidir con una reconstrucción desde cero.
+
+import random
+
+from benchmarks.bench_recompute import legacy_recompute_stats_from_results
+from benchmarks.synthetic import build_synthetic_tournament
+from core import storage
+from core import tournament
+
+PLAYERS = 48  # 12 mesas por ronda
+ROUNDS = 3
+
+
+def _snapshot() -> list[tuple]:
+    conn = storage.get_connection()
+    try:
+        return conn.execute(
+            "SELECT jugador_id, g, p, e, r FROM player_stats ORDER BY jugador_id;"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _random_points(rng: random.Random) -> dict[str, dict]:
+    return {
+        letra: {"base_points": rng.randint(0, 200), "penalty_points": rng.choice((0, 0, 0, 10, 25))}
+        for letra in ("A", "B", "C", "D")
+    }
+
+
+def test_incremental_stats_match_full_recompute(data_dir):
+    build_synthetic_tournament(PLAYERS, ROUNDS, scored_rounds=0)
+    storage.recompute_stats_from_results()
+    rng = random.Random(7)
+    tables = PLAYERS // 4
+
+    for step in range(150):
+        rnd = rng.randint(1, ROUNDS)
+        mesa = rng.randint(1, tables)
+        # muchas mesas se guardan más de una vez (corrección de puntos / ganador)
+        ok, msg = tournament.save_table_player_scores(
+            rnd, mesa, _random_points(rng), rng.choice(("AC", "BD"))
+        )
+        assert ok, msg
+
+        if step % 25 == 0:
+            ok, msg = tournament.subtract_points_from_player(rng.randint(1, PLAYERS), rng.randint(1, 20))
+            assert ok, msg
+        if step % 10 == 0:
+            assert storage.verify_player_stats() == []
+
+    assert storage.verify_player_stats() == []
+    incremental = _snapshot()
+
+    storage.recompute_stats_from_results()
+    assert _snapshot() == incremental
+
+    legacy_recompute_stats_from_results()
+    assert _snapshot() == incremental
+
+
+def test_verify_player_stats_reports_drift(data_dir):
+    build_synthetic_tournament(PLAYERS, 1)
+    storage.recompute_stats_from_results()
+    assert storage.verify_player_stats() == []
+
+    conn = storage.get_connection()
+    conn.execute("UPDATE player_stats SET p = p + 1 WHERE jugador_id = 5;")
+    conn.commit()
+    conn.close()
+
+    drift = storage.verify_player_stats()
+    assert [d["jugador_id"] for d in drift] == [5]
+    assert drift[0]["stored"]["P"] == drift[0]["expected"]["P"] + 1
@@ -0,0 +1,78 @@
+# tests/test_query_counts.py
+#
+# Las lecturas "calientes" deben hacer un número FIJO de consultas a la BD,
+# sin importar cuántos jugadores / mesas tenga el torneo (nada de una
+# consulta por mesa o por jugador).
+
+import pytest
+
+from benchmarks.synthetic import build_synthetic_tournament, temp_data_dir
+from core import score_sheet
+from core import storage
+from core import tournament
+
+SMALL = 40   # 10 mesas
+LARGE = 160  # 40 mesas
+
+
+def _count(fn) -> int:
+    with storage.count_queries() as counter:
+        fn()
+    return counter["count"]
+
+
+def _query_counts(players: int, output_dir) -> dict[str, int]:
+    with temp_data_dir():
+        build_synthetic_tournament(players, rounds=2)
+        # un solo recálculo antes de medir: las lecturas no deben hacer trabajo pendiente
+        storage.recompute_stats_from_results()
+
+        sheet_args = dict(
+            tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
+            tournament_type="individual",
+        )
+        return {
+            "get_table_detail": _count(lambda: storage.get_table_detail(1, 1)),
+            "score_sheet_for_table_bytes": _count(
+                lambda: score_sheet.score_sheet_for_table_bytes(1, 1, **sheet_args)
+            ),
+            "generate_score_sheets_for_round": _count(
+                lambda: score_sheet.generate_score_sheets_for_round(
+                    1, output_dir=str(output_dir / "mesas"), incremental=False, **sheet_args
+                )
+            ),
+            "generate_round_score_sheet_pdf": _count(
+                lambda: score_sheet.generate_round_score_sheet_pdf(
+                    1, output_dir=str(output_dir / "ronda"), **sheet_args
+                )
+            ),
+            "storage.get_ranking": _count(storage.get_ranking),
+            "storage.get_player_stats_map": _count(storage.get_player_stats_map),
+            "tournament.get_ranking": _count(tournament.get_ranking),
+        }
+
+
+@pytest.fixture(scope="module")
+def counts(tmp_path_factory):
+    return {
+        players: _query_counts(players, tmp_path_factory.mktemp(f"hojas_{players}"))
+        for players in (SMALL, LARGE)
+    }
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "get_table_detail",
+        "score_sheet_for_table_bytes",
+        "generate_score_sheets_for_round",
+        "generate_round_score_sheet_pdf",
+        "storage.get_ranking",
+        "storage.get_player_stats_map",
+        "tournament.get_ranking",
+    ],
+)
+def test_query_count_does_not_grow_with_tournament_size(counts, name):
+    small, large = counts[SMALL][name], counts[LARGE][name]
+    assert small > 0
+    assert small == large, f"{name}: {small} consultas con {SMALL} jugadores, {large} con {LARGE}"
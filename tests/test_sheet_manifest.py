@@ -0,0 +1,101 @@
+# tests/test_sheet_manifest.py
+#
+# Las hojas de mesa se re-dibujan solo si cambiaron sus entradas (manifiesto
+# .hojas_manifest.json con el hash de cada hoja) o si falta el PDF.
+
+import os
+
+import pytest
+
+from benchmarks.synthetic import build_synthetic_tournament
+from core import score_sheet
+from core import storage
+from core import tournament
+
+PLAYERS = 24  # 6 mesas por ronda
+TABLES = PLAYERS // 4
+
+
+@pytest.fixture
+def sheets_dir(data_dir):
+    build_synthetic_tournament(PLAYERS, rounds=2, scored_rounds=0)
+    return os.path.join(data_dir, "hojas")
+
+
+def _generate(round_number, folder):
+    count, _ = score_sheet.generate_score_sheets_for_round(
+        round_number, folder, "Torneo de prueba", "individual"
+    )
+    return count
+
+
+def _mtimes(folder):
+    return {
+        name: os.stat(os.path.join(folder, name)).st_mtime_ns
+        for name in os.listdir(folder)
+        if name.endswith(".pdf")
+    }
+
+
+def _points():
+    return {letra: {"base_points": 100, "penalty_points": 0} for letra in ("A", "B", "C", "D")}
+
+
+def test_second_run_skips_unchanged_sheets(sheets_dir):
+    assert _generate(2, sheets_dir) == TABLES
+    assert len(_mtimes(sheets_dir)) == TABLES
+    assert os.path.exists(os.path.join(sheets_dir, score_sheet.MANIFEST_NAME))
+
+    before = _mtimes(sheets_dir)
+    assert _generate(2, sheets_dir) == 0
+    assert _mtimes(sheets_dir) == before
+
+
+def test_only_changed_or_missing_sheets_are_rebuilt(sheets_dir):
+    _generate(2, sheets_dir)
+
+    # cambian de asiento dos jugadores de la mesa 1 (A <-> C)
+    mesas = storage.get_round_assignments(2)
+    mesas[0]["A"], mesas[0]["C"] = mesas[0]["C"], mesas[0]["A"]
+    storage.save_round_assignments(2, mesas)
+    # y se borra a mano el PDF de la mesa 3
+    os.remove(os.path.join(sheets_dir, "ronda2_mesa03.pdf"))
+
+    before = _mtimes(sheets_dir)
+    assert _generate(2, sheets_dir) == 2
+    after = _mtimes(sheets_dir)
+
+    changed = {name for name in after if before.get(name) != after[name]}
+    assert changed == {"ronda2_mesa01.pdf", "ronda2_mesa03.pdf"}
+
+
+def test_saved_points_only_invalidate_sheets_that_show_stats(sheets_dir):
+    assert _generate(1, sheets_dir) == TABLES
+    assert _generate(2, sheets_dir) == TABLES
+
+    ok, msg = tournament.save_table_player_scores(1, 1, _points(), "AC")
+    assert ok, msg
+
+    # la hoja de la ronda 1 no muestra stats; la de la ronda 2 sí (G/P/puntos)
+    assert _generate(1, sheets_dir) == 0
+    assert _generate(2, sheets_dir) == TABLES
+
+
+def test_single_table_uses_the_same_manifest(sheets_dir):
+    _generate(2, sheets_dir)
+
+    path, rebuilt = score_sheet.update_score_sheet_for_table(
+        2, 4, sheets_dir, "Torneo de prueba", "individual"
+    )
+    assert not rebuilt
+    assert path == os.path.abspath(os.path.join(sheets_dir, "ronda2_mesa04.pdf"))
+
+    # otro título: cambia la hoja -> se re-dibuja una vez y queda en el manifiesto
+    path, rebuilt = score_sheet.update_score_sheet_for_table(
+        2, 4, sheets_dir, "Torneo final", "individual"
+    )
+    assert rebuilt
+    _, rebuilt = score_sheet.update_score_sheet_for_table(
+        2, 4, sheets_dir, "Torneo final", "individual"
+    )
+    assert not rebuilt
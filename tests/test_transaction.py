@@ -0,0 +1,25 @@
+# tests/test_transaction.py
+
+import pytest
+
+from core import storage
+
+
+def test_transaction_refuses_pending_implicit_work(data_dir):
+    storage.init_db()
+    conn = storage.get_connection()
+    conn.execute("UPDATE players SET nombre = 'a medias';")
+    assert conn.in_transaction
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            pass
+
+    # no se confirmó nada: el que abrió el trabajo decide
+    assert conn.in_transaction
+    conn.rollback()
+    conn.close()
+
+    with storage.transaction() as tx:
+        tx.execute("UPDATE players SET nombre = 'ok' WHERE id = 1;")
+    assert storage.get_all_players()[0]["nombre"] == "ok"
@@ -0,0 +1,163 @@
+# tests/test_tree_sync.py
+#
+# TreeSync contra un Treeview falso (sin Tk): después de cada actualización
+# el árbol queda igual a las filas pedidas, aunque la anterior se haya
+# abandonado a mitad, y solo se tocan las filas que cambiaron.
+
+import random
+
+import pytest
+
+from ui.tree_sync import TreeSync
+
+
+class FakeTree:
+    """Lo mínimo de ttk.Treeview (sin jerarquía) que usa TreeSync, más after()."""
+
+    def __init__(self):
+        self.children: list[str] = []
+        self.detached: set[str] = set()
+        self.values: dict[str, tuple] = {}
+        self.pending: dict[int, tuple] = {}
+        self.next_id = 0
+        self.ops = {"insert": 0, "item": 0, "move": 0, "delete": 0}
+
+    def get_children(self, parent):
+        return tuple(self.children)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.ops["delete"] += 1
+            if iid in self.children:
+                self.children.remove(iid)
+            self.detached.discard(iid)
+            del self.values[iid]
+
+    def insert(self, parent, index, iid, values):
+        assert iid not in self.values
+        self.ops["insert"] += 1
+        self.children.insert(len(self.children) if index == "end" else index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values):
+        self.ops["item"] += 1
+        self.values[iid] = values
+
+    def detach(self, *iids):
+        for iid in iids:
+            self.children.remove(iid)
+            self.detached.add(iid)
+
+    def move(self, iid, parent, index):
+        self.ops["move"] += 1
+        if iid in self.children:
+            self.children.remove(iid)
+        self.detached.discard(iid)
+        self.children.insert(len(self.children) if index == "end" else index, iid)
+
+    def index(self, iid):
+        return self.children.index(iid)
+
+    def identify_row(self, y):
+        return self.children[0] if self.children else ""
+
+    def exists(self, iid):
+        return iid in self.values
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def after(self, ms, fn, *args):
+        self.next_id += 1
+        self.pending[self.next_id] = (fn, args)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        while self.pending:
+            after_id = min(self.pending)
+            fn, args = self.pending.pop(after_id)
+            fn(*args)
+
+
+def _rows(ids, version=0):
+    return [(str(i), (i, f"Jugador {i}", version)) for i in ids]
+
+
+def _assert_synced(tree: FakeTree, rows):
+    assert tree.children == [iid for iid, _ in rows]
+    assert {iid: tree.values[iid] for iid, _ in rows} == dict(rows)
+    assert len(tree.values) == len(rows)
+    assert not tree.detached
+
+
+def _sync(tree, sync, rows):
+    sync.update(rows)
+    tree.run_pending()
+    _assert_synced(tree, rows)
+
+
+def test_insert_update_delete_and_reorder():
+    tree = FakeTree()
+    sync = TreeSync(tree)
+
+    _sync(tree, sync, _rows(range(10)))
+    assert tree.ops["insert"] == 10
+
+    rows = _rows([9, 0, 1, 2, 12, 4, 5, 3, 7, 8])  # borra 6, agrega 12, mueve 9 y 3
+    rows[2] = ("1", (1, "Jugador 1", "editado"))
+    _sync(tree, sync, rows)
+
+    _sync(tree, sync, [])
+    assert tree.children == []
+
+
+def test_single_move_costs_one_operation():
+    tree = FakeTree()
+    sync = TreeSync(tree)
+    rows = _rows(range(1000))
+    _sync(tree, sync, rows)
+
+    moved = list(rows)
+    moved.insert(10, moved.pop(500))
+    tree.ops = dict.fromkeys(tree.ops, 0)
+    _sync(tree, sync, moved)
+    assert tree.ops == {"insert": 0, "item": 0, "move": 1, "delete": 0}
+
+    # sin cambios: ninguna operación
+    tree.ops = dict.fromkeys(tree.ops, 0)
+    _sync(tree, sync, moved)
+    assert sum(tree.ops.values()) == 0
+
+
+@pytest.mark.parametrize("chunk", [3, 500])
+def test_random_updates_with_abandoned_chunks(chunk, monkeypatch):
+    monkeypatch.setattr(TreeSync, "CHUNK", chunk)
+    rng = random.Random(chunk)
+
+    for _ in range(300):
+        tree = FakeTree()
+        sync = TreeSync(tree)
+        for _ in range(4):
+            ids = rng.sample(range(60), rng.randint(0, 40))
+            rows = [(str(i), (i, rng.randint(0, 3))) for i in ids]
+            sync.update(rows)
+            if tree.pending and rng.random() < 0.3:
+                continue  # llega otra actualización antes de terminar esta
+            tree.run_pending()
+            _assert_synced(tree, rows)
+
+
+def test_on_done_runs_after_last_chunk(monkeypatch):
+    monkeypatch.setattr(TreeSync, "CHUNK", 4)
+    tree = FakeTree()
+    sync = TreeSync(tree)
+    done = []
+
+    rows = _rows(range(10))
+    sync.update(rows, on_done=lambda: done.append(list(tree.children)))
+    assert done == []
+    tree.run_pending()
+    assert done == [[iid for iid, _ in rows]]
@@ -0,0 +1,95 @@
+# ui/change_watcher.py
+#
+# Aviso de cambios hechos por la otra PC (o por un trabajo en segundo plano).
+# Cada POLL_MS, en el hilo de lecturas de ui/db_async (nunca en el de Tk):
+#   1) storage.data_version(): una sola consulta barata (PRAGMA data_version);
+#      si no cambió, no se hace nada más
+#   2) si cambió: storage.get_changes_since(seq) dice QUÉ rondas / mesas /
+#      jugadores se tocaron, y se avisa a on_change(changes) (en el hilo de Tk)
+#      para que la vista recargue solo esa parte.
+# `seq` (la última secuencia de cambios vista) sirve de versión de los datos:
+# MainWindow la usa para saber si una vista oculta quedó vieja. Todas las
+# lecturas (también la secuencia inicial) van por el hilo de lecturas: la
+# PRAGMA data_version es por conexión, así que se compara siempre la misma.
+
+from __future__ import annotations
+
+import sqlite3
+
+from core import storage
+from ui.db_async import get_async_storage
+
+
+def _fetch_changes(version, seq: int):
+    """Hilo de lecturas. None si nada cambió; si no (versión, seq, cambios)."""
+    current = storage.data_version()
+    if current == version:
+        return None
+    new_seq, changes = storage.get_changes_since(seq)
+    return current, new_seq, changes
+
+
+class ChangeWatcher:
+    POLL_MS = 1500
+
+    def __init__(self, widget, on_change, on_ready=None):
+        """
+        on_change(cambios): algo cambió (en el hilo de Tk).
+        on_ready(): ya se conoce la secuencia inicial (`seq` deja de ser None).
+        """
+        self.widget = widget
+        self.on_change = on_change
+        self._version = None
+        self._seq: int | None = None
+        self._after_id = None
+        self._stopped = False
+        get_async_storage(widget).read(
+            storage.get_change_seq,
+            on_done=lambda seq: self._start(seq, on_ready),
+        )
+
+    @property
+    def seq(self) -> int | None:
+        """Última secuencia de cambios aplicada (None hasta leer la inicial)."""
+        return self._seq
+
+    def stop(self):
+        self._stopped = True
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _start(self, seq: int, on_ready):
+        self._seq = seq
+        if on_ready is not None:
+            on_ready()
+        self._schedule()
+
+    def _poll(self):
+        self._after_id = None
+        get_async_storage(self.widget).read(
+            _fetch_changes,
+            self._version,
+            self._seq,
+            on_done=self._apply,
+            on_error=self._on_error,
+        )
+
+    def _apply(self, result):
+        if result is not None:
+            version, seq, changes = result
+            self._version = version
+            if seq != self._seq:
+                self._seq = seq
+                self.on_change(changes)
+        self._schedule()
+
+    def _on_error(self, error: Exception):
+        if not isinstance(error, sqlite3.Error):
+            raise error
+        # BD ocupada o carpeta de red caída: se reintenta en el próximo sondeo
+        self._schedule()
+
+    def _schedule(self):
+        if not self._stopped:
+            self._after_id = self.widget.after(self.POLL_MS, self._poll)
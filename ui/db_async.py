@@ -0,0 +1,112 @@
+# ui/db_async.py
+#
+# Fachada asíncrona de storage para la UI.
+# Si la otra PC tiene el candado de escritura, una escritura en el hilo de Tk
+# congela la ventana hasta el busy_timeout (8 s). Aquí las llamadas van a
+# hilos de BD dedicados y devuelven un Future; el resultado vuelve al hilo de
+# Tk con after() (los callbacks SIEMPRE corren en el hilo de Tk).
+#
+#   db = get_async_storage(self)
+#   db.read(storage.get_table_detail, rnd, mesa, on_done=self._show_detail, key="captura")
+#   db.write(tournament.save_table_player_scores, rnd, mesa, pts, pair, on_done=...)
+#
+# - Escrituras: un solo hilo => se aplican en el orden en que se pidieron.
+#   ui/jobs usa el mismo hilo (`writer`) para los trabajos largos que escriben.
+# - Lecturas: otro hilo (con WAL no esperan al candado de escritura), así una
+#   escritura bloqueada no frena las lecturas ni la captura de puntos.
+# - key: de varias lecturas con la misma clave solo se entrega la última
+#   (ej: cambiar rápido de mesa no pinta resultados viejos).
+
+from __future__ import annotations
+
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from tkinter import messagebox
+
+
+class AsyncStorage:
+    POLL_MS = 30
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._reads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-read")
+        self._writes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._done: queue.Queue = queue.Queue()
+        self._latest: dict[str, Future] = {}
+        self._pending = 0
+        self._polling = False
+
+    # ---------- API (hilo de Tk) ----------
+
+    def read(self, fn, *args, on_done=None, on_error=None, key: str | None = None, **kwargs) -> Future:
+        """fn(*args, **kwargs) en el hilo de lecturas."""
+        return self._submit(self._reads, fn, args, kwargs, on_done, on_error, key)
+
+    def write(self, fn, *args, on_done=None, on_error=None, **kwargs) -> Future:
+        """fn(*args, **kwargs) en el hilo de escrituras (en orden de llegada)."""
+        return self._submit(self._writes, fn, args, kwargs, on_done, on_error, None)
+
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    @property
+    def writer(self) -> ThreadPoolExecutor:
+        """El único hilo de escrituras de la ventana."""
+        return self._writes
+
+    # ---------- internos ----------
+
+    def _submit(self, pool, fn, args, kwargs, on_done, on_error, key) -> Future:
+        fut = pool.submit(fn, *args, **kwargs)
+        if key is not None:
+            self._latest[key] = fut
+        self._pending += 1
+        # corre en el hilo de BD: solo encola, no toca Tk
+        fut.add_done_callback(lambda f: self._done.put((f, on_done, on_error, key)))
+        self._ensure_polling()
+        return fut
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                fut, on_done, on_error, key = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._dispatch(fut, on_done, on_error, key)
+
+        if self._pending:
+            self.widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _dispatch(self, fut: Future, on_done, on_error, key):
+        if key is not None:
+            if self._latest.get(key) is not fut:
+                return  # llegó una lectura más nueva con la misma clave
+            del self._latest[key]
+
+        error = fut.exception()
+        if error is not None:
+            (on_error or _show_error)(error)
+        elif on_done is not None:
+            on_done(fut.result())
+
+
+def _show_error(error: Exception):
+    messagebox.showerror("Error de base de datos", str(error))
+
+
+def get_async_storage(widget) -> AsyncStorage:
+    """Fachada compartida por toda la ventana (un hilo de escrituras => orden)."""
+    root = widget.winfo_toplevel()
+    db = getattr(root, "_async_storage", None)
+    if db is None:
+        db = AsyncStorage(root)
+        root._async_storage = db
+    return db
@@ -0,0 +1,197 @@
+# ui/jobs.py
+#
+# Cola de trabajos en segundo plano para la UI.
+# Las operaciones largas (generar rondas, recalcular, PDFs) corren fuera del
+# hilo de Tk; la ventana sigue respondiendo (incluso si la BD está bloqueada
+# por la otra PC hasta el busy_timeout). El hilo de Tk revisa la cola con
+# after() y llama a los callbacks de progreso / fin SIEMPRE en el hilo de Tk.
+#
+#   runner = get_runner(widget)
+#   runner.submit(
+#       "Hojas PDF",
+#       lambda job: score_sheet.generate_round_score_sheet_pdf(..., progress=job.report),
+#       on_progress=..., on_done=..., on_error=...,
+#       writes=False,
+#   )
+#
+# Los trabajos que escriben (writes=True, el default) corren en el MISMO hilo
+# de escrituras que ui/db_async: toda escritura de la ventana (cambiar estado,
+# guardar puntos, generar rondas, recalcular) se aplica en orden de llegada y
+# nunca dos a la vez. Los de solo lectura (PDFs) van a su propio hilo.
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from ui.db_async import get_async_storage
+
+
+class JobCancelled(Exception):
+    """Se lanza dentro del trabajo (desde job.report) cuando se pidió cancelar."""
+
+
+class Job:
+    """Un trabajo en la cola. `report` y `cancelled` se usan desde el hilo trabajador."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, fn, callbacks: dict, writes: bool = True):
+        self.id = next(self._ids)
+        self.name = name
+        self.fn = fn
+        self.writes = writes
+        self.callbacks = callbacks
+        self.state = "queued"  # queued | running | done | error | cancelled
+        self._cancel = threading.Event()
+        self._runner: "JobRunner | None" = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Pide cancelar. Un trabajo en cola no llega a correr; uno en curso se
+        detiene en su próximo job.report()."""
+        self._cancel.set()
+
+    def report(self, done: int, total: int | None = None, text: str = ""):
+        """Progreso (desde el hilo trabajador). Lanza JobCancelled si se canceló."""
+        if self.cancelled:
+            raise JobCancelled()
+        if self._runner is not None:
+            self._runner._events.put((self, "progress", (done, total, text)))
+
+
+class JobRunner:
+    """
+    Trabajos en segundo plano + sondeo con after().
+      - writes=True: en `writer` (un solo hilo, compartido con ui/db_async)
+      - writes=False: en un hilo propio de solo lectura
+    En cada hilo los trabajos corren en orden de llegada.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, widget, writer: Executor):
+        self.widget = widget
+        self._writer = writer
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-job")
+        self._events: queue.Queue = queue.Queue()
+        self._active: set[Job] = set()
+        self._polling = False
+
+    # ---------- API (hilo de Tk) ----------
+
+    def submit(
+        self,
+        name: str,
+        fn,
+        on_progress=None,
+        on_done=None,
+        on_error=None,
+        on_cancel=None,
+        writes: bool = True,
+    ) -> Job:
+        """
+        fn(job) corre fuera del hilo de Tk. Callbacks (en el hilo de Tk):
+          on_progress(done, total, text), on_done(resultado),
+          on_error(excepcion), on_cancel()
+        writes=False solo para trabajos que NO escriben en la BD.
+        """
+        job = Job(
+            name,
+            fn,
+            {
+                "progress": on_progress,
+                "done": on_done,
+                "error": on_error,
+                "cancelled": on_cancel,
+            },
+            writes=writes,
+        )
+        job._runner = self
+        self._active.add(job)
+        pool = self._writer if writes else self._reader
+        pool.submit(self._run, job)
+        self._ensure_polling()
+        return job
+
+    def busy(self) -> bool:
+        return bool(self._active)
+
+    def writing(self) -> bool:
+        """Hay algún trabajo de escritura en cola o en curso."""
+        return any(job.writes for job in self._active)
+
+    def cancel_all(self):
+        for job in list(self._active):
+            job.cancel()
+
+    # ---------- hilo trabajador ----------
+
+    def _run(self, job: Job):
+        if job.cancelled:
+            self._events.put((job, "cancelled", None))
+            return
+
+        self._events.put((job, "running", None))
+        try:
+            result = job.fn(job)
+        except JobCancelled:
+            self._events.put((job, "cancelled", None))
+        except Exception as e:
+            self._events.put((job, "error", e))
+        else:
+            self._events.put((job, "done", result))
+
+    # ---------- sondeo (hilo de Tk) ----------
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(job, kind, payload)
+
+        if self._active:
+            self.widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _dispatch(self, job: Job, kind: str, payload):
+        if kind == "running":
+            job.state = "running"
+            return
+
+        if kind != "progress":
+            job.state = kind
+            self._active.discard(job)
+
+        callback = job.callbacks.get(kind)
+        if callback is None:
+            return
+        if kind == "progress":
+            callback(*payload)
+        elif kind == "cancelled":
+            callback()
+        else:
+            callback(payload)
+
+
+def get_runner(widget) -> JobRunner:
+    """Runner compartido por toda la ventana (escribe en el hilo de ui/db_async)."""
+    root = widget.winfo_toplevel()
+    runner = getattr(root, "_job_runner", None)
+    if runner is None:
+        runner = JobRunner(root, writer=get_async_storage(root).writer)
+        root._job_runner = runner
+    return runner
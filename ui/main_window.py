@@ -1,17 +1,21 @@
 # ui/main_window.py
 import customtkinter as ctk
+from tkinter import messagebox
 
-from ui.players_view import PlayersView
-from ui.tables_view import TablesView
+from core import startup_timer
+from core import storage
+from ui.change_watcher import ChangeWatcher
+from ui.db_async import get_async_storage
 
-from ui.score_capture_view import ScoreCaptureView
-from ui.ranking_view import RankingView
+# Las vistas se importan al abrirlas por primera vez (arranque rápido):
+# ui.tables_view trae el optimizador y, al generar PDFs, ReportLab.
 
 
 class MainWindow(ctk.CTk):
 
-    def __init__(self):
+    def __init__(self, startup_report: bool = False):
         super().__init__()
+        self._startup_report = startup_report
 
         self.title("Gestor de Torneos de Dominó")
         self.geometry("1100x650")
@@ -46,6 +50,13 @@ class MainWindow(ctk.CTk):
         )
         self.content.pack(fill="both", expand=True, padx=18, pady=18)
 
+        # ✅ vistas cacheadas: se crean una sola vez y se muestran / ocultan.
+        # Al volver a una vista solo se recarga si los datos cambiaron
+        # (secuencia de cambios de ChangeWatcher) desde la última vez que se dibujó.
+        self._views: dict[str, ctk.CTkFrame] = {}
+        self._view_versions: dict[str, int | None] = {}
+        self._current_view: str | None = None
+
         # --------- MENÚ LATERAL ----------
         title_label = ctk.CTkLabel(
             self.sidebar,
@@ -116,12 +127,55 @@ class MainWindow(ctk.CTk):
         self.btn_clasificacion.pack(fill="x", padx=16, pady=6)
         self.menu_buttons["clasificacion"] = self.btn_clasificacion
 
-        # Vista inicial
+        # Vista inicial: cuando la ventana ya está en pantalla y la BD lista.
+        # Hasta entonces el menú no responde (las vistas leen la BD al crearse).
+        self._watcher = None
+        self._set_menu_enabled(False)
+        self.after(10, self._start)
+
+    def _start(self):
+        self.update_idletasks()
+        startup_timer.mark("window")
+
+        # Inicializar BD en el hilo de escrituras: si el esquema está al día es
+        # una sola consulta, pero la primera vez (o al actualizar) crea tablas
+        # e índices y no debe frenar el primer cuadro de la ventana
+        get_async_storage(self).write(
+            storage.init_db,
+            on_done=lambda _: self._on_db_ready(),
+            on_error=self._on_db_error,
+        )
+
+    def _on_db_ready(self):
+        startup_timer.mark("init_db")
+
+        # ✅ cambios de la otra PC: solo se recarga lo afectado en la vista visible.
+        # La vista inicial se arma cuando ya se conoce la secuencia de cambios
+        # (así lo que cambie mientras carga se detecta en el primer sondeo).
+        self._watcher = ChangeWatcher(self, self._on_data_changed, on_ready=self._show_first_view)
+
+    def _on_db_error(self, error: Exception):
+        messagebox.showerror("Error de base de datos", f"No se pudo abrir la base de datos:\n{error}")
+        if self._startup_report:
+            self.after(0, self.destroy)
+
+    def _show_first_view(self):
+        self._set_menu_enabled(True)
         self._set_active_menu("jugadores")
         self.show_players_view()
+        self.update_idletasks()
+        startup_timer.mark("first_view")
+
+        if self._startup_report:
+            startup_timer.write_report()
+            self.after(0, self.destroy)
 
     # --------- UTILIDAD: MENÚ ACTIVO ----------
 
+    def _set_menu_enabled(self, enabled: bool):
+        for btn in self.menu_buttons.values():
+            btn.configure(state="normal" if enabled else "disabled")
+
     def _set_active_menu(self, key: str):
         for name, btn in self.menu_buttons.items():
             if name == key:
@@ -131,53 +185,99 @@ class MainWindow(ctk.CTk):
 
     # --------- CAMBIO DE VISTAS ----------
 
-    def clear_content(self):
-        for widget in self.content.winfo_children():
-            widget.destroy()
+    def _show_view(self, key: str, factory):
+        """
+        Muestra la vista `key` (la crea con factory() la primera vez) y oculta la
+        actual. Las vistas con refresh() se recargan solo si cambió la versión
+        de los datos desde que se dibujaron.
+        """
+        if self._current_view == key:
+            view = self._views[key]
+        else:
+            if self._current_view is not None:
+                self._views[self._current_view].pack_forget()
+
+            view = self._views.get(key)
+            if view is None:
+                view = factory()
+                self._views[key] = view
+                self._view_versions[key] = self._data_seq()
+
+            view.pack(fill="both", expand=True, padx=24, pady=24)
+            self._current_view = key
+
+        seq = self._data_seq()
+        if self._view_versions.get(key) != seq and hasattr(view, "refresh"):
+            view.refresh()
+        self._view_versions[key] = seq
+
+    def _data_seq(self) -> int | None:
+        """Versión de los datos: la secuencia que ya leyó ChangeWatcher (sin tocar la BD)."""
+        return self._watcher.seq if self._watcher is not None else None
+
+    def _on_data_changed(self, changes: dict):
+        """
+        Cambios detectados por ChangeWatcher. Solo se avisa a la vista visible;
+        las ocultas se recargan al mostrarlas (secuencia distinta).
+        """
+        key = self._current_view
+        if key is None:
+            return
+        view = self._views[key]
+        if hasattr(view, "on_data_changed"):
+            view.on_data_changed(changes)
+            self._view_versions[key] = self._data_seq()
 
     def show_torneo_config(self):
         self._set_active_menu("torneo")
-        self.clear_content()
+        self._show_view("torneo", self._build_torneo_config)
 
+    def _build_torneo_config(self) -> ctk.CTkFrame:
+        # el padding lo pone _show_view al empaquetar
         inner = ctk.CTkFrame(self.content, fg_color="transparent")
-        inner.pack(fill="both", expand=True, padx=24, pady=24)
 
         title = ctk.CTkLabel(inner, text="Configuración del Torneo", font=("Roboto", 20, "bold"))
         title.pack(anchor="w", pady=(0, 16))
 
         info = ctk.CTkLabel(inner, text="(Pendiente de implementar)", font=("Roboto", 14))
         info.pack(anchor="w")
+        return inner
 
     def show_players_view(self):
         self._set_active_menu("jugadores")
-        self.clear_content()
-
-        view = PlayersView(self.content)
-        view.pack(fill="both", expand=True, padx=24, pady=24)
+        self._show_view("jugadores", self._build_players_view)
 
     def show_tables_view(self):
         self._set_active_menu("mesas")
-        self.clear_content()
-
-        # TablesView actualmente recibe SOLO (master) en tu código
-        view = TablesView(self.content)
-        view.pack(fill="both", expand=True, padx=24, pady=24)
+        self._show_view("mesas", self._build_tables_view)
 
     def show_score_capture_view(self):
         self._set_active_menu("captura")
-        self.clear_content()
-
-        # ScoreCaptureView debe ser (master) SIN tournament
-        view = ScoreCaptureView(self.content)
-        view.pack(fill="both", expand=True, padx=24, pady=24)
+        self._show_view("captura", self._build_score_capture_view)
 
     def show_ranking_view(self):
         self._set_active_menu("ranking")
-        self.clear_content()
+        self._show_view("ranking", self._build_ranking_view)
+
+    def _build_players_view(self):
+        from ui.players_view import PlayersView
+
+        return PlayersView(self.content)
+
+    def _build_tables_view(self):
+        from ui.tables_view import TablesView
+
+        return TablesView(self.content)
+
+    def _build_score_capture_view(self):
+        from ui.score_capture_view import ScoreCaptureView
+
+        return ScoreCaptureView(self.content)
+
+    def _build_ranking_view(self):
+        from ui.ranking_view import RankingView
 
-        # RankingView debe ser (master) SIN tournament
-        view = RankingView(self.content)
-        view.pack(fill="both", expand=True, padx=24, pady=24)
+        return RankingView(self.content)
 
     def show_standings_view(self):
         self.show_ranking_view()
@@ -4,6 +4,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from core import storage
+from ui.db_async import get_async_storage
+from ui.tree_sync import TreeSync
 
 
 class PlayersView(ctk.CTkFrame):
@@ -122,27 +124,45 @@ class PlayersView(ctk.CTkFrame):
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
 
+        # Recargas por diferencias (clave = id): no parpadea y conserva scroll/selección
+        self._tree_sync = TreeSync(self.tree)
+
     # ---------------- LÓGICA ----------------
+    def refresh(self):
+        """Recarga desde la BD (MainWindow la llama si los datos cambiaron)."""
+        self._load_players()
+
+    def on_data_changed(self, changes: dict):
+        """Cambios de la otra PC (ui/change_watcher)."""
+        if changes["players"]:
+            self._load_players()
+
     def _load_players(self):
-        # Limpiar
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        players = storage.get_all_players()
-
-        for p in players:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    p["id"],
-                    p["nombre"],
-                    p["apellido"],
-                    p["cedula"],
-                    p["telefono"],
-                    p["pago"],
-                ),
-            )
+        # lectura fuera del hilo de Tk (ui/db_async)
+        get_async_storage(self).read(
+            storage.get_all_players,
+            on_done=self._show_players,
+            key="jugadores",
+        )
+
+    def _show_players(self, players: list[dict]):
+        # Solo se insertan / actualizan / borran las filas que cambiaron
+        self._tree_sync.update(
+            [
+                (
+                    str(p["id"]),
+                    (
+                        p["id"],
+                        p["nombre"],
+                        p["apellido"],
+                        p["cedula"],
+                        p["telefono"],
+                        p["pago"],
+                    ),
+                )
+                for p in players
+            ]
+        )
 
         # Actualizar contadores
         count = len(players)
@@ -156,8 +176,26 @@ class PlayersView(ctk.CTkFrame):
         cedula = self.entry_cedula.get()
         telefono = self.entry_telefono.get()
 
-        ok, msg = storage.add_player(nombre, apellido, cedula, telefono, self.PAGO_FIJO)
+        # escritura en la cola de la BD (no congela la ventana si está bloqueada)
+        self.btn_registrar.configure(state="disabled")
+        get_async_storage(self).write(
+            storage.add_player,
+            nombre,
+            apellido,
+            cedula,
+            telefono,
+            self.PAGO_FIJO,
+            on_done=self._on_registrar_done,
+            on_error=self._on_registrar_error,
+        )
+
+    def _on_registrar_error(self, error: Exception):
+        self.btn_registrar.configure(state="normal")
+        messagebox.showerror("Error", str(error))
 
+    def _on_registrar_done(self, result):
+        self.btn_registrar.configure(state="normal")
+        ok, msg = result
         if not ok:
             messagebox.showerror("Error", msg)
             return
@@ -3,6 +3,9 @@ import customtkinter as ctk
 from tkinter import ttk, messagebox
 
 from core import tournament
+from ui.db_async import get_async_storage
+from ui.jobs import get_runner
+from ui.tree_sync import TreeSync
 
 
 class RankingView(ctk.CTkFrame):
@@ -74,39 +77,71 @@ class RankingView(ctk.CTkFrame):
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
 
-    def _clear(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # ✅ recargas por diferencias (clave = id del jugador): conserva scroll y selección
+        self._tree_sync = TreeSync(self.tree)
+
+    def refresh(self):
+        """Recarga desde la BD (MainWindow la llama si los datos cambiaron)."""
+        self._load_ranking()
+
+    def on_data_changed(self, changes: dict):
+        """Cambios de la otra PC (ui/change_watcher)."""
+        if changes["ranking"] or changes["players"]:
+            self._load_ranking()
 
     def _load_ranking(self):
-        self._clear()
-        try:
-            rows = tournament.get_ranking()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo cargar el ranking:\n{e}")
-            return
+        # lectura fuera del hilo de Tk (ui/db_async)
+        get_async_storage(self).read(
+            tournament.get_ranking,
+            on_done=self._show_ranking,
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudo cargar el ranking:\n{e}"),
+            key="ranking",
+        )
 
-        for r in rows:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    r["R"],
-                    r["id"],
-                    r["nombre"],
-                    r["apellido"],
-                    r["G"],
-                    r["P"],
-                    r["E"],
-                ),
-            )
+    def _show_ranking(self, rows: list[dict]):
+        self._tree_sync.update(
+            [
+                (
+                    str(r["id"]),
+                    (
+                        r["R"],
+                        r["id"],
+                        r["nombre"],
+                        r["apellido"],
+                        r["G"],
+                        r["P"],
+                        r["E"],
+                    ),
+                )
+                for r in rows
+            ]
+        )
 
     def _on_refresh(self):
-        try:
-            tournament.recompute_ranking()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo recalcular:\n{e}")
+        # ✅ el recálculo corre en segundo plano (la ventana no se congela)
+        runner = get_runner(self)
+        if runner.busy():
+            messagebox.showinfo("Espera", "Ya hay un trabajo en curso. Espera a que termine.")
             return
 
+        self.btn_refresh.configure(state="disabled", text="Recalculando...")
+        runner.submit(
+            "Recalcular ranking",
+            lambda job: tournament.recompute_ranking(),
+            on_done=lambda _: self._on_refresh_done(),
+            on_error=self._on_refresh_error,
+        )
+
+    def _on_refresh_done(self):
+        if not self.winfo_exists():
+            return
+        self.btn_refresh.configure(state="normal", text="Recalcular / Recargar")
         self._load_ranking()
         messagebox.showinfo("Ranking", "Ranking actualizado.")
+
+    def _on_refresh_error(self, error: Exception):
+        if not self.winfo_exists():
+            messagebox.showerror("Error", f"No se pudo recalcular:\n{error}")
+            return
+        self.btn_refresh.configure(state="normal", text="Recalcular / Recargar")
+        messagebox.showerror("Error", f"No se pudo recalcular:\n{error}")
@@ -4,6 +4,7 @@ from tkinter import messagebox
 
 from core import storage
 from core import tournament
+from ui.db_async import get_async_storage
 
 
 class ScoreCaptureView(ctk.CTkFrame):
@@ -25,7 +26,6 @@ class ScoreCaptureView(ctk.CTkFrame):
         self._build_body()
 
         self._load_round_tables()
-        self._refresh_table_detail()
 
     # ---------- UI ----------
 
@@ -227,13 +227,32 @@ class ScoreCaptureView(ctk.CTkFrame):
 
     # ---------- LÓGICA ----------
 
+    def refresh(self):
+        """Recarga desde la BD (MainWindow la llama si los datos cambiaron)."""
+        self._on_reload()
+
+    def on_data_changed(self, changes: dict):
+        """
+        Cambios de la otra PC (ui/change_watcher). Solo se recarga la mesa
+        abierta si la tocaron (así no se pierde lo que se está escribiendo
+        en otra mesa).
+        """
+        rnd = self._get_round_number()
+        if rnd in changes["seats"]:
+            self._on_reload()
+            return
+
+        mesa_num = self._get_mesa_number()
+        if mesa_num in changes["scores"].get(rnd, ()):
+            self._refresh_table_detail()
+        elif mesa_num in changes["status"].get(rnd, ()):
+            self._refresh_status_badge(rnd, mesa_num)
+
     def _on_reload(self):
         self._load_round_tables()
-        self._refresh_table_detail()
 
     def _on_round_change(self):
         self._load_round_tables()
-        self._refresh_table_detail()
 
     def _get_round_number(self) -> int:
         try:
@@ -251,8 +270,18 @@ class ScoreCaptureView(ctk.CTkFrame):
         return 0
 
     def _load_round_tables(self):
+        """Carga la lista de mesas de la ronda (fuera del hilo de Tk) y luego el detalle."""
         rnd = self._get_round_number()
-        mesas = storage.get_round_assignments(rnd)
+        get_async_storage(self).read(
+            storage.get_round_assignments,
+            rnd,
+            on_done=lambda mesas: self._show_round_tables(rnd, mesas),
+            key="captura_mesas",
+        )
+
+    def _show_round_tables(self, rnd: int, mesas: list[dict]):
+        if rnd != self._get_round_number():
+            return
 
         values = [f"Mesa {m['mesa']}" for m in mesas]
         self.mesa_combo.configure(values=values)
@@ -265,6 +294,8 @@ class ScoreCaptureView(ctk.CTkFrame):
             self.mesa_var.set("")
             self.status_badge.configure(text="", fg_color="gray30")
 
+        self._refresh_table_detail()
+
     def _refresh_table_detail(self):
         rnd = self._get_round_number()
         mesa_num = self._get_mesa_number()
@@ -282,9 +313,19 @@ class ScoreCaptureView(ctk.CTkFrame):
             self.status_badge.configure(text="", fg_color="gray30")
             return
 
-        mesas = storage.get_round_assignments(rnd)
-        mesa_data = next((m for m in mesas if m["mesa"] == mesa_num), None)
-        if not mesa_data:
+        # ✅ una sola consulta: sillas + jugadores + estado + puntos de ESTA mesa,
+        # en el hilo de lecturas (no bloquea lo que se está escribiendo)
+        get_async_storage(self).read(
+            storage.get_table_detail,
+            rnd,
+            mesa_num,
+            on_done=lambda mesa_data: self._show_table_detail(rnd, mesa_num, mesa_data),
+            key="captura_detalle",
+        )
+
+    def _show_table_detail(self, rnd: int, mesa_num: int, mesa_data: dict | None):
+        # el usuario pudo cambiar de mesa mientras se leía
+        if not mesa_data or (rnd, mesa_num) != (self._get_round_number(), self._get_mesa_number()):
             return
 
         def fmt(letter: str, p: dict) -> str:
@@ -299,20 +340,15 @@ class ScoreCaptureView(ctk.CTkFrame):
         self.player_labels["C"].configure(text=fmt("C", mesa_data["C"]))
         self.player_labels["D"].configure(text=fmt("D", mesa_data["D"]))
 
-        status = storage.get_table_status(rnd, mesa_num)
-        if status == "finished":
-            self.status_badge.configure(text="Terminado", fg_color="#b3261e")
-        else:
-            self.status_badge.configure(text="Jugando", fg_color="#2e7d32")
+        self._apply_status_badge(mesa_data["status"])
 
-        result = storage.get_table_player_scores(rnd, mesa_num)
         for entry_points, entry_penalty in self.player_entries.values():
             entry_points.delete(0, "end")
             entry_penalty.delete(0, "end")
         for label in self.player_final_labels.values():
             label.configure(text="0")
         self.winner_var.set("AC")
-        for row in result:
+        for row in mesa_data["scores"].values():
             entries = self.player_entries.get(row["letra"])
             if entries:
                 entry_points, entry_penalty = entries
@@ -321,6 +357,21 @@ class ScoreCaptureView(ctk.CTkFrame):
                 self.player_final_labels[row["letra"]].configure(text=str(row["final_points"]))
                 self.winner_var.set(row.get("winner_pair", "AC"))
 
+    def _refresh_status_badge(self, rnd: int, mesa_num: int):
+        get_async_storage(self).read(
+            storage.get_table_status,
+            rnd,
+            mesa_num,
+            on_done=self._apply_status_badge,
+            key="captura_estado",
+        )
+
+    def _apply_status_badge(self, status: str):
+        if status == "finished":
+            self.status_badge.configure(text="Terminado", fg_color="#b3261e")
+        else:
+            self.status_badge.configure(text="Jugando", fg_color="#2e7d32")
+
     def _on_save(self):
         rnd = self._get_round_number()
         mesa_num = self._get_mesa_number()
@@ -341,7 +392,23 @@ class ScoreCaptureView(ctk.CTkFrame):
             return
 
         winner_pair = self.winner_var.get().strip().upper()
-        ok, msg = tournament.save_table_player_scores(rnd, mesa_num, player_points, winner_pair)
+
+        # ✅ la escritura va a la cola de la BD: si la otra PC tiene el candado,
+        # la ventana sigue respondiendo mientras espera
+        self.btn_save.configure(state="disabled")
+        get_async_storage(self).write(
+            tournament.save_table_player_scores,
+            rnd,
+            mesa_num,
+            player_points,
+            winner_pair,
+            on_done=self._on_save_done,
+            on_error=self._on_save_error,
+        )
+
+    def _on_save_done(self, result):
+        self.btn_save.configure(state="normal")
+        ok, msg = result
         if not ok:
             messagebox.showerror("Error", msg)
             return
@@ -349,6 +416,10 @@ class ScoreCaptureView(ctk.CTkFrame):
         messagebox.showinfo("Listo", msg)
         self._refresh_table_detail()
 
+    def _on_save_error(self, error: Exception):
+        self.btn_save.configure(state="normal")
+        messagebox.showerror("Error", f"No se pudo guardar:\n{error}")
+
     def _update_final_points(self, letra: str):
         entries = self.player_entries.get(letra)
         if not entries:
@@ -376,7 +447,16 @@ class ScoreCaptureView(ctk.CTkFrame):
 
         reason = (self.pen_reason.get().strip() or "Penalización")
 
-        ok, msg = tournament.subtract_points_from_player(jugador_id, points, reason)
+        get_async_storage(self).write(
+            tournament.subtract_points_from_player,
+            jugador_id,
+            points,
+            reason,
+            on_done=self._on_penalty_done,
+        )
+
+    def _on_penalty_done(self, result):
+        ok, msg = result
         if not ok:
             messagebox.showerror("Error", msg)
             return
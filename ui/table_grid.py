@@ -0,0 +1,303 @@
+# ui/table_grid.py
+#
+# Grilla virtualizada de mesas para TablesView.
+# Con 250 mesas, crear un CTkFrame con 7 labels + botón por mesa (y destruirlos
+# al cambiar de ronda) tardaba segundos. Aquí:
+#   - las mesas se ubican en un Canvas con scroll (posición calculada, no grid)
+#   - solo se dibujan las mesas visibles en el viewport (+1 fila de margen)
+#   - los cuadros ("tiles") se reciclan: al hacer scroll o cambiar de ronda solo
+#     se les cambia el texto/color, no se crean widgets nuevos
+#   - cambiar el estado de una mesa re-pinta SOLO ese cuadro
+
+from __future__ import annotations
+
+import tkinter
+
+import customtkinter as ctk
+
+SEAT_LETTERS = ("A", "B", "C", "D")
+
+
+class _TableTile(ctk.CTkFrame):
+    """
+    Representación gráfica de una mesa de dominó (widget reutilizable):
+
+           [  A  ]
+      [  D ][MESA][  B ]
+           [  C  ]
+    """
+
+    def __init__(self, grid: "TableGrid", width: int, height: int):
+        super().__init__(grid.canvas, corner_radius=12, width=width, height=height)
+        self.grid_propagate(False)
+
+        self.round_number = 0
+        self.mesa = 0
+
+        self.title = ctk.CTkLabel(self, text="", font=("Roboto", 14, "bold"))
+        self.title.grid(row=0, column=0, columnspan=3, pady=(4, 8))
+
+        seat_style = dict(
+            width=110,
+            height=45,
+            corner_radius=6,
+            fg_color="gray25",
+            text_color="white",
+            justify="center",
+            font=("Roboto", 11),
+        )
+        self.seats = {letra: ctk.CTkLabel(self, text="", **seat_style) for letra in SEAT_LETTERS}
+
+        self.table_center = ctk.CTkFrame(
+            self,
+            width=80,
+            height=50,
+            fg_color="gray40",
+            corner_radius=8,
+        )
+
+        for r in range(1, 5):
+            self.grid_rowconfigure(r, weight=1)
+        for c in range(3):
+            self.grid_columnconfigure(c, weight=1)
+
+        self.seats["A"].grid(row=1, column=1, pady=(0, 6))
+        self.seats["D"].grid(row=2, column=0, padx=(6, 6), pady=4)
+        self.table_center.grid(row=2, column=1, padx=4, pady=4)
+        self.seats["B"].grid(row=2, column=2, padx=(6, 6), pady=4)
+        self.seats["C"].grid(row=3, column=1, pady=(6, 4))
+
+        self.status_label = ctk.CTkLabel(
+            self,
+            text="",
+            corner_radius=6,
+            text_color="white",
+            font=("Roboto", 11, "bold"),
+        )
+        self.status_label.grid(row=4, column=0, columnspan=3, pady=(4, 4), sticky="ew")
+
+        self.toggle_btn = ctk.CTkButton(
+            self,
+            text="Cambiar estado",
+            height=26,
+            font=("Roboto", 11),
+            command=lambda: grid.on_toggle(self.round_number, self.mesa),
+        )
+        self.toggle_btn.grid(row=5, column=0, columnspan=3, pady=(2, 6), padx=10, sticky="ew")
+
+        # los handlers leen round_number/mesa al momento del click: sirven
+        # aunque el cuadro se recicle para otra mesa
+        for w in (self, self.title, self.table_center, *self.seats.values()):
+            w.bind("<Button-1>", lambda e: grid.on_click(self.round_number, self.mesa))
+
+        grid.bind_mousewheel(self)
+
+        # id de la ventana dentro del canvas
+        self.window_id = grid.canvas.create_window(0, 0, window=self, anchor="nw", state="hidden")
+
+    def show(self, round_number: int, mesa_data: dict, status: str):
+        self.round_number = round_number
+        self.mesa = mesa_data["mesa"]
+        self.title.configure(text=f"Mesa {self.mesa}")
+        for letra, label in self.seats.items():
+            p = mesa_data[letra]
+            label.configure(text=f"{letra}\n#{p['id']} {p['nombre']}")
+        self.set_status(status)
+
+    def set_status(self, status: str):
+        """Aplica colores y texto según el estado."""
+        if status == "playing":
+            self.configure(fg_color="#0f3312")
+            self.status_label.configure(
+                text="Jugando",
+                fg_color="#2e7d32",
+                text_color="white",
+            )
+        else:
+            self.configure(fg_color="#3a0c0c")
+            self.status_label.configure(
+                text="Terminado",
+                fg_color="#b3261e",
+                text_color="white",
+            )
+
+
+class TableGrid(ctk.CTkFrame):
+    """
+    Grilla de mesas con scroll que solo dibuja lo visible.
+      on_click(ronda, mesa)  -> click en una mesa
+      on_toggle(ronda, mesa) -> botón "Cambiar estado"
+    """
+
+    TILE_W = 360
+    TILE_H = 270
+    GAP = 20
+    MAX_COLUMNS = 4  # 4 mesas por fila (menos si la ventana es angosta)
+    SCROLL_STEP = 40  # píxeles por "unidad" de la rueda del mouse
+
+    def __init__(self, master, on_click, on_toggle):
+        super().__init__(master, corner_radius=12)
+        self.on_click = on_click
+        self.on_toggle = on_toggle
+
+        self.canvas = ctk.CTkCanvas(
+            self,
+            highlightthickness=0,
+            bg=self._apply_appearance_mode(self.cget("fg_color")),
+            yscrollincrement=self.SCROLL_STEP,
+        )
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 4), pady=6)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(6, 0), pady=6)
+
+        self.message = ctk.CTkLabel(self.canvas, text="", font=("Roboto", 16), justify="center")
+        self._message_id = self.canvas.create_window(0, 40, window=self.message, anchor="n", state="hidden")
+
+        self._round = 0
+        self._mesas: list[dict] = []
+        self._statuses: dict[int, str] = {}
+        self._row_of: dict[int, int] = {}  # mesa -> índice en _mesas
+
+        self._columns = 1
+        self._visible: dict[int, _TableTile] = {}  # índice -> cuadro
+        self._free: list[_TableTile] = []
+        self._render_pending = False
+        self._toggles_enabled = True
+
+        self.canvas.bind("<Configure>", lambda e: self._relayout())
+        self.bind_mousewheel(self.canvas)
+
+    # ---------- API ----------
+
+    def set_round(self, round_number: int, mesas: list[dict], statuses: dict[int, str], message: str = ""):
+        """Muestra otra ronda reutilizando los cuadros existentes."""
+        self._round = round_number
+        self._mesas = mesas
+        self._statuses = dict(statuses)
+        self._row_of = {m["mesa"]: idx for idx, m in enumerate(mesas)}
+
+        # todos los cuadros vuelven al pool; _render toma los que hagan falta
+        for tile in self._visible.values():
+            self._release(tile)
+        self._visible.clear()
+
+        if mesas:
+            self.canvas.itemconfigure(self._message_id, state="hidden")
+        else:
+            self.message.configure(text=message)
+            self.canvas.itemconfigure(self._message_id, state="normal")
+
+        self.canvas.yview_moveto(0)
+        self._relayout()
+
+    def set_status(self, mesa: int, status: str):
+        """Cambia el estado de UNA mesa; solo se re-pinta su cuadro (si está visible)."""
+        self._statuses[mesa] = status
+        idx = self._row_of.get(mesa)
+        tile = self._visible.get(idx)
+        if tile is not None:
+            tile.set_status(status)
+
+    def set_toggles_enabled(self, enabled: bool):
+        """Habilita / deshabilita los botones "Cambiar estado" de todos los cuadros."""
+        self._toggles_enabled = enabled
+        state = "normal" if enabled else "disabled"
+        for tile in (*self._visible.values(), *self._free):
+            tile.toggle_btn.configure(state=state)
+
+    def bind_mousewheel(self, widget):
+        """Rueda del mouse sobre el widget (y sus hijos) => scroll de la grilla."""
+        # bind "crudo" de tkinter: los widgets de CTk redefinen bind() y no
+        # aceptan todas las secuencias
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tkinter.Misc.bind(widget, sequence, self._on_mousewheel, "+")
+        for child in widget.winfo_children():
+            self.bind_mousewheel(child)
+
+    # ---------- layout ----------
+
+    def _relayout(self):
+        width = max(1, self.canvas.winfo_width())
+        cols = (width - self.GAP) // (self.TILE_W + self.GAP)
+        self._columns = max(1, min(self.MAX_COLUMNS, cols))
+
+        rows = -(-len(self._mesas) // self._columns)  # ceil
+        height = rows * (self.TILE_H + self.GAP) + self.GAP
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+        self.canvas.coords(self._message_id, width // 2, 40)
+
+        # al cambiar de columnas cambian las posiciones: re-ubicar todo
+        for tile in self._visible.values():
+            self._release(tile)
+        self._visible.clear()
+        self._render()
+
+    def _tile_position(self, idx: int) -> tuple[int, int]:
+        row, col = divmod(idx, self._columns)
+        used = self._columns * (self.TILE_W + self.GAP) - self.GAP
+        left = max(self.GAP, (self.canvas.winfo_width() - used) // 2)
+        return (
+            left + col * (self.TILE_W + self.GAP),
+            self.GAP + row * (self.TILE_H + self.GAP),
+        )
+
+    def _visible_range(self) -> range:
+        row_h = self.TILE_H + self.GAP
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // row_h) - 1)
+        last_row = int(bottom // row_h) + 1
+        start = first_row * self._columns
+        stop = min(len(self._mesas), (last_row + 1) * self._columns)
+        return range(start, max(start, stop))
+
+    def _render(self):
+        self._render_pending = False
+        wanted = self._visible_range()
+
+        for idx in [i for i in self._visible if i not in wanted]:
+            self._release(self._visible.pop(idx))
+
+        for idx in wanted:
+            if idx in self._visible:
+                continue
+            if self._free:
+                tile = self._free.pop()
+            else:
+                tile = _TableTile(self, self.TILE_W, self.TILE_H)
+                if not self._toggles_enabled:
+                    tile.toggle_btn.configure(state="disabled")
+            mesa = self._mesas[idx]
+            tile.show(self._round, mesa, self._statuses.get(mesa["mesa"], "playing"))
+            x, y = self._tile_position(idx)
+            self.canvas.coords(tile.window_id, x, y)
+            self.canvas.itemconfigure(tile.window_id, state="normal")
+            self._visible[idx] = tile
+
+    def _release(self, tile: _TableTile):
+        self.canvas.itemconfigure(tile.window_id, state="hidden")
+        self._free.append(tile)
+
+    def _schedule_render(self):
+        # varios eventos de scroll seguidos => un solo render
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    # ---------- scroll ----------
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4:
+            step = -1
+        elif getattr(event, "num", None) == 5:
+            step = 1
+        else:
+            # Windows: múltiplos de 120; macOS: valores pequeños
+            step = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self.canvas.yview_scroll(step, "units")
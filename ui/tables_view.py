@@ -5,23 +5,32 @@ from tkinter import messagebox
 
 from core import storage
 from core import tournament
-from core import score_sheet
+from ui.db_async import get_async_storage
+from ui.jobs import get_runner
+from ui.table_grid import TableGrid
 
 
 class TablesView(ctk.CTkFrame):
     """
     Vista gráfica de las mesas por ronda (1..5).
-    Cada mesa es un cuadrado con 4 sillas (A, B, C, D).
+    Cada mesa es un cuadrado con 4 sillas (A, B, C, D) (ver ui/table_grid.py).
     - Click en una mesa: genera PDF de esa mesa.
     - Botón "Cambiar estado": Jugando / Terminado (color y texto).
     """
 
+    # Tiempo máximo del optimizador (segundos) cuando "Optimizar" está marcado
+    OPTIMIZER_TIME_LIMIT = 3.0
+
     def __init__(self, master):
         super().__init__(master)
 
         self.round_var = ctk.StringVar(value="1")
+        self.optimize_var = ctk.BooleanVar(value=False)
+        # un PDF por mesa (como siempre); "Un solo PDF" es opcional
+        self.single_pdf_var = ctk.BooleanVar(value=False)
 
         self._build_header()
+        self._build_progress_row()
         self._build_scroll_area()
         self._load_round()
 
@@ -56,6 +65,20 @@ class TablesView(ctk.CTkFrame):
         )
         self.btn_generate.pack(side="right", padx=10)
 
+        self.btn_schedule = ctk.CTkButton(
+            header,
+            text="Generar calendario",
+            command=self._on_generate_schedule,
+        )
+        self.btn_schedule.pack(side="right", padx=(10, 0))
+
+        self.chk_optimize = ctk.CTkCheckBox(
+            header,
+            text=f"Optimizar ({self.OPTIMIZER_TIME_LIMIT:.0f} s)",
+            variable=self.optimize_var,
+        )
+        self.chk_optimize.pack(side="right", padx=(10, 0))
+
         self.btn_pdf_all = ctk.CTkButton(
             header,
             text="Generar TODAS las hojas (PDF)",
@@ -63,9 +86,39 @@ class TablesView(ctk.CTkFrame):
         )
         self.btn_pdf_all.pack(side="right", padx=10)
 
+        self.chk_single_pdf = ctk.CTkCheckBox(
+            header,
+            text="Un solo PDF",
+            variable=self.single_pdf_var,
+        )
+        self.chk_single_pdf.pack(side="right", padx=(10, 0))
+
+    def _build_progress_row(self):
+        """Barra de progreso de trabajos en segundo plano (oculta si no hay)."""
+        self.progress_row = ctk.CTkFrame(self, corner_radius=12)
+
+        self.progress_label = ctk.CTkLabel(self.progress_row, text="")
+        self.progress_label.pack(side="left", padx=12, pady=6)
+
+        self.btn_cancel_job = ctk.CTkButton(
+            self.progress_row,
+            text="Cancelar",
+            width=90,
+            fg_color="#b3261e",
+            hover_color="#8c1d18",
+            command=self._on_cancel_job,
+        )
+        self.btn_cancel_job.pack(side="right", padx=12, pady=6)
+
+        self.progress_bar = ctk.CTkProgressBar(self.progress_row)
+        self.progress_bar.pack(side="right", fill="x", expand=True, padx=12, pady=6)
+
+        self._job = None
+
     def _build_scroll_area(self):
-        self.scroll = ctk.CTkScrollableFrame(self)
-        self.scroll.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        # ✅ grilla virtualizada: solo dibuja las mesas visibles y recicla los cuadros
+        self.table_grid = TableGrid(self, on_click=self._on_table_click, on_toggle=self._toggle_status)
+        self.table_grid.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
     # ---------- HELPERS ----------
 
@@ -80,168 +133,179 @@ class TablesView(ctk.CTkFrame):
         except Exception:
             return 1
 
+    # ---------- TRABAJOS EN SEGUNDO PLANO ----------
+
+    def _run_job(
+        self,
+        name: str,
+        fn,
+        on_done,
+        cancellable: bool = True,
+        error_title: str = "Error",
+        writes: bool = True,
+    ):
+        """
+        Corre fn(job) fuera del hilo de Tk (ui.jobs) mostrando progreso.
+        on_done(resultado) se llama en el hilo de Tk al terminar.
+        writes=False para trabajos de solo lectura (PDFs).
+        """
+        runner = get_runner(self)
+        if runner.busy():
+            messagebox.showinfo("Espera", "Ya hay un trabajo en curso. Espera a que termine.")
+            return
+
+        self._set_busy(True, name, cancellable, writes)
+        self._job = runner.submit(
+            name,
+            fn,
+            on_progress=self._on_job_progress,
+            on_done=lambda result: self._finish_job(on_done, result),
+            on_error=lambda e: self._on_job_error(error_title, e),
+            on_cancel=self._on_job_cancelled,
+            writes=writes,
+        )
+
+    def _set_busy(self, busy: bool, text: str = "", cancellable: bool = True, writes: bool = False):
+        state = "disabled" if busy else "normal"
+        for btn in (self.btn_generate, self.btn_schedule, self.btn_pdf_all):
+            btn.configure(state=state)
+        # mientras se re-genera la ronda no se puede cambiar el estado de sus mesas
+        self.table_grid.set_toggles_enabled(not (busy and writes))
+
+        if not busy:
+            self.progress_bar.stop()
+            self.progress_row.pack_forget()
+            self._job = None
+            return
+
+        self.progress_label.configure(text=text)
+        self.btn_cancel_job.configure(state="normal" if cancellable else "disabled")
+        # hasta el primer aviso de progreso no se sabe el total: barra indeterminada
+        self.progress_bar.configure(mode="indeterminate")
+        self.progress_bar.start()
+        self.progress_row.pack(fill="x", padx=10, pady=(0, 10), before=self.table_grid)
+
+    def _on_job_progress(self, done: int, total: int | None, text: str):
+        if self._job is None or not self.winfo_exists():
+            return
+        if total:
+            if self.progress_bar.cget("mode") != "determinate":
+                self.progress_bar.stop()
+                self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(done / total)
+            self.progress_label.configure(text=f"{text or self._job.name}: {done} / {total}")
+
+    def _finish_job(self, on_done, result):
+        # la vista pudo cerrarse mientras el trabajo corría
+        if not self.winfo_exists():
+            return
+        self._set_busy(False)
+        on_done(result)
+
+    def _on_job_error(self, title: str, error: Exception):
+        if not self.winfo_exists():
+            messagebox.showerror(title, str(error))
+            return
+        self._set_busy(False)
+        messagebox.showerror(title, str(error))
+
+    def _on_job_cancelled(self):
+        if not self.winfo_exists():
+            return
+        self._set_busy(False)
+        messagebox.showinfo("Cancelado", "El trabajo se canceló.")
+        self._load_round()
+
+    def _on_cancel_job(self):
+        if self._job is not None:
+            self._job.cancel()
+            self.progress_label.configure(text="Cancelando...")
+
     def _set_title(self):
         rnd = self._get_round_number()
         self.title_label.configure(text=f"Ronda {rnd} - Asignación de Mesas")
 
     # ---------- LÓGICA ----------
 
-    def _on_round_change(self):
+    def refresh(self):
+        """Recarga desde la BD (MainWindow la llama si los datos cambiaron)."""
         self._load_round()
 
-    def _load_round(self):
-        self._set_title()
-
-        # Limpiar scroll
-        for w in self.scroll.winfo_children():
-            w.destroy()
-
+    def on_data_changed(self, changes: dict):
+        """Cambios de la otra PC (ui/change_watcher): solo se toca lo afectado."""
         rnd = self._get_round_number()
-        mesas = storage.get_round_assignments(rnd)
-        statuses = storage.get_tables_status(rnd)
-
-        if not mesas:
-            label = ctk.CTkLabel(
-                self.scroll,
-                text=(
-                    f"No hay asignación de mesas para la ronda {rnd}.\n"
-                    "Pulsa el botón 'Generar / Re-generar ronda'."
-                ),
-                font=("Roboto", 16),
-                justify="center",
-            )
-            label.pack(pady=40)
+        if rnd in changes["seats"]:
+            self._load_round()
             return
 
-        cols = 4  # 4 mesas por fila
-        for idx, mesa in enumerate(mesas):
-            row = idx // cols
-            col = idx % cols
-            status = statuses.get(mesa["mesa"], "playing")
-            widget = self._create_table_widget(self.scroll, rnd, mesa, status)
-            widget.grid(row=row, column=col, padx=20, pady=20, sticky="n")
-
-        for c in range(cols):
-            self.scroll.grid_columnconfigure(c, weight=1)
-
-    def _apply_status_style(self, frame, status_label, status: str):
-        """Aplica colores y texto según el estado."""
-        if status == "playing":
-            frame.configure(fg_color="#0f3312")
-            status_label.configure(
-                text="Jugando",
-                fg_color="#2e7d32",
-                text_color="white",
-            )
-        else:
-            frame.configure(fg_color="#3a0c0c")
-            status_label.configure(
-                text="Terminado",
-                fg_color="#b3261e",
-                text_color="white",
+        mesas = changes["status"].get(rnd)
+        if mesas:
+            get_async_storage(self).read(
+                storage.get_tables_status,
+                rnd,
+                on_done=lambda statuses: self._apply_statuses(rnd, mesas, statuses),
+                key="tables_status",
             )
 
-    def _create_table_widget(self, parent, round_number: int, mesa_data: dict, status: str) -> ctk.CTkFrame:
-        """
-        Representación gráfica de una mesa de dominó:
+    def _apply_statuses(self, rnd: int, mesas, statuses: dict[int, str]):
+        if rnd != self._get_round_number():
+            return
+        for mesa in mesas:
+            self.table_grid.set_status(mesa, statuses.get(mesa, "playing"))
 
-               [  A  ]
-          [  D ][MESA][  B ]
-               [  C  ]
-        """
-        mesa_num = mesa_data["mesa"]
-        frame = ctk.CTkFrame(parent, corner_radius=12)
+    def _on_round_change(self):
+        self._load_round()
 
-        title = ctk.CTkLabel(
-            frame,
-            text=f"Mesa {mesa_num}",
-            font=("Roboto", 14, "bold"),
-        )
-        title.grid(row=0, column=0, columnspan=3, pady=(4, 8))
-
-        def seat_text(letter: str, p: dict) -> str:
-            return f"{letter}\n#{p['id']} {p['nombre']}"
-
-        seat_style = dict(
-            width=110,
-            height=45,
-            corner_radius=6,
-            fg_color="gray25",
-            text_color="white",
-            justify="center",
-            font=("Roboto", 11),
-        )
+    def _load_round(self):
+        self._set_title()
 
-        seat_A = ctk.CTkLabel(frame, text=seat_text("A", mesa_data["A"]), **seat_style)
-        seat_C = ctk.CTkLabel(frame, text=seat_text("C", mesa_data["C"]), **seat_style)
-        seat_B = ctk.CTkLabel(frame, text=seat_text("B", mesa_data["B"]), **seat_style)
-        seat_D = ctk.CTkLabel(frame, text=seat_text("D", mesa_data["D"]), **seat_style)
-
-        table_center = ctk.CTkFrame(
-            frame,
-            width=80,
-            height=50,
-            fg_color="gray40",
-            corner_radius=8,
+        # ✅ la BD se lee fuera del hilo de Tk (ui/db_async); si la otra PC tiene
+        # el candado, la ventana no se congela
+        rnd = self._get_round_number()
+        get_async_storage(self).read(
+            _read_round,
+            rnd,
+            on_done=lambda data: self._show_round(rnd, *data),
+            key="tables_round",
         )
 
-        for r in range(1, 5):
-            frame.grid_rowconfigure(r, weight=1)
-        for c in range(3):
-            frame.grid_columnconfigure(c, weight=1)
-
-        seat_A.grid(row=1, column=1, pady=(0, 6))
-        seat_D.grid(row=2, column=0, padx=(6, 6), pady=4)
-        table_center.grid(row=2, column=1, padx=4, pady=4)
-        seat_B.grid(row=2, column=2, padx=(6, 6), pady=4)
-        seat_C.grid(row=3, column=1, pady=(6, 4))
-
-        status_label = ctk.CTkLabel(
-            frame,
-            text="",
-            corner_radius=6,
-            text_color="white",
-            font=("Roboto", 11, "bold"),
-        )
-        status_label.grid(row=4, column=0, columnspan=3, pady=(4, 4), sticky="ew")
-
-        toggle_btn = ctk.CTkButton(
-            frame,
-            text="Cambiar estado",
-            height=26,
-            font=("Roboto", 11),
-            command=lambda r=round_number, m=mesa_num, sl=status_label, fr=frame: self._toggle_status(
-                r, m, sl, fr
+    def _show_round(self, rnd: int, mesas: list[dict], statuses: dict[int, str]):
+        if rnd != self._get_round_number():
+            return
+        self.table_grid.set_round(
+            rnd,
+            mesas,
+            statuses,
+            message=(
+                f"No hay asignación de mesas para la ronda {rnd}.\n"
+                "Pulsa el botón 'Generar / Re-generar ronda'."
             ),
         )
-        toggle_btn.grid(row=5, column=0, columnspan=3, pady=(2, 6), padx=10, sticky="ew")
-
-        self._apply_status_style(frame, status_label, status)
-
-        def bind_click(widget):
-            widget.bind(
-                "<Button-1>",
-                lambda e, r=round_number, m=mesa_num: self._on_table_click(r, m),
-            )
-
-        for w in (frame, title, seat_A, seat_B, seat_C, seat_D, table_center):
-            bind_click(w)
-
-        return frame
 
     # ---------- EVENTOS ----------
 
     def _on_generate_round(self):
         rnd = self._get_round_number()
+        # las validaciones leen la BD: fuera del hilo de Tk
+        get_async_storage(self).read(
+            _read_round_flags,
+            rnd,
+            on_done=lambda flags: self._confirm_generate_round(rnd, *flags),
+            key="tables_generate",
+        )
+
+    def _confirm_generate_round(self, rnd: int, has_scores: bool, exists: bool):
+        if not self.winfo_exists():
+            return
 
-        if storage.round_has_scores(rnd):
+        if has_scores:
             messagebox.showerror(
                 "No permitido",
                 f"La ronda {rnd} ya tiene resultados guardados y no se puede re-generar.",
             )
             return
 
-        if storage.get_round_assignments(rnd):
+        if exists:
             if not messagebox.askyesno(
                 "Confirmar",
                 f"Ya existe una asignación para la ronda {rnd}.\n"
@@ -249,64 +313,173 @@ class TablesView(ctk.CTkFrame):
             ):
                 return
 
-        # ✅ aquí llamaremos un generador general
-        # Debes tener en core/tournament.py:
-        # generate_round(1..5)
-        if hasattr(tournament, "generate_round"):
-            ok, msg = tournament.generate_round(rnd)
-        else:
-            # fallback si todavía no lo creaste:
-            if rnd == 1:
-                ok, msg = tournament.generate_first_round()
-            else:
-                ok, msg = (False, "Falta implementar tournament.generate_round() para rondas 2..5.")
+        # ✅ generador general (1..5); con "Optimizar" corre el optimizador
+        # multi-arranque y el mensaje incluye el puntaje de calidad.
+        # Corre en segundo plano: la ventana no se congela.
+        time_limit = self.OPTIMIZER_TIME_LIMIT if self.optimize_var.get() else None
+        self._run_job(
+            f"Generando ronda {rnd}",
+            lambda job: tournament.generate_round(rnd, time_limit=time_limit),
+            on_done=lambda result: self._show_generate_result("Ronda", result),
+            cancellable=False,
+        )
 
+    def _show_generate_result(self, title: str, result):
+        ok, msg = result
         if not ok:
             messagebox.showerror("Error", msg)
             return
 
-        messagebox.showinfo("Ronda", msg)
+        messagebox.showinfo(title, msg)
         self._load_round()
 
+    def _on_generate_schedule(self):
+        # ✅ planifica juntas TODAS las rondas sin resultados (las jugadas no se tocan)
+        get_async_storage(self).read(
+            tournament.stale_schedule_rounds,
+            on_done=self._confirm_generate_schedule,
+            key="tables_generate",
+        )
+
+    def _confirm_generate_schedule(self, stale: list[int]):
+        if not self.winfo_exists():
+            return
+
+        question = "Se van a planificar todas las rondas que aún no tienen resultados.\n"
+        if stale:
+            rounds_txt = ", ".join(str(r) for r in stale)
+            question += f"Las rondas {rounds_txt} no incluyen a todos los jugadores actuales.\n"
+        question += "¿Continuar?"
+        if not messagebox.askyesno("Confirmar", question):
+            return
+
+        self._run_job(
+            "Planificando calendario",
+            lambda job: tournament.generate_schedule(time_limit=self.OPTIMIZER_TIME_LIMIT),
+            on_done=lambda result: self._show_generate_result("Calendario", result),
+            cancellable=False,
+        )
+
     def _on_generate_all_pdfs(self):
+        # ReportLab se carga al generar el primer PDF, no al abrir la app
+        from core import score_sheet
+
         rnd = self._get_round_number()
-        try:
-            count, folder = score_sheet.generate_score_sheets_for_round(
+
+        # ✅ "Un solo PDF": todas las mesas en un archivo (un solo trabajo de impresión)
+        if self.single_pdf_var.get():
+            self._run_job(
+                "Hojas PDF",
+                lambda job: score_sheet.generate_round_score_sheet_pdf(
+                    rnd,
+                    output_dir="hojas",
+                    tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
+                    tournament_type="individual",
+                    progress=job.report,
+                ),
+                on_done=self._show_single_pdf_result,
+                error_title="Error al generar PDF",
+                writes=False,
+            )
+            return
+
+        # Un PDF por mesa: se reparte entre los núcleos; un error en una mesa no
+        # detiene las demás
+        self._run_job(
+            "Hojas PDF",
+            lambda job: score_sheet.generate_score_sheets_for_round_parallel(
                 rnd,
                 output_dir="hojas",
                 tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
                 tournament_type="individual",
+                progress=job.report,
+            ),
+            on_done=self._show_sheet_results,
+            error_title="Error al generar PDF",
+            writes=False,
+        )
+
+    def _show_single_pdf_result(self, result):
+        count, path = result
+        messagebox.showinfo(
+            "Hojas generadas",
+            f"Se generaron {count} hojas en un solo PDF:\n{path}",
+        )
+
+    def _show_sheet_results(self, results: list[dict]):
+        rebuilt = [r for r in results if r["rebuilt"]]
+        failed = [r for r in results if r["error"]]
+        unchanged = len(results) - len(rebuilt) - len(failed)
+        msg = f"Se generaron {len(rebuilt)} hojas en:\n{os.path.abspath('hojas')}"
+        if unchanged:
+            msg += f"\n({unchanged} mesas sin cambios se dejaron como estaban)"
+        if rebuilt and len(rebuilt) <= 10 and unchanged:
+            msg += "\nRe-generadas: " + ", ".join(f"Mesa {r['mesa']}" for r in rebuilt)
+        if failed:
+            detail = "\n".join(f"Mesa {r['mesa']}: {r['error']}" for r in failed[:10])
+            messagebox.showwarning(
+                "Hojas generadas con errores",
+                f"{msg}\n\n{len(failed)} mesas con error:\n{detail}",
             )
-            messagebox.showinfo(
-                "Hojas generadas",
-                f"Se generaron {count} hojas en:\n{folder}",
-            )
-        except Exception as e:
-            messagebox.showerror("Error al generar PDF", str(e))
+        else:
+            messagebox.showinfo("Hojas generadas", msg)
 
     def _on_table_click(self, round_number: int, mesa_number: int):
-        """Click en una mesa -> genera PDF SOLO de esa mesa."""
-        try:
-            filename = f"ronda{round_number}_mesa{mesa_number:02d}.pdf"
-            path = score_sheet.generate_score_sheet_for_table(
-                round_number=round_number,
-                mesa_number=mesa_number,
-                output_path=os.path.join("hojas", filename),
+        """Click en una mesa -> genera PDF SOLO de esa mesa (en segundo plano)."""
+        from core import score_sheet
+
+        # mismo archivo y manifiesto que "Generar TODAS las hojas": si la hoja
+        # ya está al día no se vuelve a dibujar
+        self._run_job(
+            f"Hoja de la mesa {mesa_number}",
+            lambda job: score_sheet.update_score_sheet_for_table(
+                round_number,
+                mesa_number,
+                output_dir="hojas",
                 tournament_title=score_sheet.DEFAULT_TOURNAMENT_TITLE,
                 tournament_type="individual",
-            )
-            messagebox.showinfo(
-                "Hoja generada",
-                f"Se generó la hoja de la ronda {round_number}, mesa {mesa_number}:\n{path}",
-            )
-        except Exception as e:
-            messagebox.showerror(
-                "Error al generar PDF",
-                f"No se pudo generar la hoja:\n{e}",
-            )
+            ),
+            on_done=lambda result: self._show_table_pdf_result(round_number, mesa_number, *result),
+            cancellable=False,
+            error_title="Error al generar PDF",
+            writes=False,
+        )
+
+    def _show_table_pdf_result(self, round_number: int, mesa_number: int, path: str, rebuilt: bool):
+        if rebuilt:
+            text = f"Se generó la hoja de la ronda {round_number}, mesa {mesa_number}:\n{path}"
+        else:
+            text = f"La hoja de la ronda {round_number}, mesa {mesa_number} ya estaba al día:\n{path}"
+        messagebox.showinfo("Hoja generada", text)
+
+    def _toggle_status(self, round_number: int, mesa_number: int):
+        # una re-generación (de esta u otra vista) en curso: la mesa puede dejar de existir
+        if get_runner(self).writing():
+            messagebox.showinfo("Espera", "Hay un trabajo en curso. Espera a que termine.")
+            return
+
+        # escritura en cola (en orden); solo se re-pinta el cuadro de esa mesa
+        get_async_storage(self).write(
+            storage.toggle_table_status,
+            round_number,
+            mesa_number,
+            on_done=lambda status: self._apply_statuses(
+                round_number, [mesa_number], {mesa_number: status}
+            ),
+        )
+
+
+def _read_round_flags(round_number: int) -> tuple[bool, bool]:
+    """(tiene resultados, tiene asignación); corre en el hilo de lecturas."""
+    return (
+        storage.round_has_scores(round_number),
+        storage.round_exists(round_number),
+    )
+
 
-    def _toggle_status(self, round_number: int, mesa_number: int, status_label, frame):
-        current = storage.get_table_status(round_number, mesa_number)
-        new_status = "finished" if current == "playing" else "playing"
-        storage.set_table_status(round_number, mesa_number, new_status)
-        self._apply_status_style(frame, status_label, new_status)
+def _read_round(round_number: int):
+    """(mesas, estados) de la ronda; corre en el hilo de lecturas."""
+    return (
+        storage.get_round_assignments(round_number),
+        storage.get_tables_status(round_number),
+    )
@@ -0,0 +1,142 @@
+# ui/tree_sync.py
+#
+# Actualización por diferencias de un ttk.Treeview.
+# En vez de borrar todas las filas y volver a insertarlas (lento, parpadea y
+# pierde el scroll y la selección) se compara por clave (iid):
+#   - filas que ya no están      -> se borran (una sola llamada)
+#   - filas nuevas               -> se insertan en su posición
+#   - filas con valores cambiados -> se actualizan en su lugar
+#   - filas que cambiaron de lugar -> se mueven (solo las necesarias: las que
+#     quedan fuera de la subsecuencia creciente más larga del orden anterior)
+# Con muchas filas el trabajo se reparte en bloques con after() para que la
+# ventana siga respondiendo.
+#
+#   sync = TreeSync(self.tree)
+#   sync.update([(str(p["id"]), (p["id"], p["nombre"], ...)) for p in players])
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+
+class TreeSync:
+    """Mantiene un Treeview (sin jerarquía) igual a una lista de filas con clave."""
+
+    CHUNK = 500  # filas por bloque antes de devolver el control a Tk
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._values: dict[str, tuple] = {}
+        self._detached: set[str] = set()
+        self._after_id = None
+
+    def update(self, rows: list[tuple[str, tuple]], on_done=None):
+        """
+        rows = [(iid, valores), ...] en el orden deseado.
+        Si llega una actualización nueva antes de terminar la anterior, la
+        anterior se abandona (la nueva deja el Treeview completo).
+        """
+        self.cancel()
+
+        tree = self.tree
+        wanted = {iid for iid, _ in rows}
+
+        removed = [iid for iid in tree.get_children("") if iid not in wanted]
+        if removed:
+            tree.delete(*removed)
+            for iid in removed:
+                self._values.pop(iid, None)
+
+        stable = self._stable_rows(rows)
+        top = self._top_row()
+
+        # las filas que se mueven se desprenden antes: así en el árbol quedan
+        # solo las estables (ya en orden) y la fila i del orden nuevo siempre
+        # va en la posición i (sin tree.index(), que en Tk es O(n))
+        moving = [iid for iid, _ in rows if iid in self._values and iid not in stable]
+        if moving:
+            tree.detach(*moving)
+        self._detached = set(moving)
+
+        self._apply(rows, stable, 0, top, on_done)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+        if self._detached:
+            # actualización abandonada: las filas desprendidas vuelven al final
+            # (la siguiente actualización las pone en su lugar)
+            for iid in self._detached:
+                self.tree.move(iid, "", "end")
+            self._detached = set()
+
+    # ---------- internos ----------
+
+    def _stable_rows(self, rows) -> set[str]:
+        """
+        Filas existentes que NO hace falta mover: la subsecuencia creciente más
+        larga (por posición anterior) dentro del orden nuevo.
+        """
+        old_pos = {iid: i for i, iid in enumerate(self.tree.get_children(""))}
+        seq = [(old_pos[iid], iid) for iid, _ in rows if iid in old_pos]
+
+        tails: list[int] = []  # menor posición final de cada largo
+        tail_idx: list[int] = []  # índice en seq de ese final
+        prev = [-1] * len(seq)
+        for k, (pos, _) in enumerate(seq):
+            j = bisect_left(tails, pos)
+            if j == len(tails):
+                tails.append(pos)
+                tail_idx.append(k)
+            else:
+                tails[j] = pos
+                tail_idx[j] = k
+            prev[k] = tail_idx[j - 1] if j else -1
+
+        stable = set()
+        k = tail_idx[-1] if tail_idx else -1
+        while k != -1:
+            stable.add(seq[k][1])
+            k = prev[k]
+        return stable
+
+    def _apply(self, rows, stable, start, top, on_done):
+        self._after_id = None
+        tree = self.tree
+        end = min(len(rows), start + self.CHUNK)
+
+        # las filas 0..i-1 ya están en su lugar y después solo quedan estables:
+        # la fila i va en la posición i
+        for i in range(start, end):
+            iid, values = rows[i]
+            if iid not in self._values:
+                tree.insert("", i, iid=iid, values=values)
+                self._values[iid] = values
+                continue
+
+            if self._values[iid] != values:
+                tree.item(iid, values=values)
+                self._values[iid] = values
+            if iid not in stable:
+                tree.move(iid, "", i)
+                self._detached.discard(iid)
+
+        self._restore_top(top)
+
+        if end < len(rows):
+            self._after_id = tree.after(1, self._apply, rows, stable, end, top, on_done)
+        elif on_done is not None:
+            on_done()
+
+    def _top_row(self) -> str | None:
+        """Primera fila visible (para conservar el scroll)."""
+        iid = self.tree.identify_row(1)
+        return iid or None
+
+    def _restore_top(self, top: str | None):
+        if top is None or top in self._detached or not self.tree.exists(top):
+            return
+        total = len(self.tree.get_children(""))
+        if total:
+            self.tree.yview_moveto(self.tree.index(top) / total)